@@ -0,0 +1,67 @@
+"""
+Measure TilePyramid.map_tiles() throughput depending on workers and chunk size.
+
+Every tile runs a small CPU bound function. Chunk size 1 corresponds to submitting
+every tile on its own to the executor.
+
+Usage:
+    python benchmarks/bench_map_tiles.py [zoom] [window size in tiles] [iterations]
+"""
+
+from functools import partial
+import os
+import sys
+import time
+
+from meintile import TilePyramid
+
+# default loop iterations of the function run per tile
+ITERATIONS = 20000
+
+
+def _work(tile, iterations=ITERATIONS):
+    total = 0
+    for i in range(iterations):
+        total += i * tile.row
+    return total
+
+
+def main(zoom=12, window_size=64, iterations=ITERATIONS):
+    # pass iterations as argument, worker processes may import this module anew
+    work = partial(_work, iterations=iterations)
+    tile_pyramid = TilePyramid.from_wkss("WebMercatorQuad")
+    tile_matrix = tile_pyramid[zoom]
+    left, _, _, top = tile_matrix.tile(1000, 1000).bounds
+    tile_size = tile_matrix.pixel_x_size * tile_matrix.tile_width
+    bounds = (
+        left,
+        top - tile_size * window_size,
+        left + tile_size * window_size,
+        top,
+    )
+    cpus = os.cpu_count() or 1
+    workers_list = sorted({1, 2, 4, cpus})
+    for chunk_size in [1, 256]:
+        for workers in workers_list:
+            start = time.perf_counter()
+            count = sum(
+                1
+                for _ in tile_pyramid.map_tiles(
+                    work,
+                    bounds,
+                    zoom,
+                    executor="process",
+                    workers=workers,
+                    chunk_size=chunk_size,
+                )
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                "chunk size {:>4}  workers {:>3}  {:>10.0f} tiles/s".format(
+                    chunk_size, workers, count / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
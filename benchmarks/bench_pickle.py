@@ -0,0 +1,93 @@
+"""
+Compare pickled size and round trip time of Tile objects.
+
+The reference pickler below serializes the full object state like meintile 0.1 did,
+i.e. every Tile carries its Tile Matrix and Tile Matrix Set including CRS objects.
+
+Two workloads are measured:
+
+    - list: all tiles pickled in one list, e.g. one task chunk
+    - single: every tile pickled on its own, e.g. one task per tile
+
+Usage:
+    python benchmarks/bench_pickle.py [number of tiles]
+"""
+
+import copyreg
+import io
+import pickle
+import sys
+import time
+from types import MappingProxyType
+
+from meintile import Tile, TileMatrix, TileMatrixSet, TilePyramid
+
+
+def _mapping_proxy(mapping):
+    return MappingProxyType(mapping)
+
+
+def _reduce_state(obj):
+    """Reduce object to its full state, bypassing custom __reduce__ methods."""
+    if isinstance(obj, Tile):
+        state = (None, {name: getattr(obj, name) for name in Tile.__slots__})
+    else:
+        state = dict(obj.__dict__, _tile_cache=None)
+    return copyreg.__newobj__, (type(obj),), state
+
+
+class StatePickler(pickle.Pickler):
+    """Pickler serializing full object state."""
+
+    # dispatch_table entries take precedence over __reduce__ methods and are matched
+    # by exact type
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[MappingProxyType] = lambda m: (_mapping_proxy, (dict(m),))
+    for cls in (Tile, TileMatrix, TileMatrixSet, TilePyramid):
+        dispatch_table[cls] = _reduce_state
+    del cls
+
+
+def _dumps_state(obj):
+    buffer = io.BytesIO()
+    StatePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def _dumps(obj):
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _measure(dumps, tiles):
+    start = time.perf_counter()
+    dumped = dumps(tiles)
+    pickle.loads(dumped)
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_size = 0
+    for tile in tiles:
+        dumped_tile = dumps(tile)
+        single_size += len(dumped_tile)
+        pickle.loads(dumped_tile)
+    single_time = time.perf_counter() - start
+    return len(dumped), list_time, single_size / len(tiles), single_time
+
+
+def main(count=10000):
+    tile_pyramid = TileMatrixSet.from_wkss("WebMercatorQuad")
+    tile_matrix = tile_pyramid[12]
+    tiles = [
+        tile_matrix.tile(i // tile_matrix.width, i % tile_matrix.width)
+        for i in range(count)
+    ]
+    for name, dumps in [("state (0.1)", _dumps_state), ("reduce", _dumps)]:
+        list_size, list_time, single_size, single_time = _measure(dumps, tiles)
+        print(
+            "{:<12} list: {:>10} bytes {:>8.3f}s   single: {:>8.0f} bytes/tile "
+            "{:>8.3f}s".format(name, list_size, list_time, single_size, single_time)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
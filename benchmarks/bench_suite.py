@@ -0,0 +1,315 @@
+"""
+Benchmark suite covering the tiling hot paths on all bundled well-known scale sets.
+
+Every benchmark reports its throughput from the fastest of several timed runs and
+the peak memory allocated during one additional run traced by tracemalloc. Results
+can be stored as JSON and compared with a baseline, such as the one kept in
+benchmarks/baseline.json. Baselines are only comparable when recorded on the same
+machine. Peak memory is deterministic, throughput varies with system load, so the
+default regression threshold is generous.
+
+Usage:
+    python benchmarks/bench_suite.py [--count N] [--repeat N] [--filter TEXT]
+        [--save FILE] [--compare FILE] [--threshold FRACTION]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from meintile import TilePyramid, __version__
+from meintile.wkss import WKSS_IS_GLOBAL
+
+# zoom levels available in all bundled well-known scale sets
+ZOOMS = (2, 8, 14)
+
+# minimum duration of one timing in seconds
+MIN_TIME = 0.1
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _indexes(tile_matrix, count):
+    """Return count tile indexes of a compact window, repeated on small matrices."""
+    side = max(int(count ** 0.5), 1)
+    width = min(side, tile_matrix.width)
+    row_offset = max(tile_matrix.height // 2 - side // 2, 0)
+    col_offset = max(tile_matrix.width // 2 - width // 2, 0)
+    return [
+        (
+            (row_offset + i // width) % tile_matrix.height,
+            col_offset + i % width,
+        )
+        for i in range(count)
+    ]
+
+
+def _tiles(tile_matrix, count):
+    return [tile_matrix.tile(row, col) for row, col in _indexes(tile_matrix, count)]
+
+
+def bench_tile_construction(tile_pyramid, zoom, count):
+    """Create Tile objects."""
+    tile_matrix = tile_pyramid[zoom]
+    indexes = _indexes(tile_matrix, count)
+
+    def run():
+        return [tile_matrix.tile(row, col) for row, col in indexes]
+
+    return run, "tiles"
+
+
+def bench_tile_geometry(tile_pyramid, zoom, count):
+    """Create Tile objects and access bounds, shape and affine."""
+    tile_matrix = tile_pyramid[zoom]
+    indexes = _indexes(tile_matrix, count)
+
+    def run():
+        tiles = [tile_matrix.tile(row, col) for row, col in indexes]
+        for tile in tiles:
+            tile.bounds, tile.shape, tile.affine
+        return tiles
+
+    return run, "tiles"
+
+
+def bench_tile_set(tile_pyramid, zoom, count):
+    """Insert Tile objects into a set, every tile is contained twice."""
+    tiles = _tiles(tile_pyramid[zoom], count // 2) * 2
+
+    def run():
+        return set(tiles)
+
+    return run, "tiles"
+
+
+def bench_get_parent(tile_pyramid, zoom, count):
+    """Get parents of tiles."""
+    tiles = _tiles(tile_pyramid[zoom], count)
+
+    def run():
+        return [tile.get_parent() for tile in tiles]
+
+    return run, "tiles"
+
+
+def bench_get_children(tile_pyramid, zoom, count):
+    """Get children of tiles."""
+    tiles = _tiles(tile_pyramid[zoom], count // 4)
+
+    def run():
+        return [tile.get_children() for tile in tiles]
+
+    return run, "tiles"
+
+
+def bench_get_neighbors(tile_pyramid, zoom, count):
+    """Get 8-connected neighbors of tiles."""
+    tiles = _tiles(tile_pyramid[zoom], count // 8)
+
+    def run():
+        return [tile.get_neighbors() for tile in tiles]
+
+    return run, "tiles"
+
+
+def bench_from_wkss(tile_pyramid, zoom, count):
+    """Construct a TilePyramid from its well-known scale set definition."""
+    name = tile_pyramid._wkss_identifier
+
+    def run():
+        TilePyramid.clear_registry()
+        return TilePyramid.from_wkss(name)
+
+    return run, "pyramids"
+
+
+def bench_from_wkss_interned(tile_pyramid, zoom, count):
+    """Get an interned TilePyramid."""
+    name = tile_pyramid._wkss_identifier
+
+    def run():
+        return [TilePyramid.from_wkss(name) for _ in range(1000)]
+
+    return run, "pyramids"
+
+
+# benchmark name, function, zoom dependent, items per run
+BENCHMARKS = [
+    ("tile_construction", bench_tile_construction, True, lambda count: count),
+    ("tile_geometry", bench_tile_geometry, True, lambda count: count),
+    ("tile_set", bench_tile_set, True, lambda count: count // 2 * 2),
+    ("get_parent", bench_get_parent, True, lambda count: count),
+    ("get_children", bench_get_children, True, lambda count: count // 4),
+    ("get_neighbors", bench_get_neighbors, True, lambda count: count // 8),
+    ("from_wkss", bench_from_wkss, False, lambda count: 1),
+    ("from_wkss_interned", bench_from_wkss_interned, False, lambda count: 1000),
+]
+
+
+def _measure(run, items, repeat):
+    """Return items per second of the fastest run and traced peak memory in bytes."""
+    elapsed = []
+    # like timeit, do not let garbage collection runs add noise to timings
+    gc.collect()
+    gc.disable()
+    try:
+        number = 1
+        for _ in range(repeat):
+            # call run() often enough so one timing takes at least MIN_TIME
+            while True:
+                start = time.perf_counter()
+                for _ in range(number):
+                    run()
+                duration = time.perf_counter() - start
+                if duration >= MIN_TIME:
+                    break
+                number *= 2
+            elapsed.append(duration / number)
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return items / min(elapsed), peak
+
+
+def _import_time(repeat):
+    """Measure import meintile in fresh interpreters."""
+    code = (
+        "import time, tracemalloc; trace = {}; "
+        "trace and tracemalloc.start(); start = time.perf_counter(); "
+        "import meintile; elapsed = time.perf_counter() - start; "
+        "print(elapsed, tracemalloc.get_traced_memory()[1] if trace else 0)"
+    )
+
+    def run(trace):
+        output = subprocess.check_output([sys.executable, "-c", code.format(trace)])
+        elapsed, peak = output.decode().split()
+        return float(elapsed), int(peak)
+
+    elapsed = min(run(False)[0] for _ in range(repeat))
+    return 1 / elapsed, run(True)[1]
+
+
+def run_suite(count=20000, repeat=5, name_filter=None):
+    """Run all benchmarks and return results by benchmark key."""
+    results = {}
+
+    def record(key, unit, throughput, peak, items):
+        results[key] = dict(
+            throughput=round(throughput, 1),
+            unit="{}/s".format(unit),
+            peak_bytes=peak,
+            peak_bytes_per_item=round(peak / items, 1),
+        )
+        print(
+            "{:<52} {:>14.1f} {:<12} {:>12} B peak {:>10.1f} B/item".format(
+                key, throughput, results[key]["unit"], peak, peak / items
+            )
+        )
+
+    if not name_filter or name_filter in "import_time":
+        record("import_time", "imports", *_import_time(repeat), 1)
+    for wkss in sorted(WKSS_IS_GLOBAL):
+        tile_pyramid = TilePyramid.from_wkss(wkss)
+        for name, bench, zoom_dependent, items in BENCHMARKS:
+            for zoom in ZOOMS if zoom_dependent else [None]:
+                key = "/".join(
+                    [name, wkss] + ([] if zoom is None else ["z{}".format(zoom)])
+                )
+                if name_filter and name_filter not in key:
+                    continue
+                run, unit = bench(tile_pyramid, zoom, count)
+                throughput, peak = _measure(run, items(count), repeat)
+                record(key, unit, throughput, peak, items(count))
+    return results
+
+
+def compare(results, baseline, threshold=0.3):
+    """Print changes relative to baseline and return keys of regressions."""
+    regressions = []
+    print("\n{:<52} {:>12} {:>12}".format("benchmark", "throughput", "peak memory"))
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        speed = result["throughput"] / base["throughput"]
+        memory = (result["peak_bytes"] + 1) / (base["peak_bytes"] + 1)
+        regressed = speed < 1 - threshold or memory > 1 + threshold
+        if regressed:
+            regressions.append(key)
+        print(
+            "{:<52} {:>11.2f}x {:>11.2f}x{}".format(
+                key, speed, memory, "  REGRESSION" if regressed else ""
+            )
+        )
+    return regressions
+
+
+def _metadata(count, repeat):
+    return dict(
+        meintile=__version__,
+        python=platform.python_version(),
+        numpy=np.__version__,
+        platform=platform.platform(),
+        machine=platform.machine(),
+        cpu_count=os.cpu_count(),
+        count=count,
+        repeat=repeat,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--count", type=int, default=20000, help="tiles per run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs")
+    parser.add_argument("--filter", help="only run benchmarks containing this text")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        nargs="?",
+        const=BASELINE,
+        help="compare with results file (default: {})".format(BASELINE),
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.3,
+        help="relative change counted as regression (default: 0.3)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(count=args.count, repeat=args.repeat, name_filter=args.filter)
+    if args.save:
+        with open(args.save, "w") as dst:
+            json.dump(
+                dict(metadata=_metadata(args.count, args.repeat), results=results),
+                dst,
+                indent=2,
+                sort_keys=True,
+            )
+            dst.write("\n")
+    if args.compare:
+        with open(args.compare) as src:
+            baseline = json.load(src)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print("\n{} regressions".format(len(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Compare memory footprint and construction throughput of Tile objects.
+
+The reference implementation below mirrors the Tile class of meintile 0.1 which
+computed all geometry related attributes eagerly.
+
+Usage:
+    python benchmarks/bench_tile.py [number of tiles]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from affine import Affine
+from shapely.geometry import box
+
+from meintile import Bounds, Shape, TileIndex, TilePyramid
+from meintile._global import PRECISION
+
+
+class EagerTile(object):
+    """Tile implementation of meintile 0.1."""
+
+    def __init__(self, tile_matrix=None, row=None, col=None):
+        self.tile_matrix = self.tm = tile_matrix
+        self.tile_pyramid = self.tp = self.tile_matrix.tile_pyramid
+        self.zoom = self.tm.id
+        self.row = row
+        self.col = col
+        self.index = self.id = TileIndex(self.zoom, self.row, self.col)
+        self.pixel_x_size = self.tm.pixel_x_size
+        self.pixel_y_size = self.tm.pixel_y_size
+        tm_left, tm_top = self.tm.top_left_corner
+        tile_x_size = self.pixel_x_size * self.tm.tile_width
+        tile_y_size = self.pixel_y_size * self.tm.tile_height
+        self.top = round(tm_top + (self.row * tile_y_size), PRECISION)
+        self.bottom = round(self.top - tile_x_size, PRECISION)
+        self.left = round(tm_left + (self.col * tile_x_size), PRECISION)
+        self.right = round(self.left + tile_x_size, PRECISION)
+        self.bounds = Bounds(self.left, self.bottom, self.right, self.top)
+        self.bbox = box(*self.bounds)
+        self.x_size = self.right - self.left
+        self.y_size = self.top - self.bottom
+        self.height = self.tm.tile_height
+        self.width = self.tm.tile_width
+        self.shape = Shape(height=self.height, width=self.width)
+        self.affine = Affine(
+            self.pixel_x_size, 0, self.left, 0, self.pixel_y_size, self.top
+        )
+
+
+def _measure(tile_cls, tile_matrix, count):
+    width = tile_matrix.width
+    tracemalloc.start()
+    start = time.perf_counter()
+    tiles = [tile_cls(tile_matrix, i // width, i % width) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(tiles) == count
+    return count / elapsed, peak / count
+
+
+def main(count=100000):
+    tile_matrix = TilePyramid.from_wkss("WebMercatorQuad")[12]
+    from meintile import Tile
+
+    for name, tile_cls in [("eager (0.1)", EagerTile), ("lazy", Tile)]:
+        throughput, bytes_per_tile = _measure(tile_cls, tile_matrix, count)
+        print(
+            "{:<12} {:>12.0f} tiles/s {:>10.1f} bytes/tile".format(
+                name, throughput, bytes_per_tile
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
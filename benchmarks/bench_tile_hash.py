@@ -0,0 +1,52 @@
+"""
+Compare set building throughput of Tile objects.
+
+The reference implementation below mirrors the hashing of meintile 0.1 which hashed
+the representational string and compared tiles by identity.
+
+Usage:
+    python benchmarks/bench_tile_hash.py [number of tiles]
+"""
+
+import sys
+import time
+
+from meintile import Tile, TilePyramid
+
+
+class ReprHashTile(Tile):
+    """Tile hashing of meintile 0.1."""
+
+    __slots__ = ()
+
+    __eq__ = object.__eq__
+
+    def __hash__(self):
+        return hash(repr(self))
+
+
+def _measure(tile_cls, tile_matrix, count):
+    width = tile_matrix.width
+    # every tile is contained twice
+    tiles = [
+        tile_cls(tile_matrix, (i // 2) // width, (i // 2) % width) for i in range(count)
+    ]
+    start = time.perf_counter()
+    unique = set(tiles)
+    elapsed = time.perf_counter() - start
+    return count / elapsed, len(unique)
+
+
+def main(count=100000):
+    tile_matrix = TilePyramid.from_wkss("WebMercatorQuad")[12]
+    for name, tile_cls in [("repr (0.1)", ReprHashTile), ("structural", Tile)]:
+        throughput, unique = _measure(tile_cls, tile_matrix, count)
+        print(
+            "{:<12} {:>12.0f} tiles/s {:>10} unique of {}".format(
+                name, throughput, unique, count
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""
+Compare locality of tile iteration orders.
+
+For every order the tiles of a TileMatrix window are iterated and two metrics are
+reported:
+
+    - mean step: mean Manhattan distance in tiles between consecutive tiles
+    - block cache hit rate: tiles are grouped into blocks of 8x8 tiles (e.g. one COG
+      internal block or disk page) held in a least recently used cache of 16 blocks
+
+Usage:
+    python benchmarks/bench_tile_order.py [zoom] [window size in tiles]
+"""
+
+from collections import OrderedDict
+import sys
+import time
+
+from meintile import TilePyramid
+
+BLOCK_SIZE = 8
+CACHE_SIZE = 16
+
+
+def _block_cache_hit_rate(tiles):
+    cache = OrderedDict()
+    hits = 0
+    for tile in tiles:
+        block = (tile.row // BLOCK_SIZE, tile.col // BLOCK_SIZE)
+        if block in cache:
+            hits += 1
+            cache.move_to_end(block)
+        else:
+            cache[block] = None
+            if len(cache) > CACHE_SIZE:
+                cache.popitem(last=False)
+    return hits / len(tiles)
+
+
+def _mean_step(tiles):
+    return sum(
+        abs(a.row - b.row) + abs(a.col - b.col) for a, b in zip(tiles, tiles[1:])
+    ) / (len(tiles) - 1)
+
+
+def main(zoom=12, window_size=300):
+    tile_matrix = TilePyramid.from_wkss("WebMercatorQuad")[zoom]
+    left, _, _, top = tile_matrix.tile(1000, 1000).bounds
+    tile_size = tile_matrix.pixel_x_size * tile_matrix.tile_width
+    bounds = (
+        left,
+        top - tile_size * window_size,
+        left + tile_size * window_size,
+        top,
+    )
+    for order in ["row", "morton", "hilbert"]:
+        start = time.perf_counter()
+        tiles = list(tile_matrix.tiles_from_bounds(bounds, order=order))
+        elapsed = time.perf_counter() - start
+        print(
+            "{:<8} {:>10.0f} tiles/s   mean step {:>6.2f}   block cache hit rate {:.3f}".format(
+                order,
+                len(tiles) / elapsed,
+                _mean_step(tiles),
+                _block_cache_hit_rate(tiles),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -1,15 +1,31 @@
 from meintile._tile import Tile
+from meintile._tilearray import TileArray
 from meintile._tilematrix import TileMatrix
 from meintile._tilepyramid import TileMatrixSet, TilePyramid
-from meintile._types import Bounds, Shape, TileIndex
+from meintile._tilerange import TileRange
+from meintile._tileset import TileSet
+from meintile._types import (
+    Bounds,
+    CacheInfo,
+    RasterWindows,
+    Shape,
+    TileGeometries,
+    TileIndex,
+)
 
 __all__ = [
     "Bounds",
+    "CacheInfo",
+    "RasterWindows",
     "Shape",
     "Tile",
+    "TileArray",
+    "TileGeometries",
     "TileIndex",
     "TileMatrix",
     "TileMatrixSet",
     "TilePyramid",
+    "TileRange",
+    "TileSet",
 ]
 __version__ = "0.1"
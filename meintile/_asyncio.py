@@ -0,0 +1,55 @@
+"""
+Asynchronous tile iteration.
+
+Tiles are generated in batches. Between batches, control is given back to the event
+loop, either by awaiting the batch computed in an executor thread or by yielding to
+the loop explicitly, so other tasks keep being served while large tile covers are
+generated.
+"""
+
+from itertools import islice
+
+
+async def abatched(tiles, batch_size=1024, executor=False):
+    """
+    Yield lists of tiles from a tile iterator.
+
+    Parameters
+    ----------
+    tiles : iterable of meintile.Tile
+    batch_size : int
+        Maximum number of tiles per batch.
+    executor : bool or concurrent.futures.Executor
+        Compute batches in the default executor of the event loop (True) or in the
+        given thread based executor. (default: False, i.e. within the event loop)
+
+    Yields
+    ------
+    list of meintile.Tile
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    tiles = iter(tiles)
+    while True:
+        if executor is False:
+            batch = _batch(tiles, batch_size)
+        else:
+            batch = await loop.run_in_executor(
+                None if executor is True else executor, _batch, tiles, batch_size
+            )
+        if not batch:
+            return
+        yield batch
+        if executor is False:
+            # batches computed within the event loop do not suspend by themselves
+            await asyncio.sleep(0)
+
+
+def _batch(tiles, batch_size):
+    return list(islice(tiles, batch_size))
+
+
+def _check_batch_size(batch_size):
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
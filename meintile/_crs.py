@@ -0,0 +1,208 @@
+"""
+Process-wide cache of resolved coordinate reference systems.
+
+Resolving a CRS and querying its properties requires PROJ lookups. As all Tile
+Matrices of a Tile Matrix Set share one CRS, these are only done once per CRS input.
+"""
+
+from collections import OrderedDict
+import math
+import numpy as np
+import threading
+
+from meintile._types import CRSInfo
+
+# meters per degree at the equator of the WGS84 ellipsoid
+_METERS_PER_DEGREE = 2 * math.pi * 6378137 / 360.0
+
+# maximum number of CRS strings and EPSG codes cached by value
+_MAX_CRS_VALUES = 128
+# maximum number of CRS objects cached by identity
+_MAX_CRS_OBJECTS = 128
+
+# least recently used CRS strings and EPSG codes
+_CRS_CACHE = OrderedDict()
+# least recently used CRS objects by id, cached entries keep their CRS object alive
+# so ids are not reused
+_CRS_OBJECTS = OrderedDict()
+_CRS_LOCK = threading.Lock()
+
+# pyproj Transformer objects are not thread safe and are therefore cached per thread
+_TRANSFORMERS = threading.local()
+
+
+def crs_info(crs=None):
+    """
+    Return resolved CRS properties.
+
+    Strings and EPSG codes are cached by value, CRS objects by identity.
+
+    Parameters
+    ----------
+    crs : str, int or rasterio.crs.CRS
+        CRS object or reference to one coordinate reference system. (e.g. an OGC URI)
+
+    Returns
+    -------
+    meintile.CRSInfo
+    """
+    by_value = isinstance(crs, (str, int))
+    with _CRS_LOCK:
+        if by_value:
+            info = _cached(_CRS_CACHE, crs)
+        else:
+            info = _cached(_CRS_OBJECTS, id(crs))
+            if info is not None and info.crs is not crs:
+                info = None
+    if info is not None:
+        return info
+
+    info = _resolve(crs)
+    with _CRS_LOCK:
+        if by_value:
+            _store(_CRS_CACHE, crs, info, _MAX_CRS_VALUES)
+        # register the resolved CRS object so it can be passed on without lookup
+        _store(_CRS_OBJECTS, id(info.crs), info, _MAX_CRS_OBJECTS)
+    return info
+
+
+def _cached(cache, key):
+    """Return cached value and mark it as most recently used, caller holds lock."""
+    info = cache.get(key)
+    if info is not None:
+        cache.move_to_end(key)
+    return info
+
+
+def _store(cache, key, info, maxsize):
+    """Add value and evict least recently used ones, caller holds lock."""
+    cache[key] = info
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+def _resolve(crs):
+    from rasterio.crs import CRS
+
+    crs = CRS.from_user_input(crs)
+    is_geographic = bool(crs.is_geographic)
+    if is_geographic:
+        # TODO: find a better way to handle non-metric CRSes
+        meters_per_unit = _METERS_PER_DEGREE
+    else:
+        meters_per_unit = crs.linear_units_factor[1]
+    return CRSInfo(
+        crs=crs,
+        string=crs.to_string(),
+        meters_per_unit=meters_per_unit,
+        is_geographic=is_geographic,
+    )
+
+
+def transformer(src_crs=None, dst_crs=None):
+    """
+    Return cached pyproj Transformer between two CRSes.
+
+    Transformers expect and return coordinates in x, y order.
+
+    Parameters
+    ----------
+    src_crs : str, int or rasterio.crs.CRS
+        Source CRS.
+    dst_crs : str, int or rasterio.crs.CRS
+        Destination CRS.
+
+    Returns
+    -------
+    pyproj.Transformer
+    """
+    src_info, dst_info = crs_info(src_crs), crs_info(dst_crs)
+    key = (src_info.string, dst_info.string)
+    try:
+        cache = _TRANSFORMERS.cache
+    except AttributeError:
+        cache = _TRANSFORMERS.cache = {}
+    try:
+        return cache[key]
+    except KeyError:
+        from pyproj import Transformer
+
+        cache[key] = Transformer.from_crs(
+            src_info.crs.to_wkt(), dst_info.crs.to_wkt(), always_xy=True
+        )
+        return cache[key]
+
+
+def transform_bounds(src_crs, dst_crs, lefts, bottoms, rights, tops, densify=21):
+    """
+    Transform multiple bounds by reprojecting densified bounds edges.
+
+    Parameters
+    ----------
+    src_crs : str, int or rasterio.crs.CRS
+        Source CRS.
+    dst_crs : str, int or rasterio.crs.CRS
+        Destination CRS.
+    lefts, bottoms, rights, tops : numpy.ndarray
+        Bounds coordinates in source CRS.
+    densify : int
+        Number of points per bounds edge including corners.
+
+    Returns
+    -------
+    lefts, bottoms, rights, tops : numpy.ndarray
+        Bounds coordinates in destination CRS. Coordinates which could not be
+        transformed are ignored, bounds without any valid coordinates are NaN.
+    """
+    lefts, bottoms, rights, tops = [
+        np.asarray(i, dtype=np.float64).reshape(-1, 1)
+        for i in (lefts, bottoms, rights, tops)
+    ]
+    if densify < 2:
+        raise ValueError("densify must be at least 2")
+    if crs_info(src_crs) is crs_info(dst_crs):
+        return lefts[:, 0], bottoms[:, 0], rights[:, 0], tops[:, 0]
+    # walk around the bounds clockwise, every corner is only transformed once
+    steps = np.linspace(0.0, 1.0, densify)[:-1]
+    widths, heights = rights - lefts, tops - bottoms
+    ones = np.ones_like(steps)
+    # top, right, bottom and left edges
+    xs = np.hstack(
+        [
+            lefts + widths * steps,
+            rights * ones,
+            rights - widths * steps,
+            lefts * ones,
+        ]
+    )
+    ys = np.hstack(
+        [
+            tops * ones,
+            tops - heights * steps,
+            bottoms * ones,
+            bottoms + heights * steps,
+        ]
+    )
+    points = xs.shape[1]
+    xs, ys = transformer(src_crs, dst_crs).transform(
+        xs.ravel(), ys.ravel(), errcheck=False
+    )
+    xs = np.asarray(xs).reshape(-1, points)
+    ys = np.asarray(ys).reshape(-1, points)
+    invalid = ~(np.isfinite(xs) & np.isfinite(ys))
+    xs[invalid] = np.nan
+    ys[invalid] = np.nan
+    empty = invalid.all(axis=1)
+    # avoid warnings on all NaN rows
+    xs[empty] = 0.0
+    ys[empty] = 0.0
+    result = [
+        np.nanmin(xs, axis=1),
+        np.nanmin(ys, axis=1),
+        np.nanmax(xs, axis=1),
+        np.nanmax(ys, axis=1),
+    ]
+    for values in result:
+        values[empty] = np.nan
+    return tuple(result)
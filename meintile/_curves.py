@@ -0,0 +1,109 @@
+"""
+Space filling curves over tile rows and columns.
+
+All functions accept Python integers as well as NumPy arrays.
+"""
+
+import numpy as np
+
+# maximum number of bits per row or column
+MAX_BITS = 32
+
+
+def _spread_bits(value):
+    """Insert a zero bit left of every bit of a 32 bit value."""
+    value = value & 0x00000000FFFFFFFF
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    value = (value | (value << 1)) & 0x5555555555555555
+    return value
+
+
+def _compact_bits(value):
+    """Reverse _spread_bits()."""
+    value = value & 0x5555555555555555
+    value = (value | (value >> 1)) & 0x3333333333333333
+    value = (value | (value >> 2)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value >> 4)) & 0x00FF00FF00FF00FF
+    value = (value | (value >> 8)) & 0x0000FFFF0000FFFF
+    value = (value | (value >> 16)) & 0x00000000FFFFFFFF
+    return value
+
+
+def morton_encode(rows, cols):
+    """
+    Interleave row and column bits to a Morton (Z-order) key.
+
+    Column bits are stored on even, row bits on odd positions, i.e. every base 4
+    digit of the key is a Bing quadkey digit.
+
+    Parameters
+    ----------
+    rows : int or numpy.ndarray
+    cols : int or numpy.ndarray
+
+    Returns
+    -------
+    keys : int or numpy.ndarray of numpy.uint64
+    """
+    if isinstance(rows, np.ndarray) or isinstance(cols, np.ndarray):
+        rows = np.asarray(rows).astype(np.uint64)
+        cols = np.asarray(cols).astype(np.uint64)
+    return _spread_bits(cols) | (_spread_bits(rows) << 1)
+
+
+def morton_decode(keys):
+    """
+    Split Morton (Z-order) keys into rows and columns.
+
+    Parameters
+    ----------
+    keys : int or numpy.ndarray
+
+    Returns
+    -------
+    rows, cols : int or numpy.ndarray of numpy.int64
+    """
+    if isinstance(keys, np.ndarray):
+        keys = keys.astype(np.uint64)
+        return (
+            _compact_bits(keys >> 1).astype(np.int64),
+            _compact_bits(keys).astype(np.int64),
+        )
+    return _compact_bits(keys >> 1), _compact_bits(keys)
+
+
+def hilbert_encode(rows, cols, bits):
+    """
+    Return distance of rows and columns along a Hilbert curve.
+
+    Parameters
+    ----------
+    rows : int or numpy.ndarray
+    cols : int or numpy.ndarray
+    bits : int
+        Curve order, i.e. the curve covers a square of 2 ** bits rows and columns.
+
+    Returns
+    -------
+    distances : numpy.ndarray of numpy.uint64
+    """
+    x, y = np.broadcast_arrays(
+        np.asarray(cols, dtype=np.int64), np.asarray(rows, dtype=np.int64)
+    )
+    distances = np.zeros(x.shape, dtype=np.uint64)
+    n = 1 << bits
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distances += np.uint64(s * s) * ((3 * rx) ^ ry).astype(np.uint64)
+        # rotate quadrant
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return distances
@@ -0,0 +1,136 @@
+"""
+Parallel processing of tiles.
+
+Tiles are grouped into chunks along aligned Morton (Z-order) blocks, i.e. every chunk
+covers a compact square area. Workers therefore process neighboring tiles, which keeps
+raster and tile caches warm, and only tile indexes have to be sent to the workers.
+"""
+
+import numbers
+import os
+import numpy as np
+
+from meintile._curves import morton_encode
+from meintile._tile import Tile
+
+
+def map_tiles(
+    tile_pyramid,
+    func,
+    tiles_or_bounds,
+    zoom=None,
+    executor="thread",
+    workers=None,
+    chunk_size=256,
+    max_pending=None,
+    pixelbuffer=0,
+):
+    """
+    Apply function to tiles in parallel and yield results as they complete.
+
+    See TilePyramid.map_tiles().
+    """
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        wait,
+    )
+
+    chunks = _chunks(
+        tile_pyramid,
+        tiles_or_bounds,
+        zoom,
+        # largest Morton block level which fits into chunk_size
+        (chunk_size.bit_length() - 1) // 2,
+        pixelbuffer,
+    )
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers)
+        owned = True
+    elif executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers)
+        owned = True
+    else:
+        pool = executor
+        owned = False
+    if max_pending is None:
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+
+    pending = set()
+    try:
+        for chunk in chunks:
+            # backpressure: wait for results before submitting more chunks
+            while len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(pool.submit(_map_chunk, func, *chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True)
+
+
+def _map_chunk(func, tile_matrix, rows, cols, pixelbuffer):
+    """Apply function to tiles of one chunk within a worker."""
+    results = []
+    for row, col in zip(rows, cols):
+        tile = tile_matrix.tile(row, col, pixelbuffer=pixelbuffer)
+        results.append((tile, func(tile)))
+    return results
+
+
+def _chunks(tile_pyramid, tiles_or_bounds, zoom, block_level, pixelbuffer):
+    """Yield (tile matrix, rows, cols, pixelbuffer) tuples ordered along a Morton curve."""
+    if _is_bounds(tiles_or_bounds):
+        rows, cols = tile_pyramid[zoom]._window_indexes(tiles_or_bounds)
+        yield from _morton_chunks(
+            tile_pyramid[zoom], rows, cols, block_level, pixelbuffer
+        )
+        return
+
+    # group tile indexes by zoom level and pixelbuffer
+    groups = {}
+    for tile in tiles_or_bounds:
+        if not isinstance(tile, Tile):
+            raise TypeError("tiles must be Tile objects, not {}".format(type(tile)))
+        if tile.tile_pyramid is not tile_pyramid:
+            raise ValueError("tile {} is not part of Tile Pyramid".format(tile))
+        rows, cols = groups.setdefault((tile.zoom, tile.pixelbuffer), ([], []))
+        rows.append(tile.row)
+        cols.append(tile.col)
+    for (tile_zoom, tile_pixelbuffer), (rows, cols) in sorted(groups.items()):
+        yield from _morton_chunks(
+            tile_pyramid[tile_zoom],
+            np.array(rows, dtype=np.int64),
+            np.array(cols, dtype=np.int64),
+            block_level,
+            tile_pixelbuffer,
+        )
+
+
+def _morton_chunks(tile_matrix, rows, cols, block_level, pixelbuffer):
+    if not len(rows):
+        return
+    keys = morton_encode(rows, cols)
+    order = np.argsort(keys, kind="stable")
+    rows, cols, keys = rows[order], cols[order], keys[order]
+    # split where tiles enter the next Morton block
+    blocks = keys >> np.uint64(2 * block_level)
+    splits = np.flatnonzero(blocks[1:] != blocks[:-1]) + 1
+    for chunk_rows, chunk_cols in zip(np.split(rows, splits), np.split(cols, splits)):
+        yield tile_matrix, chunk_rows.tolist(), chunk_cols.tolist(), pixelbuffer
+
+
+def _is_bounds(value):
+    return (
+        isinstance(value, (tuple, list))
+        and len(value) == 4
+        and all(isinstance(i, numbers.Real) for i in value)
+    )
@@ -1,11 +1,11 @@
-from affine import Affine
-from shapely.geometry import box
+from functools import total_ordering
 
 from meintile.exceptions import InvalidTileIndex, InvalidTileMatrixIndex
 from meintile._global import PRECISION
 from meintile._types import Bounds, Shape, TileIndex
 
 
+@total_ordering
 class Tile(object):
     """
     A Tile is a square somewhere on Earth.
@@ -13,8 +13,10 @@ class Tile(object):
     Each Tile can be identified with the zoom, row, column index in a
     TilePyramid.
 
-    Some tile functions can accept a tile buffer in pixels (pixelbuffer). A
-    pixelbuffer value of e.g. 1 will extend the tile boundaries by 1 pixel.
+    Tiles can have a tile buffer in pixels (pixelbuffer). A pixelbuffer value of
+    e.g. 1 will extend the tile boundaries by 1 pixel. On global Tile Pyramids the
+    buffered boundaries are clipped at the northern and southern Tile Matrix bounds
+    but can extend over the Antimeridian.
 
     Attributes
     ----------
@@ -30,12 +32,14 @@ class Tile(object):
         Column within Tile Matrix.
     index, id : meintile.TileIndex
         Unique tile index.
+    pixelbuffer : int
+        Tile buffer in pixels.
     pixel_x_size : float
         Pixel size alongside x axis.
     pixel_y_size : float
         Pixel size alongside y axis.
     bounds : meintile.Bounds
-        Bounding coordinates of tile
+        Bounding coordinates of tile including pixelbuffer.
     bbox : shapely.geometry.Polygon
         Polygon geometry of tile.
     left : float
@@ -51,19 +55,34 @@ class Tile(object):
     y_size : float
         Tile height in CRS units.
     shape : meintile.Shape
-        Tile shape in pixels.
+        Tile shape in pixels including pixelbuffer.
     height : int
-        Tile height in pixels.
+        Tile height in pixels including pixelbuffer.
     width : int
-        Tile width in pixels.
+        Tile width in pixels including pixelbuffer.
     affine : affine.Affine
         Affine object to locate tile using rasterio.
     """
 
-    def __init__(self, tile_matrix=None, row=None, col=None):
+    __slots__ = (
+        "tile_matrix",
+        "row",
+        "col",
+        "pixelbuffer",
+        "_bounds",
+        "_bbox",
+        "_affine",
+        "_shape",
+    )
+
+    def __init__(self, tile_matrix=None, row=None, col=None, pixelbuffer=0):
         """
         Initialize a Tile object.
 
+        Only the parent Tile Matrix and the row and column are stored. Geometry
+        related attributes such as bounds, bbox, shape and affine are computed on
+        first access and cached.
+
         Parameters
         ----------
         tile_matrix : meintile.TileMatrix
@@ -72,55 +91,168 @@ class Tile(object):
             Row within parent Tile Matrix.
         col : int
             Column within Tile Matrix.
+        pixelbuffer : int
+            Tile buffer in pixels. (default: 0)
         """
-        self.tile_matrix = self.tm = tile_matrix
-        self.tile_pyramid = self.tp = self.tile_matrix.tile_pyramid
-
         # assert Tile is valid
         if not isinstance(row, int):
             raise InvalidTileIndex("row must be an integer, not {}".format(row))
-        if row >= self.tile_matrix.height:
+        if row >= tile_matrix.height:
             raise InvalidTileIndex(
                 "Tile row ({}) exceeds matrix height ({})".format(
-                    row, self.tile_matrix.height
+                    row, tile_matrix.height
                 )
             )
         if not isinstance(col, int):
             raise InvalidTileIndex("col must be an integer, not {}".format(col))
-        if col >= self.tile_matrix.width:
+        if col >= tile_matrix.width:
             raise InvalidTileIndex(
-                "Tile col ({}) exceeds matrix width ({})".format(col, self.tm.width)
+                "Tile col ({}) exceeds matrix width ({})".format(col, tile_matrix.width)
             )
-        # get Tile index values
-        self.zoom = self.tm.id
+        if not isinstance(pixelbuffer, int) or pixelbuffer < 0:
+            raise ValueError("pixelbuffer must be a non-negative integer")
+        self.tile_matrix = tile_matrix
         self.row = row
         self.col = col
-        self.index = self.id = TileIndex(self.zoom, self.row, self.col)
-
-        # Tile properties in CRS units
-        self.pixel_x_size = self.tm.pixel_x_size
-        self.pixel_y_size = self.tm.pixel_y_size
-        tm_left, tm_top = self.tm.top_left_corner
-        tile_x_size = self.pixel_x_size * self.tm.tile_width
-        tile_y_size = self.pixel_y_size * self.tm.tile_height
-        self.top = round(tm_top + (self.row * tile_y_size), PRECISION)
-        self.bottom = round(self.top - tile_x_size, PRECISION)
-        self.left = round(tm_left + (self.col * tile_x_size), PRECISION)
-        self.right = round(self.left + tile_x_size, PRECISION)
-        self.bounds = Bounds(self.left, self.bottom, self.right, self.top)
-        self.bbox = box(*self.bounds)
-        self.x_size = self.right - self.left
-        self.y_size = self.top - self.bottom
-
-        # Tile properties in pixel units
-        self.height = self.tm.tile_height
-        self.width = self.tm.tile_width
-        self.shape = Shape(height=self.height, width=self.width)
-
-        # Affine object for rasterio
-        self.affine = Affine(
-            self.pixel_x_size, 0, self.left, 0, self.pixel_y_size, self.top
-        )
+        self.pixelbuffer = pixelbuffer
+        self._bounds = None
+        self._bbox = None
+        self._affine = None
+        self._shape = None
+
+    @property
+    def tm(self):
+        """Parent Tile Matrix."""
+        return self.tile_matrix
+
+    @property
+    def tile_pyramid(self):
+        """Parent Tile Pyramid of parent Tile Matrix."""
+        return self.tile_matrix.tile_pyramid
+
+    tp = tile_pyramid
+
+    @property
+    def zoom(self):
+        """Zoom level / parent Tile Matrix identifier."""
+        return self.tile_matrix.id
+
+    @property
+    def index(self):
+        """Unique tile index."""
+        return TileIndex(self.tile_matrix.id, self.row, self.col)
+
+    id = index
+
+    @property
+    def pixel_x_size(self):
+        """Pixel size alongside x axis."""
+        return self.tile_matrix.pixel_x_size
+
+    @property
+    def pixel_y_size(self):
+        """Pixel size alongside y axis."""
+        return self.tile_matrix.pixel_y_size
+
+    @property
+    def bounds(self):
+        """Bounding coordinates of tile."""
+        if self._bounds is None:
+            tm = self.tile_matrix
+            tm_left, tm_top = tm.top_left_corner
+            tile_x_size = tm.pixel_x_size * tm.tile_width
+            tile_y_size = tm.pixel_y_size * tm.tile_height
+            top = round(tm_top + (self.row * tile_y_size), PRECISION)
+            bottom = round(top + tile_y_size, PRECISION)
+            left = round(tm_left + (self.col * tile_x_size), PRECISION)
+            right = round(left + tile_x_size, PRECISION)
+            if self.pixelbuffer:
+                offset = tm.pixel_x_size * self.pixelbuffer
+                left = round(left - offset, PRECISION)
+                bottom = round(bottom - offset, PRECISION)
+                right = round(right + offset, PRECISION)
+                top = round(top + offset, PRECISION)
+                # on global grids clip at northern and southern TileMatrix bound
+                if tm._is_global:
+                    top = min(top, tm.top)
+                    bottom = max(bottom, tm.bottom)
+            self._bounds = Bounds(left, bottom, right, top)
+        return self._bounds
+
+    @property
+    def bbox(self):
+        """Polygon geometry of tile."""
+        if self._bbox is None:
+            from shapely.geometry import box
+
+            self._bbox = box(*self.bounds)
+        return self._bbox
+
+    @property
+    def left(self):
+        """Left coordinate of tile."""
+        return self.bounds.left
+
+    @property
+    def bottom(self):
+        """Bottom coordinate of tile."""
+        return self.bounds.bottom
+
+    @property
+    def right(self):
+        """Right coordinate of tile."""
+        return self.bounds.right
+
+    @property
+    def top(self):
+        """Top coordinate of tile."""
+        return self.bounds.top
+
+    @property
+    def x_size(self):
+        """Tile width in CRS units."""
+        return self.right - self.left
+
+    @property
+    def y_size(self):
+        """Tile height in CRS units."""
+        return self.top - self.bottom
+
+    @property
+    def shape(self):
+        """Tile shape in pixels."""
+        if self._shape is None:
+            tm = self.tile_matrix
+            height = tm.tile_height + 2 * self.pixelbuffer
+            width = tm.tile_width + 2 * self.pixelbuffer
+            if self.pixelbuffer and tm._is_global:
+                # on first and last row, remove pixelbuffer on top or bottom
+                if self.row == 0:
+                    height -= self.pixelbuffer
+                if self.row == tm.height - 1:
+                    height -= self.pixelbuffer
+            self._shape = Shape(height=height, width=width)
+        return self._shape
+
+    @property
+    def height(self):
+        """Tile height in pixels."""
+        return self.shape.height
+
+    @property
+    def width(self):
+        """Tile width in pixels."""
+        return self.shape.width
+
+    @property
+    def affine(self):
+        """Affine object to locate tile using rasterio."""
+        if self._affine is None:
+            from affine import Affine
+
+            left, _, _, top = self.bounds
+            self._affine = Affine(self.pixel_x_size, 0, left, 0, self.pixel_y_size, top)
+        return self._affine
 
     def get_parent(self):
         """
@@ -132,10 +264,30 @@ class Tile(object):
             If no parent is available, None is returned.
         """
         try:
-            return self.tm.tp.tile(self.zoom - 1, self.row // 2, self.col // 2)
+            return self.get_ancestor(self.zoom - 1)
         except InvalidTileMatrixIndex:
             return None
 
+    def get_ancestor(self, zoom=None):
+        """
+        Return tile from a lower zoom level containing this tile.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier, must not be higher than tile zoom
+
+        Returns
+        -------
+        ancestor : meintile.Tile
+        """
+        shift = self.zoom - zoom
+        if shift < 0:
+            raise ValueError("ancestor zoom must not be higher than tile zoom")
+        return self.tp.tile(
+            zoom, self.row >> shift, self.col >> shift, pixelbuffer=self.pixelbuffer
+        )
+
     def get_children(self):
         """
         Return tiles from next zoom level.
@@ -144,10 +296,12 @@ class Tile(object):
         -------
         children : list of meintile.Tile
         """
-        next_zoom = self.zoom + 1
+        tile_matrix = self.tp[self.zoom + 1]
         return [
-            self.tm.tp.tile(
-                next_zoom, self.row * 2 + row_offset, self.col * 2 + col_offset
+            tile_matrix.tile(
+                self.row * 2 + row_offset,
+                self.col * 2 + col_offset,
+                pixelbuffer=self.pixelbuffer,
             )
             for row_offset, col_offset in [
                 (0, 0),  # top left
@@ -155,15 +309,38 @@ class Tile(object):
                 (1, 1),  # bottom right
                 (1, 0),  # bottom left
             ]
-            if all(
-                [
-                    self.row * 2 + row_offset < self.tm.tp.matrix_height(next_zoom),
-                    self.col * 2 + col_offset < self.tm.tp.matrix_width(next_zoom),
-                ]
-            )
+            if self.row * 2 + row_offset < tile_matrix.height
+            and self.col * 2 + col_offset < tile_matrix.width
         ]
 
-    def get_neighbors(self, connectedness=8):
+    def get_descendants(self, zoom=None):
+        """
+        Return tiles from a higher zoom level covered by this tile.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier, must not be lower than tile zoom
+
+        Returns
+        -------
+        descendants : meintile.TileRange
+            Lazy window of tiles, Tile objects are only created when iterating.
+        """
+        from meintile._tilerange import TileRange
+
+        shift = zoom - self.zoom
+        if shift < 0:
+            raise ValueError("descendant zoom must not be lower than tile zoom")
+        tile_matrix = self.tp[zoom]
+        return TileRange(
+            tile_matrix,
+            range(self.row << shift, min((self.row + 1) << shift, tile_matrix.height)),
+            range(self.col << shift, min((self.col + 1) << shift, tile_matrix.width)),
+            pixelbuffer=self.pixelbuffer,
+        )
+
+    def get_neighbors(self, connectedness=8, radius=1):
         """
         Return tile neighbors.
 
@@ -180,68 +357,88 @@ class Tile(object):
         | 7 | 3 | 6 |
         -------------
 
+        With a radius larger than 1, neighbors are returned ring by ring. See
+        TileMatrix.neighbor_indexes() for the order within rings and to get rows and
+        columns as arrays without creating Tile objects.
+
         Parameters
         ----------
         connectedness : int, (4 or 8)
             Return the four direct neighbors or all eight.
+        radius : int
+            Maximum distance to neighbors in tiles. (default: 1)
 
         Returns
         -------
         neighbors : list of meintile.Tile
         """
-        if connectedness not in [4, 8]:
-            raise ValueError("only connectedness values 8 or 4 are allowed")
-
-        unique_neighbors = {}
-        # 4-connected neighborsfor pyramid
-        matrix_offsets = [
-            (-1, 0),  # 1: above
-            (0, 1),  # 2: right
-            (1, 0),  # 3: below
-            (0, -1),  # 4: left
+        rows, cols = self.tile_matrix.neighbor_indexes(
+            self.row, self.col, radius=radius, connectedness=connectedness
+        )
+        return [
+            self.tile_matrix.tile(row, col, pixelbuffer=self.pixelbuffer)
+            for row, col in zip(rows.tolist(), cols.tolist())
         ]
-        if connectedness == 8:
-            matrix_offsets.extend(
-                [
-                    (-1, 1),  # 5: above right
-                    (1, 1),  # 6: below right
-                    (1, -1),  # 7: below left
-                    (-1, -1),  # 8: above left
-                ]
-            )
-
-        for row_offset, col_offset in matrix_offsets:
-            new_row = self.row + row_offset
-            new_col = self.col + col_offset
-            # omit if row is outside of tile matrix
-            if new_row < 0 or new_row >= self.tp.matrix_height(self.zoom):
-                continue
-            # wrap around antimeridian if new column is outside of tile matrix
-            if new_col < 0:
-                if not self.tp.is_global:
-                    continue
-                new_col = self.tp.matrix_width(self.zoom) + new_col
-            elif new_col >= self.tp.matrix_width(self.zoom):
-                if not self.tp.is_global:
-                    continue
-                new_col -= self.tp.matrix_width(self.zoom)
-            # omit if new tile is current tile
-            if new_row == self.row and new_col == self.col:
-                continue
-            # create new tile
-            unique_neighbors[(new_row, new_col)] = self.tp.tile(
-                self.zoom, new_row, new_col
-            )
-
-        return unique_neighbors.values()
 
     def __repr__(self):
         """Return representational string."""
+        if self.pixelbuffer:
+            return "Tile(%s, pixelbuffer=%s, %s)" % (self.id, self.pixelbuffer, self.tm)
         return "Tile(%s, %s)" % (self.id, self.tm)
 
+    def __eq__(self, other):
+        """Tiles are equal if they share tile index, pixelbuffer and Tile Matrix Set."""
+        if not isinstance(other, Tile):
+            return NotImplemented
+        return (
+            self.row == other.row
+            and self.col == other.col
+            and self.pixelbuffer == other.pixelbuffer
+            and self.tile_matrix.id == other.tile_matrix.id
+            and _matrix_set(self.tile_matrix) is _matrix_set(other.tile_matrix)
+        )
+
+    def __lt__(self, other):
+        """Order tiles by zoom, row, col and pixelbuffer."""
+        if not isinstance(other, Tile):
+            return NotImplemented
+        return (self.tile_matrix.id, self.row, self.col, self.pixelbuffer) < (
+            other.tile_matrix.id,
+            other.row,
+            other.col,
+            other.pixelbuffer,
+        )
+
     def __hash__(self):
         """Return unique hash."""
-        return hash(repr(self))
+        return hash(
+            (
+                id(_matrix_set(self.tile_matrix)),
+                self.tile_matrix.id,
+                self.row,
+                self.col,
+                self.pixelbuffer,
+            )
+        )
+
+    def __reduce__(self):
+        """Pickle as Tile Matrix Set, tile index and pixelbuffer only."""
+        tile_matrix = self.tile_matrix
+        if tile_matrix.tile_pyramid is None:
+            return (
+                _unpickle_tile,
+                (tile_matrix, None, self.row, self.col, self.pixelbuffer),
+            )
+        return (
+            _unpickle_tile,
+            (
+                tile_matrix.tile_pyramid,
+                tile_matrix.id,
+                self.row,
+                self.col,
+                self.pixelbuffer,
+            ),
+        )
 
     def __iter__(self):
         """
@@ -254,3 +451,16 @@ class Tile(object):
         yield self.zoom
         yield self.row
         yield self.col
+
+
+def _matrix_set(tile_matrix):
+    """Return Tile Matrix Set or Tile Matrix if the latter has no parent."""
+    if tile_matrix.tile_pyramid is None:
+        return tile_matrix
+    return tile_matrix.tile_pyramid
+
+
+def _unpickle_tile(matrix_set, zoom, row, col, pixelbuffer):
+    """Restore Tile from Tile Matrix Set or from Tile Matrix if zoom is None."""
+    tile_matrix = matrix_set if zoom is None else matrix_set[zoom]
+    return tile_matrix.tile(row, col, pixelbuffer=pixelbuffer)
@@ -0,0 +1,376 @@
+"""
+Columnar collection of tiles.
+
+Zoom levels, rows and columns are held in three NumPy arrays instead of one Tile object
+per element. Tile objects are only created when single elements are accessed.
+"""
+
+import numpy as np
+
+from meintile.exceptions import InvalidTileIndex, InvalidTileMatrixIndex
+from meintile._curves import hilbert_encode, morton_encode
+from meintile._tile import Tile
+from meintile._tilematrix import _index_array
+from meintile._types import Bounds
+
+# row and column offsets of children in the order of Tile.get_children()
+_CHILD_ROW_OFFSETS = np.array([0, 0, 1, 1], dtype=np.int64)
+_CHILD_COL_OFFSETS = np.array([0, 1, 1, 0], dtype=np.int64)
+
+
+class TileArray:
+    """
+    Array of tiles of one TileMatrixSet.
+
+    Slicing returns views on the same index arrays, boolean masks and integer arrays
+    select copies. Single elements are returned as Tile objects.
+
+    Attributes
+    ----------
+    tile_pyramid, tp : meintile.TileMatrixSet
+        Parent Tile Matrix Set.
+    zooms : numpy.ndarray
+        Zoom levels / TileMatrix identifiers. (read-only)
+    rows : numpy.ndarray
+        TileMatrix rows. (read-only)
+    cols : numpy.ndarray
+        TileMatrix columns. (read-only)
+    pixelbuffer : int
+        Tile buffer in pixels of generated Tile objects.
+    """
+
+    __slots__ = ("tile_pyramid", "zooms", "rows", "cols", "pixelbuffer")
+
+    def __init__(
+        self, tile_pyramid=None, zooms=None, rows=None, cols=None, pixelbuffer=0
+    ):
+        """
+        Initialize a TileArray object.
+
+        Integer arrays are used without copying.
+
+        Parameters
+        ----------
+        tile_pyramid : meintile.TileMatrixSet
+            Parent Tile Matrix Set.
+        zooms : int or array_like
+            zoom levels / TileMatrix identifiers
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+        pixelbuffer : int
+            Tile buffer in pixels of generated Tile objects. (default: 0)
+        """
+        if not isinstance(pixelbuffer, int) or pixelbuffer < 0:
+            raise ValueError("pixelbuffer must be a non-negative integer")
+        zooms, rows, cols = [
+            # views, so read-only flags do not affect the input arrays
+            i.ravel().view()
+            for i in np.broadcast_arrays(
+                _index_array(zooms), _index_array(rows), _index_array(cols)
+            )
+        ]
+        position = _matrix_positions(tile_pyramid, zooms)
+        arrays = tile_pyramid._matrix_arrays
+        if (
+            (rows < 0).any()
+            or (rows >= arrays["height"][position]).any()
+            or (cols < 0).any()
+            or (cols >= arrays["width"][position]).any()
+        ):
+            raise InvalidTileIndex("tile indexes are outside of TileMatrix")
+        for array in (zooms, rows, cols):
+            array.flags.writeable = False
+        self._init(tile_pyramid, zooms, rows, cols, pixelbuffer)
+
+    def _init(self, tile_pyramid, zooms, rows, cols, pixelbuffer):
+        self.tile_pyramid = tile_pyramid
+        self.zooms = zooms
+        self.rows = rows
+        self.cols = cols
+        self.pixelbuffer = pixelbuffer
+
+    @classmethod
+    def _from_valid(cls, tile_pyramid, zooms, rows, cols, pixelbuffer):
+        """Create TileArray from already validated arrays."""
+        tile_array = cls.__new__(cls)
+        for array in (zooms, rows, cols):
+            array.flags.writeable = False
+        tile_array._init(tile_pyramid, zooms, rows, cols, pixelbuffer)
+        return tile_array
+
+    @classmethod
+    def from_tiles(cls, tile_pyramid=None, tiles=None, pixelbuffer=0):
+        """
+        Create TileArray from Tile objects or tile indexes.
+
+        Parameters
+        ----------
+        tile_pyramid : meintile.TileMatrixSet
+            Parent Tile Matrix Set.
+        tiles : iterable of meintile.Tile or meintile.TileIndex
+            Tiles, pixelbuffers of Tile objects are ignored.
+        pixelbuffer : int
+            Tile buffer in pixels of generated Tile objects. (default: 0)
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        indexes = []
+        for tile in tiles:
+            if isinstance(tile, Tile):
+                if tile.tile_pyramid is not tile_pyramid:
+                    raise ValueError("tile {} is not part of Tile Pyramid".format(tile))
+                tile = tile.id
+            indexes.append(tuple(tile))
+        zooms, rows, cols = np.array(indexes, dtype=np.int64).reshape(-1, 3).T
+        return cls(tile_pyramid, zooms, rows, cols, pixelbuffer=pixelbuffer)
+
+    @classmethod
+    def from_bounds(cls, tile_pyramid=None, bounds=None, zoom=None, pixelbuffer=0):
+        """
+        Create TileArray from tiles intersecting with bounds, ordered row by row.
+
+        Parameters
+        ----------
+        tile_pyramid : meintile.TileMatrixSet
+            Parent Tile Matrix Set.
+        bounds : tuple or meintile.Bounds
+            Bounding coordinates (left, bottom, right, top) in CRS units.
+        zoom : int
+            zoom level / TileMatrix identifier
+        pixelbuffer : int
+            Tile buffer in pixels of generated Tile objects. (default: 0)
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        rows, cols = tile_pyramid[zoom]._window_indexes(bounds)
+        return cls(tile_pyramid, zoom, rows, cols, pixelbuffer=pixelbuffer)
+
+    @classmethod
+    def concatenate(cls, tile_arrays=None):
+        """
+        Join TileArrays of one Tile Matrix Set.
+
+        If only one TileArray is not empty, it is returned without copying.
+
+        Parameters
+        ----------
+        tile_arrays : iterable of meintile.TileArray
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        tile_arrays = list(tile_arrays)
+        if not tile_arrays:
+            raise ValueError("at least one TileArray is required")
+        first = tile_arrays[0]
+        for tile_array in tile_arrays[1:]:
+            if tile_array.tile_pyramid is not first.tile_pyramid:
+                raise ValueError("TileArrays are not part of the same Tile Pyramid")
+            if tile_array.pixelbuffer != first.pixelbuffer:
+                raise ValueError("TileArrays have different pixelbuffers")
+        not_empty = [i for i in tile_arrays if len(i)]
+        if len(not_empty) <= 1:
+            return not_empty[0] if not_empty else first
+        return cls._from_valid(
+            first.tile_pyramid,
+            np.concatenate([i.zooms for i in not_empty]),
+            np.concatenate([i.rows for i in not_empty]),
+            np.concatenate([i.cols for i in not_empty]),
+            first.pixelbuffer,
+        )
+
+    @property
+    def tp(self):
+        """Parent Tile Matrix Set."""
+        return self.tile_pyramid
+
+    def parents(self):
+        """
+        Return parent tiles from previous zoom levels.
+
+        This is the vectorized version of Tile.get_parent().
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        zooms = self.zooms - 1
+        _matrix_positions(self.tile_pyramid, zooms)
+        return self._from_valid(
+            self.tile_pyramid, zooms, self.rows >> 1, self.cols >> 1, self.pixelbuffer
+        )
+
+    def children(self):
+        """
+        Return child tiles from next zoom levels.
+
+        This is the vectorized version of Tile.get_children(). Children of one tile
+        are consecutive and ordered top left, top right, bottom right, bottom left.
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        zooms = np.repeat(self.zooms + 1, 4)
+        rows = (self.rows[:, np.newaxis] * 2 + _CHILD_ROW_OFFSETS).ravel()
+        cols = (self.cols[:, np.newaxis] * 2 + _CHILD_COL_OFFSETS).ravel()
+        position = _matrix_positions(self.tile_pyramid, zooms)
+        arrays = self.tile_pyramid._matrix_arrays
+        within = (rows < arrays["height"][position]) & (
+            cols < arrays["width"][position]
+        )
+        if not within.all():
+            zooms, rows, cols = zooms[within], rows[within], cols[within]
+        return self._from_valid(self.tile_pyramid, zooms, rows, cols, self.pixelbuffer)
+
+    def argsort(self, order="row"):
+        """
+        Return indexes which sort tiles by zoom level and within each zoom level.
+
+        Parameters
+        ----------
+        order : str
+            Either "row" (row by row), "morton" (Morton or Z-order curve) or
+            "hilbert" (Hilbert curve). See TileMatrix.tiles_from_bounds().
+            (default: "row")
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        single_zoom = not len(self) or (self.zooms == self.zooms[0]).all()
+        if order == "row":
+            if single_zoom:
+                # one combined key sorts faster than multiple keys
+                width = self.tile_pyramid[int(self.zooms[0])].width if len(self) else 0
+                return np.argsort(self.rows * width + self.cols, kind="stable")
+            return np.lexsort((self.cols, self.rows, self.zooms))
+        elif order == "morton":
+            keys = morton_encode(self.rows, self.cols)
+        elif order == "hilbert":
+            keys = np.zeros(len(self), dtype=np.uint64)
+            for zoom in np.unique(self.zooms).tolist():
+                tm = self.tile_pyramid[zoom]
+                selected = self.zooms == zoom
+                keys[selected] = hilbert_encode(
+                    self.rows[selected],
+                    self.cols[selected],
+                    (max(tm.width, tm.height) - 1).bit_length(),
+                )
+        else:
+            raise ValueError("invalid order given: {}".format(order))
+        if single_zoom:
+            return np.argsort(keys, kind="stable")
+        return np.lexsort((keys, self.zooms))
+
+    def sort(self, order="row"):
+        """
+        Return sorted copy.
+
+        Parameters
+        ----------
+        order : str
+            Either "row", "morton" or "hilbert". See argsort(). (default: "row")
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        return self[self.argsort(order=order)]
+
+    def unique(self):
+        """
+        Return unique tiles sorted by zoom level, row and column.
+
+        Returns
+        -------
+        meintile.TileArray
+        """
+        sorted_array = self.sort()
+        if len(sorted_array) < 2:
+            return sorted_array
+        zooms, rows, cols = sorted_array.zooms, sorted_array.rows, sorted_array.cols
+        first = np.ones(len(zooms), dtype=bool)
+        first[1:] = (
+            (zooms[1:] != zooms[:-1])
+            | (rows[1:] != rows[:-1])
+            | (cols[1:] != cols[:-1])
+        )
+        return sorted_array[first]
+
+    def bounds(self):
+        """
+        Return bounding coordinates of all tiles including pixelbuffer.
+
+        Values are rounded the same way as Tile.bounds.
+
+        Returns
+        -------
+        meintile.Bounds
+            Bounds of numpy.ndarray objects.
+        """
+        geometries = self.tile_pyramid.tile_geometries(
+            self.zooms, self.rows, self.cols, pixelbuffer=self.pixelbuffer
+        )
+        left, bottom = geometries.left, geometries.bottom
+        right, top = geometries.right, geometries.top
+        return Bounds(left, bottom, right, top)
+
+    def __getitem__(self, key):
+        """Return Tile object by position or TileArray by slice, mask or positions."""
+        if isinstance(key, (int, np.integer)):
+            return self.tile_pyramid.tile(
+                int(self.zooms[key]),
+                int(self.rows[key]),
+                int(self.cols[key]),
+                pixelbuffer=self.pixelbuffer,
+            )
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+            if key.dtype != bool and key.dtype.kind not in "iu":
+                raise TypeError("invalid index: {}".format(key))
+        return self._from_valid(
+            self.tile_pyramid,
+            self.zooms[key],
+            self.rows[key],
+            self.cols[key],
+            self.pixelbuffer,
+        )
+
+    def __iter__(self):
+        """Yield Tile objects."""
+        tile = self.tile_pyramid.tile
+        for zoom, row, col in zip(
+            self.zooms.tolist(), self.rows.tolist(), self.cols.tolist()
+        ):
+            yield tile(zoom, row, col, pixelbuffer=self.pixelbuffer)
+
+    def __len__(self):
+        """Number of tiles."""
+        return len(self.zooms)
+
+    def __repr__(self):
+        """Return representational string."""
+        return "TileArray(tiles={}, zooms={}, pixelbuffer={})".format(
+            len(self), np.unique(self.zooms).tolist(), self.pixelbuffer
+        )
+
+
+def _matrix_positions(tile_matrix_set, zooms):
+    """Return positions of TileMatrix properties in TileMatrixSet._matrix_arrays."""
+    ids = tile_matrix_set._matrix_arrays["id"]
+    position = np.searchsorted(ids, zooms)
+    np.clip(position, 0, len(ids) - 1, out=position)
+    invalid = ids[position] != zooms
+    if invalid.any():
+        raise InvalidTileMatrixIndex(
+            "TileMatrix '{}' not found".format(zooms[invalid][0])
+        )
+    return position
@@ -1,15 +1,36 @@
+from collections import OrderedDict
+from functools import lru_cache
 import math
-from rasterio.crs import CRS
+import numpy as np
+import threading
 
+from meintile.exceptions import InvalidTileIndex
+from meintile._crs import crs_info
+from meintile._curves import hilbert_encode, morton_encode
 from meintile._global import PRECISION, SCALE_MULTIPLIER
 from meintile._tile import Tile
-from meintile._types import Bounds
+from meintile._types import Bounds, CacheInfo, RasterWindows, TileGeometries
+
+# round(x, PRECISION) does not change values at or above this magnitude
+_ROUND_NOOP_THRESHOLD = 2.0 ** 53 * 10.0 ** -PRECISION
+# exact power of ten used to round below _ROUND_NOOP_THRESHOLD, split into two halves
+# of 26 significant bits for exact products (Dekker)
+_ROUND_SCALE = 10.0 ** PRECISION
+_ROUND_SCALE_HI = _ROUND_SCALE * 134217729.0 - (
+    _ROUND_SCALE * 134217729.0 - _ROUND_SCALE
+)
+_ROUND_SCALE_LO = _ROUND_SCALE - _ROUND_SCALE_HI
+
+# decimals used to snap coordinates to tile borders before flooring to tile indexes
+_INDEX_PRECISION = 9
 
 
 class TileMatrix:
     """
     A TileMatrix object contains Tiles organized in rows and columns.
 
+    TileMatrix objects are immutable.
+
     Attributes
     ----------
     identifier : int
@@ -23,7 +44,7 @@ class TileMatrix:
         units of measure for the horizontal dimensions, then metersPerUnit=1; if it
         has degrees, then metersPerUnit=2pa/360 (a is the Earth maximum radius of the
         ellipsoid).
-    top_left_corner : tuple or list
+    top_left_corner : tuple
         Position in CRS coordinates of the top-left corner of this tile matrix.
     tile_width : int
         Width of each tile of this tile matrix in pixels.
@@ -65,6 +86,7 @@ class TileMatrix:
         matrix_height=None,
         bounds=None,
         tile_pyramid=None,
+        tile_cache_size=None,
     ):
         """
         Initialize a TileMatrix object.
@@ -98,30 +120,33 @@ class TileMatrix:
         tile_pyramid : meintile.TilePyramid, optional
             Parent Tile Pyramid. This is required when using certain tile functions such
             as get_parent() or get_children()
+        tile_cache_size : int, optional
+            Maximum number of Tile objects kept in a least recently used cache. If
+            activated, tile() returns the identical Tile object for identical indexes.
+            (default: None, i.e. no cache)
         """
         self.identifier = self.id = identifier
-        self.crs = CRS.from_user_input(crs)
+        self._crs_info = crs_info(crs)
+        self.crs = self._crs_info.crs
         self.scale_denominator = scale_denominator
-        self.top_left_corner = top_left_corner
+        self.top_left_corner = tuple(top_left_corner)
         self.tile_width = tile_width
         self.tile_height = tile_height
         self.matrix_width = self.width = matrix_width
         self.matrix_height = self.height = matrix_height
 
         # convert scale_denominator to pixel size
-        if "EPSG:4326" in self.crs.to_string():
-            # TODO: find a better way to handle non-metric CRSes
-            meters_per_unit = 2 * math.pi * 6378137 / 360.0
-        else:
-            meters_per_unit = self.crs.linear_units_factor[1]
         self.pixel_x_size = round(
-            self.scale_denominator * 10 ** -3 * SCALE_MULTIPLIER / meters_per_unit,
+            self.scale_denominator
+            * 10 ** -3
+            * SCALE_MULTIPLIER
+            / self._crs_info.meters_per_unit,
             PRECISION,
         )
         self.pixel_y_size = -self.pixel_x_size
 
         # calculate matrix bounds
-        top, left = self.top_left_corner
+        left, top = self.top_left_corner
         tile_x_size = self.pixel_x_size * self.tile_width
         tile_y_size = self.pixel_y_size * self.tile_height
         self.matrix_bounds = Bounds(
@@ -133,8 +158,41 @@ class TileMatrix:
         self.left, self.bottom, self.right, self.top = self.matrix_bounds
         self.bounds = Bounds(*bounds) if bounds else self.matrix_bounds
         self.tile_pyramid = self.tp = tile_pyramid
+        self._tile_cache = _TileCache(tile_cache_size) if tile_cache_size else None
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        """Prevent modifications after initialization, as instances can be shared."""
+        if getattr(self, "_frozen", False):
+            raise AttributeError("TileMatrix objects are immutable")
+        super().__setattr__(name, value)
 
-    def tile(self, row=None, col=None):
+    def __reduce__(self):
+        """Pickle as parent Tile Matrix Set and identifier if available."""
+        if self.tile_pyramid is not None:
+            return _unpickle_tile_matrix, (self.tile_pyramid, self.id, None)
+        return (
+            _unpickle_tile_matrix,
+            (
+                None,
+                self.id,
+                dict(
+                    crs=self.crs,
+                    scale_denominator=self.scale_denominator,
+                    top_left_corner=self.top_left_corner,
+                    tile_width=self.tile_width,
+                    tile_height=self.tile_height,
+                    matrix_width=self.width,
+                    matrix_height=self.height,
+                    bounds=tuple(self.bounds),
+                    tile_cache_size=self._tile_cache.maxsize
+                    if self._tile_cache
+                    else None,
+                ),
+            ),
+        )
+
+    def tile(self, row=None, col=None, pixelbuffer=0):
         """
         Return Tile object of this TileMatrix.
 
@@ -144,12 +202,451 @@ class TileMatrix:
             TileMatrix row
         col : int
             TileMatrix column
+        pixelbuffer : int
+            Tile buffer in pixels. (default: 0)
 
         Returns
         -------
         tile : meintile.Tile
         """
-        return Tile(tile_matrix=self, row=row, col=col)
+        if self._tile_cache is None:
+            return Tile(tile_matrix=self, row=row, col=col, pixelbuffer=pixelbuffer)
+        key = (row, col, pixelbuffer)
+        tile = self._tile_cache.get(key)
+        if tile is None:
+            tile = self._tile_cache.put(
+                key, Tile(tile_matrix=self, row=row, col=col, pixelbuffer=pixelbuffer)
+            )
+        return tile
+
+    def cache_info(self):
+        """
+        Return Tile cache statistics.
+
+        Returns
+        -------
+        meintile.CacheInfo
+        """
+        if self._tile_cache is None:
+            return CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+        return self._tile_cache.info()
+
+    def cache_clear(self):
+        """Remove all Tile objects from cache and reset statistics."""
+        if self._tile_cache is not None:
+            self._tile_cache.clear()
+
+    def tile_from_xy(self, x=None, y=None):
+        """
+        Return Tile object covering a point.
+
+        Points on tile borders belong to the tile right of and below the border. On
+        global Tile Pyramids, x coordinates are wrapped around the Antimeridian.
+
+        Parameters
+        ----------
+        x : float
+            x coordinate in CRS units
+        y : float
+            y coordinate in CRS units
+
+        Returns
+        -------
+        tile : meintile.Tile
+        """
+        tm_left, tm_top = self.top_left_corner
+        col = round(
+            (x - tm_left) / (self.pixel_x_size * self.tile_width), _INDEX_PRECISION
+        )
+        row = round(
+            (tm_top - y) / (-self.pixel_y_size * self.tile_height), _INDEX_PRECISION
+        )
+        if not 0 <= row <= self.height:
+            raise ValueError("y coordinate {} is outside of tile matrix".format(y))
+        if self._is_global:
+            col = math.floor(col) % self.width
+        elif 0 <= col <= self.width:
+            col = min(math.floor(col), self.width - 1)
+        else:
+            raise ValueError("x coordinate {} is outside of tile matrix".format(x))
+        return self.tile(min(math.floor(row), self.height - 1), col)
+
+    def indexes_from_xy(self, xs=None, ys=None):
+        """
+        Return rows and columns of tiles covering multiple points.
+
+        This is the vectorized version of tile_from_xy(). Points outside of the tile
+        matrix get -1 as row and column.
+
+        Parameters
+        ----------
+        xs : array_like
+            x coordinates in CRS units
+        ys : array_like
+            y coordinates in CRS units
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        xs, ys = np.broadcast_arrays(
+            np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+        )
+        tm_left, tm_top = self.top_left_corner
+        cols = np.round(
+            (xs - tm_left) / (self.pixel_x_size * self.tile_width), _INDEX_PRECISION
+        )
+        rows = np.round(
+            (tm_top - ys) / (-self.pixel_y_size * self.tile_height), _INDEX_PRECISION
+        )
+        valid = (rows >= 0) & (rows <= self.height)
+        if not self._is_global:
+            valid &= (cols >= 0) & (cols <= self.width)
+        rows = np.minimum(np.floor(np.where(valid, rows, -1)), self.height - 1)
+        cols = np.floor(np.where(valid, cols, -1))
+        if self._is_global:
+            cols = np.where(valid, cols % self.width, -1)
+        else:
+            cols = np.minimum(cols, self.width - 1)
+        return rows.astype(np.int64), cols.astype(np.int64)
+
+    def tile_geometries(self, rows=None, cols=None, pixelbuffer=0):
+        """
+        Return geometries of multiple tiles of this TileMatrix.
+
+        All values are calculated in one vectorized pass and are rounded the same way
+        as the Tile attributes.
+
+        Parameters
+        ----------
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+        pixelbuffer : int
+            Tile buffer in pixels. (default: 0)
+
+        Returns
+        -------
+        meintile.TileGeometries
+        """
+        if not isinstance(pixelbuffer, int) or pixelbuffer < 0:
+            raise ValueError("pixelbuffer must be a non-negative integer")
+        rows, cols = np.broadcast_arrays(_index_array(rows), _index_array(cols))
+        valid = (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+        left, top = self.top_left_corner
+        return _tile_geometries(
+            rows,
+            cols,
+            valid,
+            left,
+            top,
+            self.pixel_x_size,
+            self.pixel_y_size,
+            self.tile_width,
+            self.tile_height,
+            pixelbuffer=pixelbuffer,
+            matrix_top=self.top if self._is_global else None,
+            matrix_bottom=self.bottom if self._is_global else None,
+        )
+
+    def raster_windows(
+        self,
+        src_affine=None,
+        src_shape=None,
+        rows=None,
+        cols=None,
+        bounds=None,
+        pixelbuffer=0,
+        coalesce=None,
+    ):
+        """
+        Return read windows of multiple tiles in a source raster.
+
+        Tiles are either given by rows and columns or by bounds. All windows are
+        calculated in one vectorized pass. Windows cover all source pixels touched by
+        the tile bounds and are clipped to the source raster.
+
+        Parameters
+        ----------
+        src_affine : affine.Affine
+            Source raster transform in the CRS of this TileMatrix. Rotated rasters
+            are not supported.
+        src_shape : tuple
+            Source raster (height, width).
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+        bounds : tuple or meintile.Bounds
+            Use tiles intersecting with bounds instead of rows and columns.
+        pixelbuffer : int
+            Tile buffer in pixels. (default: 0)
+        coalesce : int
+            Merge windows of adjacent tiles within aligned blocks of coalesce x
+            coalesce tiles into single reads. (default: None, i.e. no merging)
+
+        Returns
+        -------
+        meintile.RasterWindows
+        """
+        if (bounds is None) == (rows is None or cols is None):
+            raise ValueError("either rows and cols or bounds must be given")
+        if not isinstance(pixelbuffer, int) or pixelbuffer < 0:
+            raise ValueError("pixelbuffer must be a non-negative integer")
+        if coalesce is not None and (not isinstance(coalesce, int) or coalesce < 1):
+            raise ValueError("coalesce must be a positive integer")
+        if src_affine.b or src_affine.d:
+            raise ValueError("rotated source rasters are not supported")
+        src_height, src_width = src_shape
+        if bounds is None:
+            rows, cols = np.broadcast_arrays(_index_array(rows), _index_array(cols))
+            rows, cols = rows.ravel(), cols.ravel()
+        else:
+            rows, cols = self._window_indexes(bounds)
+
+        geometries = self.tile_geometries(rows, cols, pixelbuffer=pixelbuffer)
+        lefts, bottoms = geometries.left, geometries.bottom
+        rights, tops = geometries.right, geometries.top
+
+        # source pixel coordinates, flipped rasters swap start and stop
+        with np.errstate(invalid="ignore"):
+            xs = (np.stack([lefts, rights]) - src_affine.c) / src_affine.a
+            ys = (np.stack([tops, bottoms]) - src_affine.f) / src_affine.e
+            col_start = np.floor(np.round(xs.min(axis=0), _INDEX_PRECISION))
+            col_stop = np.ceil(np.round(xs.max(axis=0), _INDEX_PRECISION))
+            row_start = np.floor(np.round(ys.min(axis=0), _INDEX_PRECISION))
+            row_stop = np.ceil(np.round(ys.max(axis=0), _INDEX_PRECISION))
+            valid = geometries.valid & (col_start < src_width) & (col_stop > 0)
+            valid &= (row_start < src_height) & (row_stop > 0)
+        col_start = np.where(valid, np.clip(col_start, 0, src_width), 0)
+        col_stop = np.where(valid, np.clip(col_stop, 0, src_width), 0)
+        row_start = np.where(valid, np.clip(row_start, 0, src_height), 0)
+        row_stop = np.where(valid, np.clip(row_stop, 0, src_height), 0)
+        col_off, row_off = col_start.astype(np.int64), row_start.astype(np.int64)
+        width = col_stop.astype(np.int64) - col_off
+        height = row_stop.astype(np.int64) - row_off
+
+        if coalesce is None:
+            read_index = reads = None
+        else:
+            read_index, reads = _coalesce_windows(
+                rows, cols, valid, col_off, row_off, width, height, coalesce
+            )
+        return RasterWindows(
+            rows=rows,
+            cols=cols,
+            valid=valid,
+            col_off=col_off,
+            row_off=row_off,
+            width=width,
+            height=height,
+            x_scale=np.where(valid, self.pixel_x_size / abs(src_affine.a), np.nan),
+            y_scale=np.where(valid, -self.pixel_y_size / abs(src_affine.e), np.nan),
+            read_index=read_index,
+            reads=reads,
+        )
+
+    def tiles_from_bounds(self, bounds=None, order="row"):
+        """
+        Yield Tile objects intersecting with bounds.
+
+        The row and column window is calculated directly from the top left corner and
+        the tile sizes. Tiles only touching the bounds are not included.
+
+        On global Tile Pyramids, bounds exceeding the Antimeridian are wrapped around.
+
+        Parameters
+        ----------
+        bounds : tuple or meintile.Bounds
+            Bounding coordinates (left, bottom, right, top) in CRS units.
+        order : str
+            Iteration order of tiles:
+                - row: row by row (default). Tiles are generated lazily, so memory
+                  consumption stays constant regardless of the window size.
+                - morton: along a Morton (Z-order) curve
+                - hilbert: along a Hilbert curve, i.e. consecutive tiles are always
+                  neighbors within the matrix.
+            The curve based orders keep tiles which are close to each other also close
+            within the iteration order but require the indexes of the whole window to
+            be held in memory.
+
+        Yields
+        ------
+        meintile.Tile
+        """
+        if order == "row":
+            row_start, row_stop, col_start, col_stop = self._tile_window(bounds)
+            cols = self._wrap_cols(col_start, col_stop)
+            for row in range(row_start, row_stop):
+                for col in cols:
+                    yield self.tile(row, col)
+        elif order in ["morton", "hilbert"]:
+            rows, cols = self._window_indexes(bounds)
+            if order == "morton":
+                keys = morton_encode(rows, cols)
+            else:
+                keys = hilbert_encode(
+                    rows, cols, (max(self.width, self.height) - 1).bit_length()
+                )
+            for i in np.argsort(keys, kind="stable").tolist():
+                yield self.tile(int(rows[i]), int(cols[i]))
+        else:
+            raise ValueError("invalid order given: {}".format(order))
+
+    def neighbor_indexes(self, row=None, col=None, radius=1, connectedness=8):
+        """
+        Return rows and columns of tiles within a distance around a tile.
+
+        Neighbors are ordered ring by ring. Within a ring, tiles sharing an edge
+        with the previous ring come first, each group clockwise starting above the
+        tile.
+
+        On global Tile Pyramids, columns are wrapped around the Antimeridian. Rows
+        outside of the tile matrix are omitted. The tile itself and duplicates caused
+        by wrapping are not included.
+
+        Parameters
+        ----------
+        row : int
+            TileMatrix row
+        col : int
+            TileMatrix column
+        radius : int
+            Maximum distance in tiles. (default: 1)
+        connectedness : int, (4 or 8)
+            Count steps only across tile edges (4), i.e. neighbors form a diamond, or
+            also across tile corners (8), i.e. neighbors form a square. (default: 8)
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        if connectedness not in [4, 8]:
+            raise ValueError("only connectedness values 8 or 4 are allowed")
+        if not isinstance(radius, int) or radius < 0:
+            raise ValueError("radius must be a non-negative integer")
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise InvalidTileIndex(
+                "Tile index ({}, {}, {}) is outside of TileMatrix".format(
+                    self.id, row, col
+                )
+            )
+        row_offsets, col_offsets = _neighbor_offsets(radius, connectedness)
+        rows = row + row_offsets
+        cols = col + col_offsets
+        valid = (rows >= 0) & (rows < self.height)
+        if self._is_global:
+            cols = cols % self.width
+        else:
+            valid &= (cols >= 0) & (cols < self.width)
+        valid &= (rows != row) | (cols != col)
+        rows, cols = rows[valid], cols[valid]
+        # wrapped columns can only collide if the window is wider than the matrix
+        if self._is_global and 2 * radius + 1 > self.width:
+            _, first = np.unique(rows * self.width + cols, return_index=True)
+            first.sort()
+            rows, cols = rows[first], cols[first]
+        return rows, cols
+
+    def _window_indexes(self, bounds):
+        """Return rows and columns of tiles intersecting with bounds row by row."""
+        row_start, row_stop, col_start, col_stop = self._tile_window(bounds)
+        rows, cols = np.meshgrid(
+            np.arange(row_start, row_stop, dtype=np.int64),
+            np.array(self._wrap_cols(col_start, col_stop), dtype=np.int64),
+            indexing="ij",
+        )
+        return rows.ravel(), cols.ravel()
+
+    def _tile_window(self, bounds):
+        """
+        Return row and column window of tiles intersecting with bounds.
+
+        Rows are clipped to the matrix height, columns are not clipped.
+        """
+        left, bottom, right, top = Bounds(*bounds)
+        if left > right or bottom > top:
+            raise ValueError("invalid bounds given: {}".format(bounds))
+        tm_left, tm_top = self.top_left_corner
+        tile_x_size = self.pixel_x_size * self.tile_width
+        tile_y_size = -self.pixel_y_size * self.tile_height
+        col_start = math.floor(round((left - tm_left) / tile_x_size, _INDEX_PRECISION))
+        col_stop = max(
+            math.ceil(round((right - tm_left) / tile_x_size, _INDEX_PRECISION)),
+            col_start + 1,
+        )
+        row_start = math.floor(round((tm_top - top) / tile_y_size, _INDEX_PRECISION))
+        row_stop = max(
+            math.ceil(round((tm_top - bottom) / tile_y_size, _INDEX_PRECISION)),
+            row_start + 1,
+        )
+        return (
+            min(max(row_start, 0), self.height),
+            min(max(row_stop, 0), self.height),
+            col_start,
+            col_stop,
+        )
+
+    def _tile_windows(self, lefts, bottoms, rights, tops):
+        """
+        Return row and column windows of tiles intersecting with multiple bounds.
+
+        This is the vectorized version of _tile_window(). Bounds are clipped to the
+        tile matrix bounds, bounds not intersecting with them or containing NaN get
+        empty windows.
+        """
+        left, bottom, right, top = self.bounds
+        # comparisons with NaN are False
+        valid = (lefts < right) & (rights > left) & (bottoms < top) & (tops > bottom)
+        lefts, rights = np.clip(lefts, left, right), np.clip(rights, left, right)
+        bottoms, tops = np.clip(bottoms, bottom, top), np.clip(tops, bottom, top)
+        tm_left, tm_top = self.top_left_corner
+        tile_x_size = self.pixel_x_size * self.tile_width
+        tile_y_size = -self.pixel_y_size * self.tile_height
+        with np.errstate(invalid="ignore"):
+            col_start = np.floor(
+                np.round((lefts - tm_left) / tile_x_size, _INDEX_PRECISION)
+            )
+            col_stop = np.maximum(
+                np.ceil(np.round((rights - tm_left) / tile_x_size, _INDEX_PRECISION)),
+                col_start + 1,
+            )
+            row_start = np.floor(
+                np.round((tm_top - tops) / tile_y_size, _INDEX_PRECISION)
+            )
+            row_stop = np.maximum(
+                np.ceil(np.round((tm_top - bottoms) / tile_y_size, _INDEX_PRECISION)),
+                row_start + 1,
+            )
+        windows = []
+        for start, stop, size in [
+            (row_start, row_stop, self.height),
+            (col_start, col_stop, self.width),
+        ]:
+            start = np.where(valid, np.clip(start, 0, size), 0).astype(np.int64)
+            stop = np.where(valid, np.clip(stop, 0, size), 0).astype(np.int64)
+            windows.extend([start, stop])
+        return tuple(windows)
+
+    @property
+    def _is_global(self):
+        return self.tile_pyramid is not None and self.tile_pyramid.is_global
+
+    def _wrap_cols(self, col_start, col_stop):
+        """
+        Return columns between col_start and col_stop which are within the matrix.
+
+        Columns outside of the matrix are wrapped around the Antimeridian if the
+        parent Tile Pyramid is global, otherwise they are clipped.
+        """
+        if self._is_global:
+            if col_stop - col_start >= self.width:
+                return range(self.width)
+            if col_start < 0 or col_stop > self.width:
+                return [col % self.width for col in range(col_start, col_stop)]
+            return range(col_start, col_stop)
+        return range(min(max(col_start, 0), self.width), min(col_stop, self.width))
 
     def to_dict(self):
         """
@@ -163,7 +660,7 @@ class TileMatrix:
             type="TileMatrixType",
             identifier=str(self.identifier),
             scaleDenominator=self.scale_denominator,
-            topLeftCorner=self.top_left_corner,
+            topLeftCorner=list(self.top_left_corner),
             tileWidth=self.tile_width,
             tileHeight=self.tile_height,
             matrixWidth=self.matrix_width,
@@ -172,4 +669,235 @@ class TileMatrix:
 
     def __repr__(self):
         """Return representational string."""
-        return "TileMatrix(id={}, crs={})".format(self.id, self.crs.to_string())
+        return "TileMatrix(id={}, crs={})".format(self.id, self._crs_info.string)
+
+
+class _TileCache:
+    """Thread-safe least recently used cache of Tile objects."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return cached Tile or None."""
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key, tile):
+        """Add Tile and return the cached Tile for key."""
+        with self._lock:
+            # another thread could have added the same Tile in the meantime
+            tile = self._tiles.setdefault(key, tile)
+            if len(self._tiles) > self.maxsize:
+                self._tiles.popitem(last=False)
+            return tile
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                maxsize=self.maxsize,
+                currsize=len(self._tiles),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@lru_cache(maxsize=32)
+def _neighbor_offsets(radius, connectedness):
+    """Return read-only row and column offsets of neighbors in output order."""
+    offsets = np.arange(-radius, radius + 1)
+    row_offsets, col_offsets = [
+        a.ravel() for a in np.meshgrid(offsets, offsets, indexing="ij")
+    ]
+    manhattan = np.abs(row_offsets) + np.abs(col_offsets)
+    chebyshev = np.maximum(np.abs(row_offsets), np.abs(col_offsets))
+    if connectedness == 8:
+        ring, secondary = chebyshev, manhattan
+    else:
+        ring, secondary = manhattan, chebyshev
+    # clockwise angle starting above the tile
+    angle = np.arctan2(col_offsets, -row_offsets) % (2 * np.pi)
+    within = np.nonzero((ring > 0) & (ring <= radius))[0]
+    order = within[np.lexsort((angle[within], secondary[within], ring[within]))]
+    row_offsets, col_offsets = row_offsets[order], col_offsets[order]
+    row_offsets.flags.writeable = False
+    col_offsets.flags.writeable = False
+    return row_offsets, col_offsets
+
+
+def _coalesce_windows(rows, cols, valid, col_off, row_off, width, height, block):
+    """
+    Merge windows of adjacent tiles into reads.
+
+    Tiles of one row with consecutive columns within an aligned block form runs,
+    runs with equal columns in consecutive rows form reads. Reads of contiguous tiles
+    are rectangular, so no pixels outside of the tile windows are read.
+    """
+    read_index = np.full(rows.shape, -1, dtype=np.int64)
+    (positions,) = np.nonzero(valid)
+    if not len(positions):
+        return read_index, np.zeros((0, 4), dtype=np.int64)
+    rows, cols = rows[positions], cols[positions]
+    block_rows, block_cols = rows // block, cols // block
+
+    # horizontal runs
+    order = np.lexsort((cols, rows, block_cols, block_rows))
+    new_run = np.ones(len(order), dtype=bool)
+    new_run[1:] = (
+        (block_rows[order][1:] != block_rows[order][:-1])
+        | (block_cols[order][1:] != block_cols[order][:-1])
+        | (rows[order][1:] != rows[order][:-1])
+        | (cols[order][1:] > cols[order][:-1] + 1)
+    )
+    run_of_tile = np.empty(len(order), dtype=np.int64)
+    run_of_tile[order] = np.cumsum(new_run) - 1
+    starts = order[new_run]
+    run_rows, run_block_rows, run_block_cols = (
+        rows[starts],
+        block_rows[starts],
+        block_cols[starts],
+    )
+    run_col_start = cols[starts]
+    run_col_stop = np.maximum.reduceat(cols[order], np.flatnonzero(new_run))
+
+    # vertical merge of runs covering the same columns
+    order = np.lexsort(
+        (run_rows, run_col_stop, run_col_start, run_block_cols, run_block_rows)
+    )
+    new_read = np.ones(len(order), dtype=bool)
+    new_read[1:] = (
+        (run_block_rows[order][1:] != run_block_rows[order][:-1])
+        | (run_block_cols[order][1:] != run_block_cols[order][:-1])
+        | (run_col_start[order][1:] != run_col_start[order][:-1])
+        | (run_col_stop[order][1:] != run_col_stop[order][:-1])
+        | (run_rows[order][1:] > run_rows[order][:-1] + 1)
+    )
+    read_of_run = np.empty(len(order), dtype=np.int64)
+    read_of_run[order] = np.cumsum(new_read) - 1
+    read_of_tile = read_of_run[run_of_tile]
+    read_index[positions] = read_of_tile
+
+    # union of tile windows
+    reads_count = int(new_read.sum())
+    col_start = np.full(reads_count, np.iinfo(np.int64).max, dtype=np.int64)
+    row_start = col_start.copy()
+    col_stop = np.zeros(reads_count, dtype=np.int64)
+    row_stop = col_stop.copy()
+    np.minimum.at(col_start, read_of_tile, col_off[positions])
+    np.minimum.at(row_start, read_of_tile, row_off[positions])
+    np.maximum.at(col_stop, read_of_tile, col_off[positions] + width[positions])
+    np.maximum.at(row_stop, read_of_tile, row_off[positions] + height[positions])
+    reads = np.stack(
+        [col_start, row_start, col_stop - col_start, row_stop - row_start], axis=1
+    )
+    return read_index, reads
+
+
+def _unpickle_tile_matrix(tile_matrix_set, identifier, params):
+    if tile_matrix_set is None:
+        return TileMatrix(identifier=identifier, **params)
+    return tile_matrix_set[identifier]
+
+
+def _index_array(values):
+    values = np.asarray(values)
+    if values.size == 0:
+        # empty lists are float arrays
+        return values.astype(np.int64)
+    if values.dtype.kind not in "iu":
+        raise InvalidTileIndex("tile indexes must be integers")
+    return values.astype(np.int64, copy=False)
+
+
+def _round_array(values):
+    """Apply round(x, PRECISION) on every element."""
+    small = np.abs(values) < _ROUND_NOOP_THRESHOLD
+    if not small.any():
+        return values
+    scaled = values * _ROUND_SCALE
+    rounded = np.rint(scaled)
+    # Dividing the rounded integer by an exact power of ten gives the same result as
+    # round() if rint() rounded the exact product of value and scale in the same
+    # direction. The exact product is scaled + error, where error is calculated
+    # without rounding (Dekker's TwoProduct). Only values whose direction could be
+    # flipped by the error, i.e. ties, are passed to round().
+    with np.errstate(invalid="ignore", over="ignore"):
+        split = values * 134217729.0
+        hi = split - (split - values)
+        lo = values - hi
+        error = (
+            (hi * _ROUND_SCALE_HI - scaled)
+            + hi * _ROUND_SCALE_LO
+            + lo * _ROUND_SCALE_HI
+            + lo * _ROUND_SCALE_LO
+        )
+        ties = small & (np.abs(np.abs(scaled - rounded) - 0.5) <= np.abs(error))
+    tie_values = [round(v, PRECISION) for v in values[ties].tolist()]
+    np.divide(rounded, _ROUND_SCALE, out=values, where=small)
+    values[ties] = tie_values
+    return values
+
+
+def _tile_geometries(
+    rows,
+    cols,
+    valid,
+    left,
+    top,
+    pixel_x_size,
+    pixel_y_size,
+    tile_width,
+    tile_height,
+    pixelbuffer=0,
+    matrix_top=None,
+    matrix_bottom=None,
+):
+    """
+    Calculate tile bounds and affine coefficients.
+
+    All TileMatrix properties can either be scalars or arrays matching rows and cols.
+    Buffered bounds are clipped at matrix_top and matrix_bottom if given, like
+    Tile.bounds does on global grids.
+    """
+    tile_x_size = pixel_x_size * tile_width
+    tile_y_size = pixel_y_size * tile_height
+    rows = np.where(valid, rows, np.nan)
+    cols = np.where(valid, cols, np.nan)
+    tops = _round_array(top + rows * tile_y_size)
+    bottoms = _round_array(tops + tile_y_size)
+    lefts = _round_array(left + cols * tile_x_size)
+    rights = _round_array(lefts + tile_x_size)
+    if pixelbuffer:
+        offset = pixel_x_size * pixelbuffer
+        lefts, bottoms = _round_array(lefts - offset), _round_array(bottoms - offset)
+        rights, tops = _round_array(rights + offset), _round_array(tops + offset)
+        # on global grids clip at northern and southern TileMatrix bound
+        if matrix_top is not None:
+            np.minimum(tops, matrix_top, out=tops)
+            np.maximum(bottoms, matrix_bottom, out=bottoms)
+    affine = np.empty(rows.shape + (6,), dtype=np.float64)
+    affine[..., 0] = np.where(valid, pixel_x_size, np.nan)
+    affine[..., 1] = np.where(valid, 0.0, np.nan)
+    affine[..., 2] = lefts
+    affine[..., 3] = affine[..., 1]
+    affine[..., 4] = np.where(valid, pixel_y_size, np.nan)
+    affine[..., 5] = tops
+    return TileGeometries(
+        valid=valid, left=lefts, bottom=bottoms, right=rights, top=tops, affine=affine
+    )
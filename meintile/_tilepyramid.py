@@ -1,24 +1,55 @@
 """TilePyramid class."""
 
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
-from rasterio.crs import CRS
+import copy
+import hashlib
+import json
+import numpy as np
+import threading
+from types import MappingProxyType
+import weakref
 
-from meintile.exceptions import InvalidTileMatrixIndex
-from meintile._tilematrix import TileMatrix
-from meintile._types import Bounds
+from meintile.exceptions import InvalidTileIndex, InvalidTileMatrixIndex
+from meintile._asyncio import _check_batch_size, abatched
+from meintile._crs import crs_info, transform_bounds
+from meintile._curves import MAX_BITS, morton_decode, morton_encode
+from meintile._parallel import _is_bounds, map_tiles
+from meintile._tilematrix import TileMatrix, _index_array, _tile_geometries
+from meintile._types import Bounds, CacheInfo
 from meintile.wkss import get_wkss
 
+# tile size fraction used to compare tile bounds with geometries in tiles_from_geom()
+_TILE_TOLERANCE = 1e-6
+
+# relative tolerance used to match resolutions with TileMatrix pixel sizes
+_RESOLUTION_TOLERANCE = 1e-9
+_RESOLUTION_STRATEGIES = ("nearest", "finer", "coarser")
+
+# interned Tile Matrix Sets by class, definition and tile cache size
+_REGISTRY = OrderedDict()
+# interned Tile Matrix Sets which are still referenced, also after being trimmed from
+# _REGISTRY, so their pickles keep restoring the identical object
+_REFERENCED = weakref.WeakValueDictionary()
+_REGISTRY_LOCK = threading.Lock()
+# maximum number of interned Tile Matrix Sets, None means unlimited
+_registry_size = 64
+
 
 class TileMatrixSet:
     """
     A Tile Matrix Set contains TileMatrix objects.
 
+    Tile Matrix Sets are immutable. from_wkss() and from_dict() return the identical
+    object for identical definitions.
+
     Attributes
     ----------
     crs : rasterio.crs.CRS
         Coordinate reference system used by TileMatrixSet.
-    tile_matrices : OrderedDict
-        Keys are TileMatrix identifiers, values are TileMatrix objects.
+    tile_matrices : mapping
+        Read-only ordered mapping with TileMatrix identifiers as keys and TileMatrix
+        objects as values.
     bounds : meintile.Bounds or None
         Bounding box values if bounding_box parameter was provided.
     """
@@ -34,6 +65,7 @@ class TileMatrixSet:
         keywords=None,
         well_known_scale_set=None,
         bounding_box=None,
+        tile_cache_size=None,
         **kwargs
     ):
         """
@@ -68,42 +100,122 @@ class TileMatrixSet:
             'BoundingBoxType'), 'crs' (reference to one coordinate reference system),
             'lower_corner' (lower left corner coordinates) and 'upper_corner' (upper
             right corner coordinates).
+        tile_cache_size : int, optional
+            Maximum number of Tile objects cached per TileMatrix. If activated, tile()
+            returns the identical Tile object for identical indexes. (default: None,
+            i.e. no cache)
         """
         self._well_known_scale_set = well_known_scale_set
+        # set by from_wkss() to pickle by identifier
+        self._wkss_identifier = None
+        # pickled arguments and registry key, set on first pickling
+        self._pickle_args = None
+        self._pickle_key = None
+        self._tile_cache_size = tile_cache_size
         self._identifier = identifier
         self._title = title
         self._abstract = abstract
-        self._keywords = keywords
-        self._bounding_box = bounding_box
-        self._tile_matrix_params = tile_matrix_params
+        self._keywords = tuple(keywords) if keywords else keywords
+        # copy mutable parameters so shared instances cannot be changed from outside
+        self._bounding_box = copy.deepcopy(bounding_box)
+        self._tile_matrix_params = copy.deepcopy(tile_matrix_params)
 
         self.bounds = None
         if self._bounding_box:
             left, bottom = self._bounding_box["lower_corner"]
             right, top = self._bounding_box["upper_corner"]
             self.bounds = Bounds(left, bottom, right, top)
-        self.crs = CRS.from_user_input(crs)
-        self.crs_str = crs if isinstance(crs, str) else self.crs.to_string()
-        self.tile_matrices = OrderedDict(
-            [
-                (
-                    int(i["identifier"]),
-                    TileMatrix(
-                        **dict(
-                            i,
-                            identifier=int(i["identifier"]),
-                            crs=self.crs,
-                            bounds=self.bounds,
-                            tile_pyramid=self,
-                        )
-                    ),
-                )
-                for i in tile_matrix_params
-            ]
+        self._crs_info = crs_info(crs)
+        self.crs = self._crs_info.crs
+        self.crs_str = crs if isinstance(crs, str) else self._crs_info.string
+        self.tile_matrices = MappingProxyType(
+            OrderedDict(
+                [
+                    (
+                        int(i["identifier"]),
+                        TileMatrix(
+                            **dict(
+                                i,
+                                identifier=int(i["identifier"]),
+                                crs=self.crs,
+                                bounds=self.bounds,
+                                tile_pyramid=self,
+                                tile_cache_size=tile_cache_size,
+                            )
+                        ),
+                    )
+                    for i in tile_matrix_params
+                ]
+            )
         )
         self.is_global = is_global
 
-    def tile(self, zoom=None, row=None, col=None):
+        # TileMatrix properties as arrays sorted by identifier for vectorized lookups
+        matrices = sorted(self.tile_matrices.values(), key=lambda tm: tm.id)
+        matrix_arrays = dict(
+            (attr, np.array([getattr(tm, attr) for tm in matrices]))
+            for attr in [
+                "id",
+                "width",
+                "height",
+                "pixel_x_size",
+                "pixel_y_size",
+                "tile_width",
+                "tile_height",
+            ]
+        )
+        matrix_arrays.update(
+            left=np.array([tm.top_left_corner[0] for tm in matrices], dtype=np.float64),
+            top=np.array([tm.top_left_corner[1] for tm in matrices], dtype=np.float64),
+            # rounded matrix bounds used to clip buffered tiles on global grids
+            matrix_top=np.array([tm.top for tm in matrices], dtype=np.float64),
+            matrix_bottom=np.array([tm.bottom for tm in matrices], dtype=np.float64),
+        )
+        for array in matrix_arrays.values():
+            array.flags.writeable = False
+        self._matrix_arrays = MappingProxyType(matrix_arrays)
+
+        # pixel sizes sorted from finest to coarsest for resolution lookups
+        by_resolution = sorted(matrices, key=lambda tm: (tm.pixel_x_size, tm.id))
+        self._resolutions = tuple(tm.pixel_x_size for tm in by_resolution)
+        self._resolution_ids = tuple(tm.id for tm in by_resolution)
+        resolution_arrays = (
+            np.array(self._resolutions, dtype=np.float64),
+            np.array(self._resolution_ids, dtype=np.int64),
+        )
+        for array in resolution_arrays:
+            array.flags.writeable = False
+        self._resolution_arrays = resolution_arrays
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        """Prevent modifications after initialization, as instances can be shared."""
+        if getattr(self, "_frozen", False):
+            raise AttributeError("{} objects are immutable".format(type(self).__name__))
+        super().__setattr__(name, value)
+
+    def __reduce__(self):
+        """
+        Pickle by WKSS identifier or definition.
+
+        Unpickling returns the interned object of the receiving process. Pickling
+        interns this object, so also directly constructed Tile Matrix Sets are restored
+        as the identical object within this process.
+        """
+        if self._pickle_args is None:
+            # bypass __setattr__() as the Tile Matrix Set is frozen
+            args = (
+                type(self),
+                self._wkss_identifier or self.to_dict(),
+                self.is_global,
+                self._tile_cache_size,
+            )
+            object.__setattr__(self, "_pickle_key", _pickle_key(*args))
+            object.__setattr__(self, "_pickle_args", args)
+        _registry_put(self._pickle_key, self)
+        return _unpickle_tile_matrix_set, self._pickle_args
+
+    def tile(self, zoom=None, row=None, col=None, pixelbuffer=0):
         """
         Return Tile object of this TilePyramid.
 
@@ -115,12 +227,390 @@ class TileMatrixSet:
             TileMatrix row
         col : int
             TileMatrix column
+        pixelbuffer : int
+            Tile buffer in pixels. (default: 0)
+
+        Returns
+        -------
+        tile : meintile.Tile
+        """
+        return self[zoom].tile(row=row, col=col, pixelbuffer=pixelbuffer)
+
+    def tile_from_xy(self, x=None, y=None, zoom=None):
+        """
+        Return Tile object covering a point.
+
+        Points on tile borders belong to the tile right of and below the border. On
+        global Tile Matrix Sets, x coordinates are wrapped around the Antimeridian.
+
+        Parameters
+        ----------
+        x : float
+            x coordinate in CRS units
+        y : float
+            y coordinate in CRS units
+        zoom : int
+            zoom level / TileMatrix identifier
 
         Returns
         -------
         tile : meintile.Tile
         """
-        return self[zoom].tile(row=row, col=col)
+        return self[zoom].tile_from_xy(x, y)
+
+    def indexes_from_xy(self, xs=None, ys=None, zoom=None):
+        """
+        Return rows and columns of tiles covering multiple points.
+
+        This is the vectorized version of tile_from_xy(). Points outside of the tile
+        matrix get -1 as row and column.
+
+        Parameters
+        ----------
+        xs : array_like
+            x coordinates in CRS units
+        ys : array_like
+            y coordinates in CRS units
+        zoom : int
+            zoom level / TileMatrix identifier
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        return self[zoom].indexes_from_xy(xs, ys)
+
+    def tiles_from_bounds(self, bounds=None, zoom=None, order="row"):
+        """
+        Yield Tile objects intersecting with bounds.
+
+        Tiles only touching the bounds are not included.
+
+        Parameters
+        ----------
+        bounds : tuple or meintile.Bounds
+            Bounding coordinates (left, bottom, right, top) in CRS units.
+        zoom : int
+            zoom level / TileMatrix identifier
+        order : str
+            Iteration order of tiles, either "row", "morton" or "hilbert". See
+            TileMatrix.tiles_from_bounds(). (default: "row")
+
+        Yields
+        ------
+        meintile.Tile
+        """
+        return self[zoom].tiles_from_bounds(bounds, order=order)
+
+    def tiles_from_tile(self, tile=None, zoom=None, densify=21):
+        """
+        Yield Tile objects intersecting with a tile of another Tile Matrix Set.
+
+        The tile bounds edges are densified and reprojected to the CRS of this Tile
+        Matrix Set. Tiles intersecting with the bounds of the reprojected points are
+        yielded row by row. On global Tile Matrix Sets, bounds exceeding the
+        Antimeridian also yield the wrapped tiles. Tiles crossing the Antimeridian in
+        the target CRS yield full rows, i.e. the result is conservative.
+
+        Parameters
+        ----------
+        tile : meintile.Tile
+            Tile of any Tile Matrix Set. Its pixelbuffer is applied to its bounds and
+            passed on to the yielded tiles.
+        zoom : int
+            zoom level / TileMatrix identifier
+        densify : int
+            Number of points per tile edge used for reprojection. (default: 21)
+
+        Yields
+        ------
+        meintile.Tile
+        """
+        tile_matrix = self[zoom]
+        left, bottom, right, top = tile.bounds
+        bounds = [
+            float(i[0])
+            for i in transform_bounds(
+                tile.tile_matrix.crs,
+                self.crs,
+                left,
+                bottom,
+                right,
+                top,
+                densify=densify,
+            )
+        ]
+        # bounds without any transformable point are NaN
+        if bounds[0] != bounds[0]:
+            return iter(())
+        row_start, row_stop, col_start, col_stop = tile_matrix._tile_window(bounds)
+        cols = tile_matrix._wrap_cols(col_start, col_stop)
+        return (
+            tile_matrix.tile(row, col, pixelbuffer=tile.pixelbuffer)
+            for row in range(row_start, row_stop)
+            for col in cols
+        )
+
+    def windows_from_tiles(
+        self, tile_matrix=None, rows=None, cols=None, zoom=None, densify=21
+    ):
+        """
+        Return row and column windows of tiles intersecting with tiles of another
+        Tile Matrix Set.
+
+        This is the vectorized version of tiles_from_tile(). All tile edges are
+        reprojected at once. Windows are clipped to the Tile Matrix, i.e. columns are
+        not wrapped around the Antimeridian.
+
+        Parameters
+        ----------
+        tile_matrix : meintile.TileMatrix
+            Tile Matrix of source tiles.
+        rows : array_like
+            Source TileMatrix rows
+        cols : array_like
+            Source TileMatrix columns
+        zoom : int
+            zoom level / TileMatrix identifier
+        densify : int
+            Number of points per tile edge used for reprojection. (default: 21)
+
+        Returns
+        -------
+        row_start, row_stop, col_start, col_stop : numpy.ndarray
+            Half-open row and column ranges, empty if source tiles do not intersect
+            with this Tile Matrix Set.
+        """
+        target = self[zoom]
+        geometries = tile_matrix.tile_geometries(rows, cols)
+        if not geometries.valid.all():
+            raise InvalidTileIndex("tile indexes are outside of TileMatrix")
+        return target._tile_windows(
+            *transform_bounds(
+                tile_matrix.crs,
+                self.crs,
+                geometries.left,
+                geometries.bottom,
+                geometries.right,
+                geometries.top,
+                densify=densify,
+            )
+        )
+
+    def atiles_from_bounds(
+        self, bounds=None, zoom=None, order="row", batch_size=1024, executor=False
+    ):
+        """
+        Asynchronously yield batches of Tile objects intersecting with bounds.
+
+        This is the asynchronous version of tiles_from_bounds(). After every batch,
+        control is given back to the event loop.
+
+        Parameters
+        ----------
+        bounds : tuple or meintile.Bounds
+            Bounding coordinates (left, bottom, right, top) in CRS units.
+        zoom : int
+            zoom level / TileMatrix identifier
+        order : str
+            Iteration order of tiles, either "row", "morton" or "hilbert". See
+            TileMatrix.tiles_from_bounds(). (default: "row")
+        batch_size : int
+            Maximum number of tiles per batch. (default: 1024)
+        executor : bool or concurrent.futures.Executor
+            Compute batches in the default executor of the event loop (True) or in the
+            given thread based executor. (default: False, i.e. within the event loop)
+
+        Yields
+        ------
+        list of meintile.Tile
+        """
+        _check_batch_size(batch_size)
+        if order not in ["row", "morton", "hilbert"]:
+            raise ValueError("invalid order given: {}".format(order))
+        return abatched(
+            self.tiles_from_bounds(bounds, zoom, order=order),
+            batch_size=batch_size,
+            executor=executor,
+        )
+
+    def neighbor_indexes(
+        self, zoom=None, row=None, col=None, radius=1, connectedness=8
+    ):
+        """
+        Return rows and columns of tiles within a distance around a tile.
+
+        See TileMatrix.neighbor_indexes().
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        row : int
+            TileMatrix row
+        col : int
+            TileMatrix column
+        radius : int
+            Maximum distance in tiles. (default: 1)
+        connectedness : int, (4 or 8)
+            Count steps only across tile edges (4) or also across tile corners (8).
+            (default: 8)
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        return self[zoom].neighbor_indexes(
+            row, col, radius=radius, connectedness=connectedness
+        )
+
+    def matrix_from_resolution(self, res=None, strategy="nearest"):
+        """
+        Return TileMatrix matching a pixel size.
+
+        Resolutions outside of the Tile Matrix Set range return the finest or the
+        coarsest TileMatrix.
+
+        Parameters
+        ----------
+        res : float
+            Pixel size in CRS units.
+        strategy : str
+            Either "nearest" (nearest pixel size on a logarithmic scale), "finer"
+            (coarsest TileMatrix with pixel size smaller or equal to res) or
+            "coarser" (finest TileMatrix with pixel size larger or equal to res).
+            (default: "nearest")
+
+        Returns
+        -------
+        meintile.TileMatrix
+        """
+        _check_strategy(strategy)
+        if not 0 < res < float("inf"):
+            raise ValueError("res must be a positive number, not {}".format(res))
+        sizes = self._resolutions
+        finer = max(bisect_right(sizes, res * (1 + _RESOLUTION_TOLERANCE)) - 1, 0)
+        coarser = min(
+            bisect_left(sizes, res * (1 - _RESOLUTION_TOLERANCE)), len(sizes) - 1
+        )
+        if strategy == "finer":
+            position = finer
+        elif strategy == "coarser":
+            position = coarser
+        else:
+            # res / finer <= coarser / res
+            position = finer if res * res <= sizes[finer] * sizes[coarser] else coarser
+        return self[self._resolution_ids[position]]
+
+    def zooms_from_resolutions(self, resolutions=None, strategy="nearest"):
+        """
+        Return TileMatrix identifiers matching multiple pixel sizes.
+
+        This is the vectorized version of matrix_from_resolution().
+
+        Parameters
+        ----------
+        resolutions : array_like
+            Pixel sizes in CRS units.
+        strategy : str
+            Either "nearest", "finer" or "coarser". See matrix_from_resolution().
+            (default: "nearest")
+
+        Returns
+        -------
+        zooms : numpy.ndarray
+        """
+        _check_strategy(strategy)
+        resolutions = np.asarray(resolutions, dtype=np.float64)
+        if not ((resolutions > 0) & np.isfinite(resolutions)).all():
+            raise ValueError("resolutions must be positive numbers")
+        sizes, ids = self._resolution_arrays
+        finer = np.searchsorted(
+            sizes, resolutions * (1 + _RESOLUTION_TOLERANCE), side="right"
+        )
+        finer -= 1
+        np.maximum(finer, 0, out=finer)
+        coarser = np.searchsorted(
+            sizes, resolutions * (1 - _RESOLUTION_TOLERANCE), side="left"
+        )
+        np.minimum(coarser, len(sizes) - 1, out=coarser)
+        if strategy == "finer":
+            position = finer
+        elif strategy == "coarser":
+            position = coarser
+        else:
+            position = np.where(
+                resolutions * resolutions <= sizes[finer] * sizes[coarser],
+                finer,
+                coarser,
+            )
+        return ids[position]
+
+    def tile_geometries(self, zooms=None, rows=None, cols=None, pixelbuffer=0):
+        """
+        Return geometries of multiple tiles of this TilePyramid.
+
+        All values are calculated in one vectorized pass and are rounded the same way
+        as the Tile attributes.
+
+        Parameters
+        ----------
+        zooms : int or array_like
+            zoom levels / TileMatrix identifiers
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+        pixelbuffer : int
+            Tile buffer in pixels. (default: 0)
+
+        Returns
+        -------
+        meintile.TileGeometries
+        """
+        if not isinstance(pixelbuffer, int) or pixelbuffer < 0:
+            raise ValueError("pixelbuffer must be a non-negative integer")
+        zooms, rows, cols = np.broadcast_arrays(
+            _index_array(zooms), _index_array(rows), _index_array(cols)
+        )
+        arrays = self._matrix_arrays
+        # map zoom levels to TileMatrix positions
+        position = np.searchsorted(arrays["id"], zooms)
+        np.clip(position, 0, len(arrays["id"]) - 1, out=position)
+        valid = arrays["id"][position] == zooms
+        valid &= (rows >= 0) & (rows < arrays["height"][position])
+        valid &= (cols >= 0) & (cols < arrays["width"][position])
+        return _tile_geometries(
+            rows,
+            cols,
+            valid,
+            arrays["left"][position],
+            arrays["top"][position],
+            arrays["pixel_x_size"][position],
+            arrays["pixel_y_size"][position],
+            arrays["tile_width"][position],
+            arrays["tile_height"][position],
+            pixelbuffer=pixelbuffer,
+            matrix_top=arrays["matrix_top"][position] if self.is_global else None,
+            matrix_bottom=arrays["matrix_bottom"][position] if self.is_global else None,
+        )
+
+    def cache_info(self):
+        """
+        Return Tile cache statistics summed up over all TileMatrix objects.
+
+        Returns
+        -------
+        meintile.CacheInfo
+        """
+        return CacheInfo(
+            *map(sum, zip(*[tm.cache_info() for tm in self.tile_matrices.values()]))
+        )
+
+    def cache_clear(self):
+        """Remove all Tile objects from TileMatrix caches and reset statistics."""
+        for tm in self.tile_matrices.values():
+            tm.cache_clear()
 
     def matrix_width(self, zoom=None):
         """
@@ -183,10 +673,13 @@ class TileMatrixSet:
         return self[zoom].pixel_y_size
 
     @classmethod
-    def from_wkss(self, wkss):
+    def from_wkss(self, wkss, tile_cache_size=None):
         """
         Construct a Tile Matrix Set using a predefined well-known scale set.
 
+        Tile Matrix Sets are interned, i.e. identical scale sets and tile cache sizes
+        return the identical object. See clear_registry() and set_registry_size().
+
         Parameters
         ----------
         wkss : str or dict
@@ -196,12 +689,71 @@ class TileMatrixSet:
                 - WebMercatorQuad: Google Maps Compatible for the World
                 - WorldCRS84Quad: CRS84 for the World
                 - WorldMercatorWGS84Quad: World Mercator WGS84 (ellipsoid)
+        tile_cache_size : int, optional
+            Maximum number of Tile objects cached per TileMatrix. (default: None, i.e.
+            no cache)
 
         Returns
         -------
         TileMatrixSet
         """
-        return TileMatrixSet(**_get_wkss_mapping(wkss))
+        return _from_wkss(TileMatrixSet, wkss, tile_cache_size)
+
+    @classmethod
+    def from_dict(cls, definition, is_global=False, tile_cache_size=None):
+        """
+        Construct a Tile Matrix Set from its dictionary representation.
+
+        Tile Matrix Sets are interned by a hash of their definition, i.e. identical
+        definitions and tile cache sizes return the identical object.
+
+        Parameters
+        ----------
+        definition : dict
+            Tile Matrix Set definition as returned by to_dict().
+        is_global : bool
+            Indicates whether TileMatrixSet covers the globe. (default: False)
+        tile_cache_size : int, optional
+            Maximum number of Tile objects cached per TileMatrix. (default: None, i.e.
+            no cache)
+
+        Returns
+        -------
+        TileMatrixSet or TilePyramid
+        """
+        return _from_mapping(
+            cls, _get_wkss_mapping(definition, is_global=is_global), tile_cache_size
+        )
+
+    @classmethod
+    def clear_registry(cls):
+        """Remove all interned Tile Matrix Sets and Tile Pyramids."""
+        with _REGISTRY_LOCK:
+            _REGISTRY.clear()
+            _REFERENCED.clear()
+
+    @classmethod
+    def set_registry_size(cls, size=None):
+        """
+        Limit number of interned Tile Matrix Sets and Tile Pyramids.
+
+        If exceeded, the least recently requested objects are removed. Objects which
+        are still referenced elsewhere stay interned until they are released.
+
+        Parameters
+        ----------
+        size : int or None
+            Maximum number of unreferenced objects, 0 deactivates interning.
+            (default: None, i.e. unlimited)
+        """
+        global _registry_size
+        if size is not None and (not isinstance(size, int) or size < 0):
+            raise ValueError("registry size must be a non-negative integer or None")
+        with _REGISTRY_LOCK:
+            _registry_size = size
+            _trim_registry()
+            if size == 0:
+                _REFERENCED.clear()
 
     def to_dict(self):
         """
@@ -224,7 +776,7 @@ class TileMatrixSet:
         if self._abstract:
             conf.update(abstract=self._abstract)
         if self._keywords:
-            conf.update(keywords=self._keywords)
+            conf.update(keywords=list(self._keywords))
         if self.bounds:
             conf.update(
                 boundingBox=dict(
@@ -279,8 +831,9 @@ class TilePyramid(TileMatrixSet):
     ----------
     crs : rasterio.crs.CRS
         Coordinate reference system used by TileMatrixSet.
-    tile_matrices : OrderedDict
-        Keys are TileMatrix identifiers, values are TileMatrix objects.
+    tile_matrices : mapping
+        Read-only ordered mapping with TileMatrix identifiers as keys and TileMatrix
+        objects as values.
     bounds : meintile.Bounds or None
         Bounding box values if bounding_box parameter was provided.
 
@@ -319,12 +872,18 @@ class TilePyramid(TileMatrixSet):
             'BoundingBoxType'), 'crs' (reference to one coordinate reference system),
             'lower_corner' (lower left corner coordinates) and 'upper_corner' (upper
             right corner coordinates).
+        tile_cache_size : int, optional
+            Maximum number of Tile objects cached per TileMatrix. If activated, tile()
+            returns the identical Tile object for identical indexes. (default: None,
+            i.e. no cache)
         """
         super().__init__(**kwargs)
         # TODO: check whether parameters meet tile pyramid restrictions
+        # bypass __setattr__() as the Tile Matrix Set is already frozen
+        object.__setattr__(self, "_quadtree", _quadtree(self))
 
     @classmethod
-    def from_wkss(self, wkss):
+    def from_wkss(self, wkss, tile_cache_size=None):
         """
         Construct a Tile Pyramid using a predefined well-known scale set.
 
@@ -337,20 +896,645 @@ class TilePyramid(TileMatrixSet):
                 - WebMercatorQuad: Google Maps Compatible for the World
                 - WorldCRS84Quad: CRS84 for the World
                 - WorldMercatorWGS84Quad: World Mercator WGS84 (ellipsoid)
+        tile_cache_size : int, optional
+            Maximum number of Tile objects cached per TileMatrix. (default: None, i.e.
+            no cache)
 
         Returns
         -------
         TilePyramid
         """
-        return TilePyramid(**_get_wkss_mapping(wkss))
+        return _from_wkss(TilePyramid, wkss, tile_cache_size)
+
+    def ancestor_indexes(self, zoom=None, rows=None, cols=None, ancestor_zoom=None):
+        """
+        Return rows and columns of tile ancestors at a lower zoom level.
+
+        This is the vectorized version of Tile.get_ancestor().
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+        ancestor_zoom : int
+            zoom level of ancestors, must not be higher than zoom
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        rows, cols = np.broadcast_arrays(_index_array(rows), _index_array(cols))
+        self._check_indexes(zoom, rows, cols)
+        self[ancestor_zoom]
+        shift = zoom - ancestor_zoom
+        if shift < 0:
+            raise ValueError("ancestor zoom must not be higher than zoom")
+        return rows >> shift, cols >> shift
+
+    def descendant_windows(self, zoom=None, rows=None, cols=None, descendant_zoom=None):
+        """
+        Return row and column windows of tile descendants at a higher zoom level.
+
+        This is the vectorized version of Tile.get_descendants().
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+        descendant_zoom : int
+            zoom level of descendants, must not be lower than zoom
+
+        Returns
+        -------
+        row_start, row_stop, col_start, col_stop : numpy.ndarray
+            Half-open row and column ranges of descendants.
+        """
+        rows, cols = np.broadcast_arrays(_index_array(rows), _index_array(cols))
+        self._check_indexes(zoom, rows, cols)
+        tile_matrix = self[descendant_zoom]
+        shift = descendant_zoom - zoom
+        if shift < 0:
+            raise ValueError("descendant zoom must not be lower than zoom")
+        return (
+            rows << shift,
+            np.minimum((rows + 1) << shift, tile_matrix.height),
+            cols << shift,
+            np.minimum((cols + 1) << shift, tile_matrix.width),
+        )
+
+    def morton_key(self, zoom=None, row=None, col=None):
+        """
+        Return Morton (Z-order) key of tile.
+
+        The key interleaves the row and column bits. Keys of one zoom level are unique
+        and the descendants of a tile occupy a contiguous key range on every deeper
+        zoom level (see morton_key_range()).
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        row : int
+            TileMatrix row
+        col : int
+            TileMatrix column
+
+        Returns
+        -------
+        key : int
+        """
+        self._check_index(zoom, row, col)
+        return morton_encode(row, col)
+
+    def morton_keys(self, zoom=None, rows=None, cols=None):
+        """
+        Return Morton (Z-order) keys of multiple tiles of one zoom level.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+
+        Returns
+        -------
+        keys : numpy.ndarray of numpy.uint64
+        """
+        rows, cols = np.broadcast_arrays(_index_array(rows), _index_array(cols))
+        self._check_indexes(zoom, rows, cols)
+        return morton_encode(rows, cols)
+
+    def tile_from_morton_key(self, zoom=None, key=None):
+        """
+        Return Tile object from Morton (Z-order) key.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        key : int
+            Morton key
+
+        Returns
+        -------
+        tile : meintile.Tile
+        """
+        row, col = morton_decode(int(key))
+        self._check_index(zoom, row, col)
+        return self.tile(zoom, row, col)
+
+    def indexes_from_morton_keys(self, zoom=None, keys=None):
+        """
+        Return rows and columns of multiple Morton (Z-order) keys of one zoom level.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        keys : array_like
+            Morton keys
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        rows, cols = morton_decode(_index_array(keys))
+        self._check_indexes(zoom, rows, cols)
+        return rows, cols
+
+    def morton_key_range(self, zoom=None, row=None, col=None, descendant_zoom=None):
+        """
+        Return Morton key range covering all tile descendants at a deeper zoom level.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        row : int
+            TileMatrix row
+        col : int
+            TileMatrix column
+        descendant_zoom : int
+            zoom level of descendants, must not be lower than zoom
+
+        Returns
+        -------
+        start, stop : int
+            Half-open key range.
+        """
+        self._quadtree_levels(descendant_zoom)
+        if descendant_zoom < zoom:
+            raise ValueError("descendant_zoom must not be lower than zoom")
+        shift = 2 * (descendant_zoom - zoom)
+        key = self.morton_key(zoom, row, col)
+        return key << shift, (key + 1) << shift
+
+    def quadkey(self, zoom=None, row=None, col=None):
+        """
+        Return Bing Maps style quadkey of tile.
+
+        Quadkeys encode the zoom level by their length. If the lowest TileMatrix
+        consists of more than one tile, virtual parent levels are added until there is
+        one root tile, e.g. WorldCRS84Quad zoom 0 quadkeys have one digit.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        row : int
+            TileMatrix row
+        col : int
+            TileMatrix column
+
+        Returns
+        -------
+        quadkey : str
+        """
+        levels = self._quadtree_levels(zoom)
+        key = self.morton_key(zoom, row, col)
+        return "".join(str((key >> (2 * i)) & 3) for i in reversed(range(levels)))
+
+    def quadkeys(self, zoom=None, rows=None, cols=None):
+        """
+        Return Bing Maps style quadkeys of multiple tiles of one zoom level.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+
+        Returns
+        -------
+        quadkeys : numpy.ndarray of str
+        """
+        levels = self._quadtree_levels(zoom)
+        keys = self.morton_keys(zoom, rows, cols)
+        if not levels:
+            return np.full(keys.shape, "")
+        shifts = np.arange(2 * (levels - 1), -1, -2, dtype=np.uint64)
+        digits = ((keys[..., np.newaxis] >> shifts) & 3) + ord("0")
+        # every digit becomes one UTF-32 character
+        return (
+            np.ascontiguousarray(digits, dtype=np.uint32)
+            .view("<U{}".format(levels))
+            .reshape(keys.shape)
+        )
+
+    def tile_from_quadkey(self, quadkey=None):
+        """
+        Return Tile object from Bing Maps style quadkey.
+
+        Parameters
+        ----------
+        quadkey : str
+
+        Returns
+        -------
+        tile : meintile.Tile
+        """
+        root_zoom, root_levels = self._quadtree_root()
+        key = 0
+        for digit in quadkey:
+            if digit not in "0123":
+                raise ValueError("invalid quadkey: {}".format(quadkey))
+            key = (key << 2) | int(digit)
+        zoom = root_zoom + len(quadkey) - root_levels
+        row, col = morton_decode(key)
+        self._check_index(zoom, row, col)
+        return self.tile(zoom, row, col)
+
+    def indexes_from_quadkeys(self, quadkeys=None):
+        """
+        Return zoom levels, rows and columns of multiple Bing Maps style quadkeys.
+
+        Parameters
+        ----------
+        quadkeys : array_like of str
+
+        Returns
+        -------
+        zooms, rows, cols : numpy.ndarray
+        """
+        root_zoom, root_levels = self._quadtree_root()
+        quadkeys = np.asarray(quadkeys, dtype=str)
+        lengths = np.char.str_len(quadkeys).ravel()
+        max_length = quadkeys.dtype.itemsize // 4
+        digits = np.ascontiguousarray(quadkeys).view(np.uint32).reshape(
+            lengths.size, max_length
+        ).astype(np.int64) - ord("0")
+        keys = np.zeros(lengths.size, dtype=np.uint64)
+        for i in range(max_length):
+            in_quadkey = i < lengths
+            if ((digits[in_quadkey, i] < 0) | (digits[in_quadkey, i] > 3)).any():
+                raise ValueError("invalid quadkeys given")
+            keys = np.where(
+                in_quadkey, (keys << 2) | digits[:, i].astype(np.uint64), keys
+            )
+        zooms = (lengths + root_zoom - root_levels).astype(np.int64)
+        rows, cols = morton_decode(keys)
+        for zoom in np.unique(zooms).tolist():
+            in_zoom = zooms == zoom
+            self._check_indexes(zoom, rows[in_zoom], cols[in_zoom])
+        return (
+            zooms.reshape(quadkeys.shape),
+            rows.reshape(quadkeys.shape),
+            cols.reshape(quadkeys.shape),
+        )
+
+    def _quadtree_root(self):
+        """Return lowest zoom level and number of virtual levels above it."""
+        if self._quadtree is None:
+            raise ValueError(
+                "TileMatrix shapes do not double from one zoom level to the next"
+            )
+        return self._quadtree
+
+    def _quadtree_levels(self, zoom):
+        """Return number of quadtree levels from the root tile down to zoom."""
+        root_zoom, root_levels = self._quadtree_root()
+        self[zoom]
+        return zoom - root_zoom + root_levels
+
+    def _check_index(self, zoom, row, col):
+        tm = self[zoom]
+        if not (0 <= row < tm.height and 0 <= col < tm.width):
+            raise InvalidTileIndex(
+                "Tile index ({}, {}, {}) is outside of TileMatrix".format(
+                    zoom, row, col
+                )
+            )
+
+    def _check_indexes(self, zoom, rows, cols):
+        tm = self[zoom]
+        if (
+            (rows < 0).any()
+            or (rows >= tm.height).any()
+            or (cols < 0).any()
+            or (cols >= tm.width).any()
+        ):
+            raise InvalidTileIndex("tile indexes are outside of TileMatrix")
+
+    def map_tiles(
+        self,
+        func=None,
+        tiles_or_bounds=None,
+        zoom=None,
+        executor="thread",
+        workers=None,
+        chunk_size=256,
+        max_pending=None,
+        pixelbuffer=0,
+    ):
+        """
+        Apply a function to tiles in parallel and yield results as they complete.
+
+        Tiles are split into chunks of aligned Morton blocks, i.e. every chunk covers
+        a compact square area and workers process neighboring tiles. Only chunks are
+        submitted to the executor, and at most max_pending chunks are submitted at
+        once, so results have to be consumed before more work is dispatched.
+
+        Parameters
+        ----------
+        func : callable
+            Function accepting a meintile.Tile. When using processes, func and its
+            results have to be picklable.
+        tiles_or_bounds : iterable of meintile.Tile or tuple or meintile.Bounds
+            Either Tile objects of this Tile Pyramid or bounding coordinates (left,
+            bottom, right, top) in CRS units.
+        zoom : int
+            zoom level / TileMatrix identifier, required if bounds are given
+        executor : str or concurrent.futures.Executor
+            Either "thread", "process" or an existing executor which will not be shut
+            down. (default: "thread")
+        workers : int, optional
+            Number of workers if executor is created. (default: number of CPUs)
+        chunk_size : int
+            Maximum number of tiles per chunk. It is rounded down to a power of 4 to
+            match Morton blocks. (default: 256)
+        max_pending : int, optional
+            Maximum number of chunks submitted but not yet consumed. (default: twice
+            the number of workers)
+        pixelbuffer : int
+            Tile buffer in pixels for tiles created from bounds. Tile objects keep
+            their pixelbuffer. (default: 0)
+
+        Yields
+        ------
+        tile, result : meintile.Tile, object
+            Tiles of a chunk are yielded together in Morton order, chunks in order of
+            completion.
+        """
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        if isinstance(executor, str) and executor not in ["thread", "process"]:
+            raise ValueError("invalid executor given: {}".format(executor))
+        if _is_bounds(tiles_or_bounds):
+            # raise eagerly on invalid zoom levels
+            self[zoom]
+        return map_tiles(
+            self,
+            func,
+            tiles_or_bounds,
+            zoom=zoom,
+            executor=executor,
+            workers=workers,
+            chunk_size=chunk_size,
+            max_pending=max_pending,
+            pixelbuffer=pixelbuffer,
+        )
+
+    def tiles_from_geom(self, geometry=None, zoom=None, multi_zoom=False):
+        """
+        Yield Tile objects intersecting with geometry.
+
+        Starting from the lowest zoom level, tiles are recursively split into their
+        children while subtrees not intersecting with the geometry are skipped. Tiles
+        only touching polygonal geometries are not included.
+
+        Parameters
+        ----------
+        geometry : shapely.geometry.base.BaseGeometry
+            Point, line or polygon geometry in CRS units.
+        zoom : int
+            zoom level / TileMatrix identifier
+        multi_zoom : bool
+            If True, tiles fully contained by the geometry are not split further but
+            yielded as one coarser tile. (default: False)
+
+        Yields
+        ------
+        meintile.Tile
+        """
+        # raise eagerly on invalid zoom levels
+        self[zoom]
+        return self._tiles_from_geom(geometry, zoom, multi_zoom)
+
+    def atiles_from_geom(
+        self,
+        geometry=None,
+        zoom=None,
+        multi_zoom=False,
+        batch_size=1024,
+        executor=False,
+    ):
+        """
+        Asynchronously yield batches of Tile objects intersecting with geometry.
+
+        This is the asynchronous version of tiles_from_geom(). After every batch,
+        control is given back to the event loop.
+
+        Parameters
+        ----------
+        geometry : shapely.geometry.base.BaseGeometry
+            Point, line or polygon geometry in CRS units.
+        zoom : int
+            zoom level / TileMatrix identifier
+        multi_zoom : bool
+            If True, tiles fully contained by the geometry are not split further but
+            yielded as one coarser tile. (default: False)
+        batch_size : int
+            Maximum number of tiles per batch. (default: 1024)
+        executor : bool or concurrent.futures.Executor
+            Compute batches in the default executor of the event loop (True) or in the
+            given thread based executor. (default: False, i.e. within the event loop)
+
+        Yields
+        ------
+        list of meintile.Tile
+        """
+        _check_batch_size(batch_size)
+        return abatched(
+            self.tiles_from_geom(geometry, zoom, multi_zoom=multi_zoom),
+            batch_size=batch_size,
+            executor=executor,
+        )
+
+    def _tiles_from_geom(self, geometry, zoom, multi_zoom):
+        from shapely.geometry import box
+        from shapely.prepared import prep
+
+        if geometry.is_empty:
+            return
+        prepared = prep(geometry)
+        polygonal = geometry.geom_type in ["Polygon", "MultiPolygon"]
+
+        # depth-first descent beginning with the tiles of the lowest zoom level
+        stack = list(self.tiles_from_bounds(geometry.bounds, min(self.keys())))[::-1]
+        while stack:
+            tile = stack.pop()
+            left, bottom, right, top = tile.bounds
+            # tile bounds are not perfectly nested due to floating point precision,
+            # therefore a tolerance is applied when comparing with the geometry
+            tolerance = (right - left) * _TILE_TOLERANCE
+            if tile.zoom == zoom:
+                if polygonal:
+                    # omit tiles only touching the polygon
+                    bbox = box(
+                        left + tolerance,
+                        bottom + tolerance,
+                        right - tolerance,
+                        top - tolerance,
+                    )
+                else:
+                    bbox = tile.bbox
+                if prepared.intersects(bbox):
+                    yield tile
+                continue
+            if not prepared.intersects(
+                box(
+                    left - tolerance,
+                    bottom - tolerance,
+                    right + tolerance,
+                    top + tolerance,
+                )
+            ):
+                continue
+            if prepared.contains(tile.bbox):
+                if multi_zoom:
+                    yield tile
+                else:
+                    for child in self.tiles_from_bounds(tile.bounds, zoom):
+                        yield child
+            else:
+                stack.extend(tile.get_children()[::-1])
+
+
+def _check_strategy(strategy):
+    if strategy not in _RESOLUTION_STRATEGIES:
+        raise ValueError(
+            "strategy must be one of {}, not {}".format(
+                ", ".join(_RESOLUTION_STRATEGIES), strategy
+            )
+        )
+
+
+def _quadtree(tile_pyramid):
+    """
+    Return lowest zoom level and number of virtual quadtree levels above it.
+
+    Returns None if the TileMatrix shapes do not double from one zoom level to the
+    next or if the deepest TileMatrix is too large to encode its rows and columns.
+    """
+    zooms = sorted(tile_pyramid.keys())
+    root_zoom = zooms[0]
+    root = tile_pyramid[root_zoom]
+    for zoom in zooms:
+        tm = tile_pyramid[zoom]
+        factor = 2 ** (zoom - root_zoom)
+        if tm.width != root.width * factor or tm.height != root.height * factor:
+            return None
+    if zooms != list(range(root_zoom, root_zoom + len(zooms))):
+        return None
+    root_levels = (max(root.width, root.height) - 1).bit_length()
+    if root_levels + len(zooms) - 1 > MAX_BITS:
+        return None
+    return root_zoom, root_levels
+
+
+def _from_wkss(cls, wkss, tile_cache_size):
+    """Return interned Tile Matrix Set from WKSS identifier or dictionary."""
+    if not isinstance(wkss, str):
+        return _from_mapping(cls, _get_wkss_mapping(wkss), tile_cache_size)
+    # look up identifiers directly to avoid hashing the definition
+    key = (cls, wkss, tile_cache_size)
+    tms = _registry_get(key)
+    if tms is None:
+        tms = _from_mapping(cls, _get_wkss_mapping(wkss), tile_cache_size)
+        if tms._wkss_identifier is None:
+            # bypass __setattr__() as the Tile Matrix Set is already frozen
+            object.__setattr__(tms, "_wkss_identifier", wkss)
+        tms = _registry_put(key, tms)
+    return tms
+
+
+def _pickle_key(cls, wkss, is_global, tile_cache_size):
+    """Return registry key used by _unpickle_tile_matrix_set()."""
+    if isinstance(wkss, str):
+        return (cls, wkss, tile_cache_size)
+    return _mapping_key(
+        cls, _get_wkss_mapping(wkss, is_global=is_global), tile_cache_size
+    )
+
+
+def _unpickle_tile_matrix_set(cls, wkss, is_global, tile_cache_size):
+    if isinstance(wkss, str):
+        return _from_wkss(cls, wkss, tile_cache_size)
+    return _from_mapping(
+        cls, _get_wkss_mapping(wkss, is_global=is_global), tile_cache_size
+    )
+
+
+def _from_mapping(cls, mapping, tile_cache_size):
+    """Return interned Tile Matrix Set by a hash of its definition."""
+    key = _mapping_key(cls, mapping, tile_cache_size)
+    tms = _registry_get(key)
+    if tms is None:
+        tms = _registry_put(key, cls(tile_cache_size=tile_cache_size, **mapping))
+    return tms
+
+
+def _mapping_key(cls, mapping, tile_cache_size):
+    """Return registry key from a hash of the definition."""
+    digest = hashlib.sha256(
+        json.dumps(mapping, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return (cls, digest, tile_cache_size)
+
+
+def _registry_get(key):
+    with _REGISTRY_LOCK:
+        tms = _REGISTRY.get(key)
+        if tms is None:
+            tms = _REFERENCED.get(key)
+            if tms is None:
+                return None
+            _REGISTRY[key] = tms
+        _REGISTRY.move_to_end(key)
+        _trim_registry()
+        return tms
+
+
+def _registry_put(key, tms):
+    """Add Tile Matrix Set and return the interned object for key."""
+    with _REGISTRY_LOCK:
+        if _registry_size == 0:
+            return tms
+        registered = _REGISTRY.get(key)
+        tms = _REFERENCED.setdefault(key, tms if registered is None else registered)
+        _REGISTRY[key] = tms
+        _REGISTRY.move_to_end(key)
+        _trim_registry()
+        return tms
+
+
+def _trim_registry():
+    # requires _REGISTRY_LOCK to be held
+    if _registry_size is not None:
+        while len(_REGISTRY) > _registry_size:
+            _REGISTRY.popitem(last=False)
 
 
-def _get_wkss_mapping(wkss):
+def _get_wkss_mapping(wkss, is_global=False):
     # get definition by ID or use dictionary representation
     if isinstance(wkss, str):
         wkss_definition, is_global = get_wkss(wkss)
     elif isinstance(wkss, dict):
-        wkss_definition, is_global = wkss, False
+        wkss_definition = wkss
     else:
         raise TypeError("invalid WKSS given")
 
@@ -0,0 +1,97 @@
+from meintile._tile import Tile, _matrix_set
+from meintile._types import Bounds
+
+
+class TileRange(object):
+    """
+    A rectangular window of tiles within one TileMatrix.
+
+    Tile objects are only created when iterating over the TileRange.
+
+    Attributes
+    ----------
+    tile_matrix, tm : meintile.TileMatrix
+        Parent Tile Matrix.
+    zoom : int
+        Zoom level / parent Tile Matrix identifier.
+    rows : range
+        Rows within parent Tile Matrix.
+    cols : range
+        Columns within parent Tile Matrix.
+    pixelbuffer : int
+        Tile buffer in pixels of generated Tile objects.
+    """
+
+    __slots__ = ("tile_matrix", "rows", "cols", "pixelbuffer")
+
+    def __init__(self, tile_matrix=None, rows=None, cols=None, pixelbuffer=0):
+        """
+        Initialize a TileRange object.
+
+        Parameters
+        ----------
+        tile_matrix : meintile.TileMatrix
+            Parent Tile Matrix.
+        rows : range
+            Rows within parent Tile Matrix.
+        cols : range
+            Columns within parent Tile Matrix.
+        pixelbuffer : int
+            Tile buffer in pixels of generated Tile objects. (default: 0)
+        """
+        self.tile_matrix = tile_matrix
+        self.rows = rows
+        self.cols = cols
+        self.pixelbuffer = pixelbuffer
+
+    @property
+    def tm(self):
+        """Parent Tile Matrix."""
+        return self.tile_matrix
+
+    @property
+    def zoom(self):
+        """Zoom level / parent Tile Matrix identifier."""
+        return self.tile_matrix.id
+
+    @property
+    def bounds(self):
+        """Bounding coordinates of all tiles without pixelbuffer."""
+        if not len(self):
+            return None
+        left, _, _, top = self.tile_matrix.tile(self.rows[0], self.cols[0]).bounds
+        _, bottom, right, _ = self.tile_matrix.tile(self.rows[-1], self.cols[-1]).bounds
+        return Bounds(left, bottom, right, top)
+
+    def __len__(self):
+        """Return number of tiles."""
+        return len(self.rows) * len(self.cols)
+
+    def __contains__(self, tile):
+        """
+        Check whether tile is part of TileRange.
+
+        Parameters
+        ----------
+        tile : meintile.Tile or meintile.TileIndex or tuple
+            Tile objects also have to share the Tile Matrix Set and pixelbuffer.
+        """
+        if isinstance(tile, Tile):
+            if _matrix_set(tile.tile_matrix) is not _matrix_set(self.tile_matrix):
+                return False
+            if tile.pixelbuffer != self.pixelbuffer:
+                return False
+        zoom, row, col = tile
+        return zoom == self.zoom and row in self.rows and col in self.cols
+
+    def __iter__(self):
+        """Yield Tile objects row by row."""
+        for row in self.rows:
+            for col in self.cols:
+                yield self.tile_matrix.tile(row, col, pixelbuffer=self.pixelbuffer)
+
+    def __repr__(self):
+        """Return representational string."""
+        return "TileRange(zoom={}, rows={}, cols={}, {})".format(
+            self.zoom, self.rows, self.cols, self.tile_matrix
+        )
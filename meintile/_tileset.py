@@ -0,0 +1,455 @@
+"""
+Compact sets of tiles.
+
+Tiles of every zoom level are stored as sorted, disjoint and non-adjacent half-open
+ranges of Morton keys. Areas covered by many tiles therefore collapse to a few ranges
+and set operations only have to process range boundaries. As the four children of a
+tile occupy the keys 4 * key to 4 * key + 3, parents are found by shifting keys.
+"""
+
+import numpy as np
+import zlib
+
+from meintile._curves import morton_decode, morton_encode
+from meintile._tile import Tile
+from meintile._tilematrix import _index_array
+from meintile._types import TileIndex
+
+# identifies serialized TileSets and the format version
+_MAGIC = b"MTS\x01"
+
+# ranges of zoom levels without tiles
+_EMPTY = (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint64))
+for _array in _EMPTY:
+    _array.flags.writeable = False
+
+# number of keys decoded at once when iterating over tiles
+_DECODE_CHUNK_SIZE = 65536
+
+# segments kept by set operations by their coverage (1: first, 2: second, 3: both)
+_COVERAGE_OPERATIONS = {
+    "union": lambda coverage: coverage > 0,
+    "intersection": lambda coverage: coverage == 3,
+    "difference": lambda coverage: coverage == 1,
+    "symmetric_difference": lambda coverage: (coverage == 1) | (coverage == 2),
+}
+
+
+class TileSet:
+    """
+    Immutable set of tiles of one TilePyramid.
+
+    Tiles are stored per zoom level as ranges of Morton keys, so memory use depends on
+    the shape of the covered area rather than on the number of tiles.
+
+    Attributes
+    ----------
+    tile_pyramid, tp : meintile.TilePyramid
+        Parent Tile Pyramid.
+    zooms : list
+        Zoom levels containing tiles.
+    """
+
+    def __init__(self, tile_pyramid=None, tiles=None):
+        """
+        Initialize a TileSet object.
+
+        Parameters
+        ----------
+        tile_pyramid : meintile.TilePyramid
+            Parent Tile Pyramid, TileMatrix shapes have to double from one zoom level
+            to the next.
+        tiles : iterable of meintile.Tile or meintile.TileIndex
+            Tiles to be added. Pixelbuffers of Tile objects are ignored.
+        """
+        tile_pyramid._quadtree_root()
+        self.tile_pyramid = self.tp = tile_pyramid
+        self._ranges = {}
+        groups = {}
+        for tile in tiles or ():
+            if isinstance(tile, Tile):
+                if tile.tile_pyramid is not tile_pyramid:
+                    raise ValueError("tile {} is not part of Tile Pyramid".format(tile))
+                zoom, row, col = tile.id
+            else:
+                zoom, row, col = TileIndex(*tile)
+            rows, cols = groups.setdefault(zoom, ([], []))
+            rows.append(row)
+            cols.append(col)
+        for zoom, (rows, cols) in groups.items():
+            keys = tile_pyramid.morton_keys(zoom, rows, cols)
+            self._set_ranges(zoom, *_ranges_from_keys(keys))
+
+    @classmethod
+    def from_indexes(cls, tile_pyramid=None, zoom=None, rows=None, cols=None):
+        """
+        Create TileSet from rows and columns of one zoom level.
+
+        Parameters
+        ----------
+        tile_pyramid : meintile.TilePyramid
+            Parent Tile Pyramid.
+        zoom : int
+            zoom level / TileMatrix identifier
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+
+        Returns
+        -------
+        meintile.TileSet
+        """
+        tile_set = cls(tile_pyramid)
+        keys = tile_pyramid.morton_keys(zoom, rows, cols)
+        tile_set._set_ranges(zoom, *_ranges_from_keys(keys.ravel()))
+        return tile_set
+
+    @classmethod
+    def from_bytes(cls, tile_pyramid=None, data=None):
+        """
+        Create TileSet from serialized ranges. See to_bytes().
+
+        Parameters
+        ----------
+        tile_pyramid : meintile.TilePyramid
+            Parent Tile Pyramid.
+        data : bytes
+
+        Returns
+        -------
+        meintile.TileSet
+        """
+        if data[: len(_MAGIC)] != _MAGIC:
+            raise ValueError("data is not a serialized TileSet")
+        try:
+            values = np.frombuffer(zlib.decompress(data[len(_MAGIC) :]), dtype="<u8")
+        except zlib.error as exc:
+            raise ValueError("invalid TileSet data: {}".format(exc))
+        tile_set = cls(tile_pyramid)
+        position = 0
+        while position < len(values):
+            zoom, count = (int(i) for i in values[position : position + 2])
+            position += 2
+            deltas = values[position : position + 2 * count]
+            if len(deltas) != 2 * count:
+                raise ValueError("invalid TileSet data: truncated ranges")
+            position += 2 * count
+            # alternating gaps and range lengths
+            bounds = np.cumsum(deltas, dtype=np.uint64)
+            starts, stops = bounds[0::2], bounds[1::2]
+            if (deltas[1::2] == 0).any() or (deltas[2::2] == 0).any():
+                raise ValueError("invalid TileSet data: ranges are not normalized")
+            if count:
+                # check first and last tile of every range
+                tile_pyramid.indexes_from_morton_keys(
+                    zoom, np.concatenate([starts, stops - np.uint64(1)])
+                )
+            tile_set._set_ranges(zoom, starts, stops)
+        return tile_set
+
+    def to_bytes(self):
+        """
+        Serialize TileSet.
+
+        Ranges are stored as alternating gaps and lengths and compressed with zlib.
+        The Tile Pyramid is not included.
+
+        Returns
+        -------
+        bytes
+        """
+        values = []
+        for zoom in self.zooms:
+            starts, stops = self._ranges[zoom]
+            bounds = np.empty(2 * len(starts), dtype=np.uint64)
+            bounds[0::2], bounds[1::2] = starts, stops
+            values.append(np.array([zoom, len(starts)], dtype=np.uint64))
+            values.append(np.diff(bounds, prepend=np.uint64(0)))
+        payload = np.concatenate(values).astype("<u8") if values else b""
+        return _MAGIC + zlib.compress(bytes(payload))
+
+    @property
+    def zooms(self):
+        """Zoom levels containing tiles."""
+        return sorted(self._ranges)
+
+    def ranges(self, zoom=None):
+        """
+        Return Morton key ranges of one zoom level.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+
+        Returns
+        -------
+        starts, stops : numpy.ndarray of numpy.uint64
+            Sorted, disjoint and non-adjacent half-open key ranges.
+        """
+        self.tile_pyramid[zoom]
+        return self._ranges.get(zoom, _EMPTY)
+
+    def indexes(self, zoom=None):
+        """
+        Return rows and columns of all tiles of one zoom level in Morton order.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+
+        Returns
+        -------
+        rows, cols : numpy.ndarray
+        """
+        return morton_decode(_keys_from_ranges(*self.ranges(zoom)))
+
+    def count(self, zoom=None):
+        """
+        Return number of tiles.
+
+        Parameters
+        ----------
+        zoom : int
+            Only count tiles of this zoom level. (default: all zoom levels)
+
+        Returns
+        -------
+        int
+        """
+        if zoom is None:
+            return sum(self.count(zoom) for zoom in self._ranges)
+        starts, stops = self.ranges(zoom)
+        return int((stops - starts).sum())
+
+    def contains(self, zoom=None, rows=None, cols=None):
+        """
+        Return whether tiles of one zoom level are part of the TileSet.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier
+        rows : array_like
+            TileMatrix rows
+        cols : array_like
+            TileMatrix columns
+
+        Returns
+        -------
+        numpy.ndarray of bool
+        """
+        rows, cols = np.broadcast_arrays(_index_array(rows), _index_array(cols))
+        tm = self.tile_pyramid[zoom]
+        valid = (rows >= 0) & (rows < tm.height) & (cols >= 0) & (cols < tm.width)
+        starts, stops = self.ranges(zoom)
+        keys = morton_encode(np.where(valid, rows, 0), np.where(valid, cols, 0))
+        if not len(starts):
+            return np.zeros(rows.shape, dtype=bool)
+        position = np.searchsorted(starts, keys, side="right") - 1
+        found = (position >= 0) & (keys < stops[np.maximum(position, 0)])
+        return found & valid
+
+    def rollup(self, zoom=None, mode="any"):
+        """
+        Return TileSet with the parent tiles of one zoom level.
+
+        Parameters
+        ----------
+        zoom : int
+            zoom level / TileMatrix identifier of the child tiles
+        mode : str
+            Either "any" (parents with at least one child) or "all" (parents with all
+            four children). (default: "any")
+
+        Returns
+        -------
+        meintile.TileSet
+        """
+        starts, stops = self.ranges(zoom)
+        self.tile_pyramid[zoom - 1]
+        two = np.uint64(2)
+        if mode == "any":
+            starts, stops = _normalize(
+                starts >> two, ((stops - np.uint64(1)) >> two) + 1
+            )
+        elif mode == "all":
+            starts, stops = (starts + np.uint64(3)) >> two, stops >> two
+            not_empty = starts < stops
+            starts, stops = starts[not_empty], stops[not_empty]
+        else:
+            raise ValueError("mode must be 'any' or 'all', not {}".format(mode))
+        tile_set = type(self)(self.tile_pyramid)
+        tile_set._set_ranges(zoom - 1, starts, stops)
+        return tile_set
+
+    def union(self, other):
+        """Return TileSet with tiles in either TileSet."""
+        return self._combine(other, "union")
+
+    def intersection(self, other):
+        """Return TileSet with tiles in both TileSets."""
+        return self._combine(other, "intersection")
+
+    def difference(self, other):
+        """Return TileSet with tiles which are not in the other TileSet."""
+        return self._combine(other, "difference")
+
+    def symmetric_difference(self, other):
+        """Return TileSet with tiles in exactly one of both TileSets."""
+        return self._combine(other, "symmetric_difference")
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+
+    def _combine(self, other, operation):
+        if not isinstance(other, TileSet):
+            return NotImplemented
+        if other.tile_pyramid is not self.tile_pyramid:
+            raise ValueError("TileSets are not part of the same Tile Pyramid")
+        tile_set = type(self)(self.tile_pyramid)
+        for zoom in set(self._ranges) | set(other._ranges):
+            tile_set._set_ranges(
+                zoom,
+                *_combine_ranges(
+                    self._ranges.get(zoom, _EMPTY),
+                    other._ranges.get(zoom, _EMPTY),
+                    _COVERAGE_OPERATIONS[operation],
+                )
+            )
+        return tile_set
+
+    def _set_ranges(self, zoom, starts, stops):
+        if len(starts):
+            starts = np.asarray(starts, dtype=np.uint64)
+            stops = np.asarray(stops, dtype=np.uint64)
+            starts.flags.writeable = False
+            stops.flags.writeable = False
+            self._ranges[zoom] = (starts, stops)
+
+    def __contains__(self, tile):
+        """Tile or TileIndex is part of the TileSet."""
+        if isinstance(tile, Tile):
+            if tile.tile_pyramid is not self.tile_pyramid:
+                return False
+            zoom, row, col = tile.id
+        else:
+            zoom, row, col = TileIndex(*tile)
+        if zoom not in self._ranges:
+            return False
+        return bool(self.contains(zoom, row, col))
+
+    def __iter__(self):
+        """Yield Tile objects ordered by zoom level and Morton key."""
+        for zoom in self.zooms:
+            tile_matrix = self.tile_pyramid[zoom]
+            for start, stop in zip(*self._ranges[zoom]):
+                # decode large ranges in chunks to limit memory use
+                for chunk in range(int(start), int(stop), _DECODE_CHUNK_SIZE):
+                    chunk_stop = min(chunk + _DECODE_CHUNK_SIZE, int(stop))
+                    rows, cols = morton_decode(
+                        np.arange(chunk, chunk_stop, dtype=np.uint64)
+                    )
+                    for row, col in zip(rows.tolist(), cols.tolist()):
+                        yield tile_matrix.tile(row, col)
+
+    def __len__(self):
+        """Number of tiles."""
+        return self.count()
+
+    def __bool__(self):
+        """TileSet contains tiles."""
+        return bool(self._ranges)
+
+    def __eq__(self, other):
+        """Both TileSets contain the same tiles of the same Tile Pyramid."""
+        return (
+            isinstance(other, TileSet)
+            and self.tile_pyramid is other.tile_pyramid
+            and self._ranges.keys() == other._ranges.keys()
+            and all(
+                np.array_equal(self._ranges[zoom][i], other._ranges[zoom][i])
+                for zoom in self._ranges
+                for i in (0, 1)
+            )
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return representational string."""
+        return "TileSet(zooms={}, tiles={}, ranges={})".format(
+            self.zooms, len(self), sum(len(i[0]) for i in self._ranges.values())
+        )
+
+
+def _ranges_from_keys(keys):
+    """Return ranges of consecutive keys."""
+    keys = np.unique(np.asarray(keys, dtype=np.uint64))
+    if not len(keys):
+        return _EMPTY
+    breaks = np.flatnonzero(np.diff(keys) != 1) + 1
+    return (
+        keys[np.concatenate([[0], breaks])],
+        keys[np.concatenate([breaks - 1, [len(keys) - 1]])] + np.uint64(1),
+    )
+
+
+def _keys_from_ranges(starts, stops):
+    """Return all keys of ranges."""
+    lengths = (stops - starts).astype(np.int64)
+    offsets = np.arange(lengths.sum(), dtype=np.int64) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    return np.repeat(starts, lengths) + offsets.astype(np.uint64)
+
+
+def _normalize(starts, stops):
+    """Merge overlapping and adjacent ranges."""
+    if not len(starts):
+        return _EMPTY
+    order = np.argsort(starts, kind="stable")
+    starts, stops = starts[order], np.maximum.accumulate(stops[order])
+    new = np.ones(len(starts), dtype=bool)
+    new[1:] = starts[1:] > stops[:-1]
+    last = np.concatenate([np.flatnonzero(new)[1:] - 1, [len(starts) - 1]])
+    return starts[new], stops[last]
+
+
+def _combine_ranges(a, b, keep):
+    """
+    Apply set operation on two normalized range lists.
+
+    Ranges of a count 1, ranges of b count 2 towards the coverage of every segment
+    between range boundaries, keep() selects segments by their coverage.
+    """
+    positions = np.concatenate([a[0], a[1], b[0], b[1]])
+    if not len(positions):
+        return _EMPTY
+    weights = np.concatenate(
+        [
+            np.full(len(a[0]), 1, dtype=np.int64),
+            np.full(len(a[1]), -1, dtype=np.int64),
+            np.full(len(b[0]), 2, dtype=np.int64),
+            np.full(len(b[1]), -2, dtype=np.int64),
+        ]
+    )
+    order = np.argsort(positions, kind="stable")
+    positions, weights = positions[order], weights[order]
+    first = np.ones(len(positions), dtype=bool)
+    first[1:] = positions[1:] != positions[:-1]
+    boundaries = positions[first]
+    coverage = np.cumsum(np.add.reduceat(weights, np.flatnonzero(first)))
+    selected = keep(coverage[:-1])
+    starts, stops = boundaries[:-1][selected], boundaries[1:][selected]
+    # consecutive selected segments touch
+    if not len(starts):
+        return _EMPTY
+    new = np.ones(len(starts), dtype=bool)
+    new[1:] = starts[1:] != stops[:-1]
+    last = np.concatenate([np.flatnonzero(new)[1:] - 1, [len(starts) - 1]])
+    return starts[new], stops[last]
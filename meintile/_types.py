@@ -1,6 +1,5 @@
 from collections import namedtuple
 
-
 Bounds = namedtuple("Bounds", "left bottom right top")
 Bounds.__doc__ = """
 Bounds coordinates in CRS units.
@@ -17,6 +16,78 @@ top : float
     Top coordinate.
 """
 
+CacheInfo = namedtuple("CacheInfo", "hits misses maxsize currsize")
+CacheInfo.__doc__ = """
+Tile cache statistics.
+
+Attributes
+==========
+hits : int
+    Number of Tile requests served from cache.
+misses : int
+    Number of Tile requests which created a new Tile.
+maxsize : int
+    Maximum number of cached Tiles.
+currsize : int
+    Number of currently cached Tiles.
+"""
+
+CRSInfo = namedtuple("CRSInfo", "crs string meters_per_unit is_geographic")
+CRSInfo.__doc__ = """
+Resolved coordinate reference system properties.
+
+Attributes
+==========
+crs : rasterio.crs.CRS
+    CRS object.
+string : str
+    Canonical CRS string, e.g. 'EPSG:3857'.
+meters_per_unit : float
+    Meters per CRS unit used to convert scale denominators into pixel sizes.
+is_geographic : bool
+    Whether CRS units are degrees.
+"""
+
+RasterWindows = namedtuple(
+    "RasterWindows",
+    "rows cols valid col_off row_off width height x_scale y_scale read_index reads",
+)
+RasterWindows.__doc__ = """
+Source raster read windows of multiple tiles as NumPy arrays.
+
+Window offsets and lengths are in source raster pixels and follow the argument order
+of rasterio.windows.Window. Windows are clipped to the source raster, windows of
+tiles not intersecting with it are empty.
+
+Attributes
+==========
+rows : numpy.ndarray
+    TileMatrix rows.
+cols : numpy.ndarray
+    TileMatrix columns.
+valid : numpy.ndarray
+    Boolean mask of tiles which are available in the Tile Matrix and intersect with
+    the source raster.
+col_off : numpy.ndarray
+    Column offsets.
+row_off : numpy.ndarray
+    Row offsets.
+width : numpy.ndarray
+    Window widths.
+height : numpy.ndarray
+    Window heights.
+x_scale : numpy.ndarray
+    Source pixels per tile pixel along the x-axis. Values above 1 mean downsampling.
+y_scale : numpy.ndarray
+    Source pixels per tile pixel along the y-axis.
+read_index : numpy.ndarray or None
+    Position of the coalesced read containing each tile window, -1 for invalid
+    tiles. None if windows were not coalesced.
+reads : numpy.ndarray or None
+    Coalesced read windows (col_off, row_off, width, height) with shape (n, 4).
+    None if windows were not coalesced.
+"""
+
 ScaleSet = namedtuple("ScaleSet", "definition is_global")
 ScaleSet.__doc__ = """
 Standard-conform Scale Set plus meintile specific properties.
@@ -42,6 +113,40 @@ width : int
     Number of pixel columns.
 """
 
+Snapshot = namedtuple("Snapshot", "counters timers")
+Snapshot.__doc__ = """
+Instrumentation counters and timers.
+
+Attributes
+==========
+counters : dict
+    Number of events by counter name.
+timers : dict
+    meintile.instrumentation.Timing by timer name.
+"""
+
+TileGeometries = namedtuple("TileGeometries", "valid left bottom right top affine")
+TileGeometries.__doc__ = """
+Geometry of multiple tiles as NumPy arrays.
+
+Coordinates of invalid tiles are set to NaN.
+
+Attributes
+==========
+valid : numpy.ndarray
+    Boolean mask of tile indexes available in the Tile Matrix (Set).
+left : numpy.ndarray
+    Left coordinates.
+bottom : numpy.ndarray
+    Bottom coordinates.
+right : numpy.ndarray
+    Right coordinates.
+top : numpy.ndarray
+    Top coordinates.
+affine : numpy.ndarray
+    Affine coefficients (a, b, c, d, e, f) with shape (n, 6).
+"""
+
 TileIndex = namedtuple("TileIndex", "zoom row col")
 TileIndex.__doc__ = """
 Unique Tile index.
@@ -55,3 +160,17 @@ row : int
 col : int
     Tile Matrix column.
 """
+
+Timing = namedtuple("Timing", "count total max")
+Timing.__doc__ = """
+Timing statistics of one instrumented function.
+
+Attributes
+==========
+count : int
+    Number of calls.
+total : float
+    Sum of call durations in seconds.
+max : float
+    Longest call duration in seconds.
+"""
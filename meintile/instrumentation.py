@@ -0,0 +1,262 @@
+"""
+Opt-in counters and timers for tile operations.
+
+Instrumentation is disabled by default. enable() replaces the instrumented methods
+with counting and timing wrappers, disable() restores the original methods, so there
+is no overhead at all while instrumentation is disabled.
+
+Example
+-------
+>>> from meintile import TilePyramid, instrumentation
+>>> instrumentation.enable()
+>>> children = TilePyramid.from_wkss("WebMercatorQuad").tile(5, 5, 5).get_children()
+>>> instrumentation.snapshot().counters["tiles_created"]
+5
+>>> instrumentation.disable()
+
+Counters
+--------
+tiles_created
+    Tile objects created.
+tile_cache_hits, tile_cache_misses
+    Tile cache lookups of TileMatrix.tile() on TileMatrix objects with tile cache.
+tile_matrices_created
+    TileMatrix objects created, i.e. CRS and geometry setup.
+tile_matrix_sets_created
+    TileMatrixSet and TilePyramid objects built. Interned objects returned by
+    from_wkss() or from_dict() are not built again.
+
+Timers
+------
+TileMatrix.__init__, TileMatrix.tile, TileMatrixSet.tile, Tile.get_children,
+Tile.get_neighbors, TileMatrixSet.from_wkss, TilePyramid.from_wkss
+"""
+
+import functools
+import itertools
+import threading
+import time
+import weakref
+
+from meintile._tile import Tile
+from meintile._tilematrix import TileMatrix, _TileCache
+from meintile._tilepyramid import TileMatrixSet, TilePyramid
+from meintile._types import Snapshot, Timing
+
+# instrumented class, method, counter name, timer name
+_TARGETS = [
+    (Tile, "__init__", "tiles_created", None),
+    (Tile, "get_children", None, "Tile.get_children"),
+    (Tile, "get_neighbors", None, "Tile.get_neighbors"),
+    (TileMatrix, "__init__", "tile_matrices_created", "TileMatrix.__init__"),
+    (TileMatrix, "tile", None, "TileMatrix.tile"),
+    (TileMatrixSet, "__init__", "tile_matrix_sets_created", None),
+    (TileMatrixSet, "tile", None, "TileMatrixSet.tile"),
+    (TileMatrixSet, "from_wkss", None, "TileMatrixSet.from_wkss"),
+    (TilePyramid, "from_wkss", None, "TilePyramid.from_wkss"),
+]
+
+# reentrant, as finalizers merging stats of finished threads may run at any time
+_LOCK = threading.RLock()
+# original class attributes by (class, method name) while enabled
+_ORIGINALS = {}
+# counters and timers are collected per thread so events do not need a lock
+_LOCAL = threading.local()
+# (counters, timers) of running threads by key, timers map names to
+# [count, total, max]
+_THREAD_STATS = {}
+_THREAD_KEYS = itertools.count()
+# counters and timers of finished threads
+_FINISHED_STATS = ({}, {})
+_HOOKS = []
+
+
+def enable():
+    """Start counting and timing tile operations."""
+    with _LOCK:
+        if _ORIGINALS:
+            return
+        for cls, name, counter, timer in _TARGETS:
+            original = cls.__dict__[name]
+            _ORIGINALS[(cls, name)] = original
+            setattr(cls, name, _wrap(original, counter, timer))
+        _ORIGINALS[(_TileCache, "get")] = _TileCache.get
+        _TileCache.get = _wrap_cache_get(_TileCache.get)
+
+
+def disable():
+    """Stop counting and timing and restore the original methods."""
+    with _LOCK:
+        for (cls, name), original in _ORIGINALS.items():
+            setattr(cls, name, original)
+        _ORIGINALS.clear()
+
+
+def is_enabled():
+    """
+    Return whether instrumentation is enabled.
+
+    Returns
+    -------
+    bool
+    """
+    return bool(_ORIGINALS)
+
+
+def snapshot():
+    """
+    Return current counters and timers summed up over all threads.
+
+    Returns
+    -------
+    meintile.instrumentation.Snapshot
+    """
+    counters, timers = {}, {}
+    with _LOCK:
+        for thread_counters, thread_timers in [_FINISHED_STATS] + list(
+            _THREAD_STATS.values()
+        ):
+            _merge(counters, timers, thread_counters, thread_timers)
+    return Snapshot(
+        counters=counters,
+        timers={name: Timing(*values) for name, values in timers.items()},
+    )
+
+
+def reset():
+    """Set all counters and timers back to zero."""
+    with _LOCK:
+        for thread_counters, thread_timers in [_FINISHED_STATS] + list(
+            _THREAD_STATS.values()
+        ):
+            thread_counters.clear()
+            thread_timers.clear()
+
+
+def add_hook(hook):
+    """
+    Register a function called on every counted or timed event.
+
+    The hook is called as hook(kind, name, value) with kind being "counter" (value is
+    the increment) or "timer" (value is the duration in seconds). Hooks run in the
+    calling thread and exceptions are propagated.
+
+    Parameters
+    ----------
+    hook : callable
+    """
+    with _LOCK:
+        _HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Unregister a hook function.
+
+    Parameters
+    ----------
+    hook : callable
+    """
+    with _LOCK:
+        _HOOKS.remove(hook)
+
+
+class _ThreadStats:
+    """Holds counters and timers of one thread, merged when the thread ends."""
+
+    __slots__ = ("counters", "timers", "__weakref__")
+
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}
+        with _LOCK:
+            key = next(_THREAD_KEYS)
+            _THREAD_STATS[key] = (self.counters, self.timers)
+        # thread local data is released when the thread ends
+        weakref.finalize(self, _finish_thread, key)
+
+
+def _finish_thread(key):
+    with _LOCK:
+        _merge(*_FINISHED_STATS, *_THREAD_STATS.pop(key))
+
+
+def _merge(counters, timers, other_counters, other_timers):
+    """Add other counters and timers to counters and timers, caller holds lock."""
+    for name, value in list(other_counters.items()):
+        counters[name] = counters.get(name, 0) + value
+    for name, (count, total, maximum) in list(other_timers.items()):
+        values = timers.setdefault(name, [0, 0.0, 0.0])
+        values[0] += count
+        values[1] += total
+        values[2] = max(values[2], maximum)
+
+
+def _stats():
+    """Return counters and timers of the current thread."""
+    try:
+        return _LOCAL.stats
+    except AttributeError:
+        holder = _LOCAL.holder = _ThreadStats()
+        stats = _LOCAL.stats = (holder.counters, holder.timers)
+        return stats
+
+
+def _count(name, value=1):
+    counters = _stats()[0]
+    counters[name] = counters.get(name, 0) + value
+    if _HOOKS:
+        for hook in list(_HOOKS):
+            hook("counter", name, value)
+
+
+def _time(name, elapsed):
+    timers = _stats()[1]
+    values = timers.get(name)
+    if values is None:
+        timers[name] = [1, elapsed, elapsed]
+    else:
+        values[0] += 1
+        values[1] += elapsed
+        if elapsed > values[2]:
+            values[2] = elapsed
+    if _HOOKS:
+        for hook in list(_HOOKS):
+            hook("timer", name, elapsed)
+
+
+def _wrap(original, counter, timer):
+    """Return counting and timing replacement of a function or classmethod."""
+    if isinstance(original, classmethod):
+        return classmethod(_wrap(original.__func__, counter, timer))
+
+    if timer is None:
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            _count(counter)
+            return original(*args, **kwargs)
+
+    else:
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            if counter is not None:
+                _count(counter)
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                _time(timer, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _wrap_cache_get(original):
+    @functools.wraps(original)
+    def get(self, key):
+        tile = original(self, key)
+        _count("tile_cache_misses" if tile is None else "tile_cache_hits")
+        return tile
+
+    return get
@@ -1,40 +1,39 @@
 import json
 import os
+import threading
 
 from meintile._types import ScaleSet
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 
+# Well-known scale sets and whether they are to be interpreted as global coverage.
+# Definitions are read from their JSON files on first use.
+WKSS_IS_GLOBAL = {
+    # Lambert Azimuthal Equal Area ETRS89 for Europe
+    "EuropeanETRS89_LAEAQuad": False,
+    # Google Maps Compatible for the World
+    "WebMercatorQuad": True,
+    # CRS84 for the World
+    "WorldCRS84Quad": True,
+    # World Mercator WGS84 (ellipsoid)
+    "WorldMercatorWGS84Quad": True,
+}
 
-def _load_json(wkss_json):
-    return json.load(open(os.path.join(SCRIPT_DIR, wkss_json)))
-
-
-# Lambert Azimuthal Equal Area ETRS89 for Europe
-EuropeanETRS89_LAEAQuad = _load_json("EuropeanETRS89_LAEAQuad.json")
-
-# Google Maps Compatible for the World
-WebMercatorQuad = _load_json("WebMercatorQuad.json")
-
-# CRS84 for the World
-WorldCRS84Quad = _load_json("WorldCRS84Quad.json")
-
-# World Mercator WGS84 (ellipsoid)
-WorldMercatorWGS84Quad = _load_json("WorldMercatorWGS84Quad.json")
+_WKSS_CACHE = {}
+_WKSS_LOCK = threading.Lock()
 
 
-WKSS_BY_NAME = {
-    "EuropeanETRS89_LAEAQuad": ScaleSet(EuropeanETRS89_LAEAQuad, False),
-    "WebMercatorQuad": ScaleSet(WebMercatorQuad, True),
-    "WorldCRS84Quad": ScaleSet(WorldCRS84Quad, True),
-    "WorldMercatorWGS84Quad": ScaleSet(WorldMercatorWGS84Quad, True),
-}
+def _load_json(wkss_json):
+    with open(os.path.join(SCRIPT_DIR, wkss_json)) as src:
+        return json.load(src)
 
 
 def get_wkss(wkss_identifier):
     """
     Return well-known scale set by name as ScaleSetDefinition object.
 
+    The definition is loaded on first request and cached afterwards.
+
     Parameters
     ----------
     wkss_identifier : str
@@ -48,4 +47,22 @@ def get_wkss(wkss_identifier):
     -------
     meintile.ScaleSetDefinition
     """
-    return WKSS_BY_NAME[wkss_identifier]
+    try:
+        return _WKSS_CACHE[wkss_identifier]
+    except KeyError:
+        is_global = WKSS_IS_GLOBAL[wkss_identifier]
+        with _WKSS_LOCK:
+            if wkss_identifier not in _WKSS_CACHE:
+                _WKSS_CACHE[wkss_identifier] = ScaleSet(
+                    _load_json("{}.json".format(wkss_identifier)), is_global
+                )
+        return _WKSS_CACHE[wkss_identifier]
+
+
+def __getattr__(name):
+    """Provide scale set definitions and WKSS_BY_NAME as module attributes."""
+    if name in WKSS_IS_GLOBAL:
+        return get_wkss(name).definition
+    elif name == "WKSS_BY_NAME":
+        return {i: get_wkss(i) for i in WKSS_IS_GLOBAL}
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,70 @@
+import math
+from collections import OrderedDict
+from rasterio.crs import CRS
+
+from meintile import TilePyramid
+from meintile import _crs
+from meintile._crs import crs_info, transformer
+
+
+def test_crs_info():
+    info = crs_info("http://www.opengis.net/def/crs/EPSG/0/3857")
+    assert info.string == "EPSG:3857"
+    assert info.meters_per_unit == 1.0
+    assert not info.is_geographic
+    # cached by value
+    assert crs_info("http://www.opengis.net/def/crs/EPSG/0/3857") is info
+    # resolved CRS object is cached by identity
+    assert crs_info(info.crs) is info
+
+    info = crs_info("http://www.opengis.net/def/crs/OGC/1.3/CRS84")
+    assert info.is_geographic
+    assert info.meters_per_unit == 2 * math.pi * 6378137 / 360.0
+    assert crs_info(4326).is_geographic
+
+    # other CRS objects
+    crs = CRS.from_epsg(3035)
+    info = crs_info(crs)
+    assert info.crs is crs
+    assert crs_info(crs) is info
+    assert crs_info(CRS.from_epsg(3035)) is not info
+
+
+def test_crs_info_cache_size(monkeypatch):
+    monkeypatch.setattr(_crs, "_CRS_CACHE", OrderedDict())
+    monkeypatch.setattr(_crs, "_CRS_OBJECTS", OrderedDict())
+    monkeypatch.setattr(_crs, "_MAX_CRS_VALUES", 2)
+    monkeypatch.setattr(_crs, "_MAX_CRS_OBJECTS", 2)
+    # caches are bounded and evict least recently used entries
+    first = crs_info(3857)
+    second = crs_info(4326)
+    assert crs_info(3857) is first
+    crs_info(3035)
+    assert list(_crs._CRS_CACHE) == [3857, 3035]
+    assert crs_info(4326) is not second
+    assert len(_crs._CRS_CACHE) == len(_crs._CRS_OBJECTS) == 2
+
+    crs = CRS.from_epsg(32633)
+    info = crs_info(crs)
+    crs_info(3857)
+    assert crs_info(crs) is info
+    crs_info(3035)
+    assert list(_crs._CRS_OBJECTS) == [id(crs), id(crs_info(3035).crs)]
+
+
+def test_shared_crs():
+    for wkss, crs_str in [
+        ("WebMercatorQuad", "EPSG:3857"),
+        ("WorldCRS84Quad", "OGC:CRS84"),
+    ]:
+        tp = TilePyramid.from_wkss(wkss)
+        assert all(tm.crs is tp.crs for tm in tp)
+        assert tp.crs_str == tp.to_dict()["supportedCRS"]
+        assert repr(tp[0]) == "TileMatrix(id=0, crs={})".format(crs_str)
+
+
+def test_transformer():
+    assert transformer(3857, "OGC:CRS84") is transformer(3857, "OGC:CRS84")
+    assert transformer(3857, "OGC:CRS84") is not transformer("OGC:CRS84", 3857)
+    x, y = transformer(3857, "OGC:CRS84").transform(20037508.342789244, 0)
+    assert math.isclose(x, 180) and math.isclose(y, 0, abs_tol=1e-9)
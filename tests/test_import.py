@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+from meintile import wkss
+
+
+def _run(code):
+    return subprocess.check_output([sys.executable, "-c", code]).decode().strip()
+
+
+def test_deferred_imports():
+    # importing meintile does not import rasterio or shapely
+    assert (
+        _run(
+            "import sys, meintile; "
+            "print(sorted(m for m in ['rasterio', 'shapely'] if m in sys.modules))"
+        )
+        == "[]"
+    )
+    # but constructing a TilePyramid and tile geometries does
+    assert (
+        _run(
+            "import sys, meintile; "
+            "meintile.TilePyramid.from_wkss('WebMercatorQuad').tile(0, 0, 0).bbox; "
+            "print(sorted(m for m in ['rasterio', 'shapely'] if m in sys.modules))"
+        )
+        == "['rasterio', 'shapely']"
+    )
+
+
+def test_lazy_wkss():
+    # only WebMercatorQuad is loaded
+    assert (
+        _run(
+            "from meintile.wkss import _WKSS_CACHE, get_wkss; "
+            "get_wkss('WebMercatorQuad'); print(sorted(_WKSS_CACHE))"
+        )
+        == "['WebMercatorQuad']"
+    )
+    # definitions are cached
+    assert wkss.get_wkss("WorldCRS84Quad") is wkss.get_wkss("WorldCRS84Quad")
+    # module attributes
+    assert wkss.WorldCRS84Quad is wkss.get_wkss("WorldCRS84Quad").definition
+    assert wkss.WKSS_BY_NAME["WebMercatorQuad"].is_global
@@ -0,0 +1,83 @@
+import threading
+
+from meintile import Tile, TilePyramid, instrumentation
+from meintile.instrumentation import Snapshot, Timing
+
+
+def test_instrumentation():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    original = Tile.__init__
+    assert not instrumentation.is_enabled()
+    instrumentation.enable()
+    try:
+        instrumentation.enable()
+        assert instrumentation.is_enabled()
+        instrumentation.reset()
+        tile = tp.tile(5, 5, 5)
+        tile.get_children()
+        tile.get_neighbors()
+        snapshot = instrumentation.snapshot()
+        assert isinstance(snapshot, Snapshot)
+        assert snapshot.counters["tiles_created"] == 1 + 4 + 8
+        timing = snapshot.timers["TileMatrixSet.tile"]
+        assert isinstance(timing, Timing)
+        assert timing.count == 1
+        assert 0 <= timing.max <= timing.total
+        assert snapshot.timers["Tile.get_children"].count == 1
+        assert snapshot.timers["Tile.get_neighbors"].count == 1
+
+        # counters of all threads are summed up
+        instrumentation.reset()
+        threads = [
+            threading.Thread(target=lambda: [tp.tile(3, 1, 1) for _ in range(100)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert instrumentation.snapshot().counters == {"tiles_created": 400}
+        # stats of finished threads are merged and released
+        assert len(instrumentation._THREAD_STATS) == 1
+
+        instrumentation.reset()
+        assert instrumentation.snapshot() == Snapshot(counters={}, timers={})
+    finally:
+        instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    assert Tile.__init__ is original
+    # nothing is counted while disabled
+    tp.tile(5, 5, 5)
+    assert instrumentation.snapshot() == Snapshot(counters={}, timers={})
+
+
+def test_instrumentation_hooks():
+    events = []
+
+    def hook(kind, name, value):
+        events.append((kind, name))
+
+    instrumentation.add_hook(hook)
+    instrumentation.enable()
+    try:
+        # a tile cache size not used elsewhere so the pyramid is not interned yet
+        tm = TilePyramid.from_wkss("WebMercatorQuad", tile_cache_size=17)[3]
+        tm.tile(1, 1)
+        tm.tile(1, 1)
+        assert ("counter", "tile_matrices_created") in events
+        assert ("timer", "TileMatrix.__init__") in events
+        assert events.count(("counter", "tile_cache_misses")) == 1
+        assert events.count(("counter", "tile_cache_hits")) == 1
+        assert events.count(("counter", "tiles_created")) == 1
+    finally:
+        instrumentation.remove_hook(hook)
+        instrumentation.disable()
+
+    del events[:]
+    instrumentation.enable()
+    try:
+        tm.tile(1, 2)
+        assert not events
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
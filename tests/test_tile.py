@@ -1,7 +1,9 @@
+import pickle
 import pytest
 import tilematrix
 
-from meintile import TilePyramid
+from meintile import Tile, TileMatrix, TilePyramid, TileRange
+from meintile.exceptions import InvalidTileMatrixIndex
 
 
 def _round_tuple(t, r):
@@ -134,3 +136,254 @@ def test_magic_methods():
     assert hash(tile)
     for i in tile:
         assert i == 5
+
+
+def test_lazy_attributes():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile = tp.tile(5, 5, 5)
+    assert not hasattr(tile, "__dict__")
+
+    # aliases
+    assert tile.tm is tile.tile_matrix
+    assert tile.tp is tile.tile_pyramid is tp
+    assert tile.id == tile.index == (5, 5, 5)
+    assert tile.zoom == 5
+
+    # geometry is computed once and cached
+    assert tile.bounds is tile.bounds
+    assert tile.bbox is tile.bbox
+    assert tile.affine is tile.affine
+    assert tile.bbox.bounds == tile.bounds
+    assert (tile.left, tile.bottom, tile.right, tile.top) == tile.bounds
+    assert tile.x_size == tile.right - tile.left
+    assert tile.y_size == tile.top - tile.bottom
+    assert tile.shape == (tile.height, tile.width) == (256, 256)
+    assert tile.affine.c == tile.left
+    assert tile.affine.f == tile.top
+    assert tile.affine.a == tile.pixel_x_size == -tile.pixel_y_size
+
+
+def test_equality_ordering():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile = tp.tile(5, 5, 5)
+    same = tp.tile(5, 5, 5)
+    assert tile is not same
+    assert tile == same
+    assert hash(tile) == hash(same)
+    assert len({tile, same}) == 1
+    assert tile != tp.tile(5, 5, 6)
+    assert tile != tp.tile(4, 5, 5)
+    assert tile != (5, 5, 5)
+
+    # tiles of other Tile Matrix Sets are not equal
+    other = TilePyramid.from_wkss("WebMercatorQuad", tile_cache_size=10).tile(5, 5, 5)
+    assert tile != other
+    assert len({tile, other}) == 2
+
+    # ordering
+    tiles = [tp.tile(5, 5, 6), tp.tile(4, 0, 0), tp.tile(5, 5, 5), tp.tile(5, 4, 9)]
+    assert [t.id for t in sorted(tiles)] == [
+        (4, 0, 0),
+        (5, 4, 9),
+        (5, 5, 5),
+        (5, 5, 6),
+    ]
+    assert tp.tile(4, 0, 0) < tile <= same
+    with pytest.raises(TypeError):
+        tile < (5, 5, 5)
+
+
+def test_ancestors_descendants():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile = tp.tile(5, 10, 20)
+
+    descendants = tile.get_descendants(8)
+    assert isinstance(descendants, TileRange)
+    assert descendants.zoom == 8
+    assert len(descendants) == 64
+    assert descendants.rows == range(80, 88)
+    assert descendants.cols == range(160, 168)
+    assert tp.tile(8, 80, 160) in descendants
+    assert (8, 87, 167) in descendants
+    assert (8, 88, 167) not in descendants
+    assert (7, 87, 167) not in descendants
+    assert TilePyramid.from_wkss("WorldMercatorWGS84Quad").tile(8, 80, 160) not in (
+        descendants
+    )
+    assert _round_tuple(descendants.bounds, 6) == _round_tuple(tile.bounds, 6)
+    tiles = list(descendants)
+    assert len(tiles) == len(set(tiles)) == 64
+    for descendant in tiles:
+        assert descendant.get_ancestor(5) == tile
+
+    # tile itself
+    assert list(tile.get_descendants(5)) == [tile]
+    assert tile.get_ancestor(5) == tile
+    # children are descendants of next zoom level
+    assert set(tile.get_children()) == set(tile.get_descendants(6))
+    assert tile.get_ancestor(4) == tile.get_parent()
+    assert tile.get_ancestor(0).id == (0, 0, 0)
+
+    with pytest.raises(ValueError):
+        tile.get_descendants(4)
+    with pytest.raises(ValueError):
+        tile.get_ancestor(6)
+    with pytest.raises(InvalidTileMatrixIndex):
+        tile.get_descendants(30)
+
+
+def test_neighbors_radius():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile = tp.tile(5, 10, 10)
+    # radius 1 keeps order of direct neighbors
+    assert [t.id[1:] for t in tile.get_neighbors(connectedness=4)] == [
+        (9, 10),
+        (10, 11),
+        (11, 10),
+        (10, 9),
+    ]
+    # square and diamond rings
+    neighbors = tile.get_neighbors(radius=2)
+    assert len(neighbors) == 24
+    assert {t.id[1:] for t in neighbors[:8]} == {t.id[1:] for t in tile.get_neighbors()}
+    neighbors = tile.get_neighbors(connectedness=4, radius=2)
+    assert len(neighbors) == 12
+    for neighbor in neighbors:
+        assert abs(neighbor.row - 10) + abs(neighbor.col - 10) <= 2
+    assert tile.get_neighbors(radius=0) == []
+    with pytest.raises(ValueError):
+        tile.get_neighbors(radius=-1)
+
+    # clip at poles and wrap around antimeridian without duplicates
+    tile = tp.tile(2, 0, 0)
+    neighbors = [t.id[1:] for t in tile.get_neighbors(radius=3)]
+    assert len(neighbors) == len(set(neighbors)) == 4 * 4 - 1
+    assert (0, 3) in neighbors
+
+    # non global pyramids are clipped
+    tile = TilePyramid.from_wkss("EuropeanETRS89_LAEAQuad").tile(2, 0, 0)
+    assert {t.id[1:] for t in tile.get_neighbors(radius=2)} == {
+        (0, 1),
+        (0, 2),
+        (1, 0),
+        (1, 1),
+        (1, 2),
+        (2, 0),
+        (2, 1),
+        (2, 2),
+    }
+
+
+def test_pixelbuffer():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    reference = tilematrix.TilePyramid("mercator")
+    for zoom, row, col in [(0, 0, 0), (3, 0, 0), (3, 4, 7), (3, 7, 3)]:
+        for pixelbuffer in [0, 1, 10]:
+            tile = tp.tile(zoom, row, col, pixelbuffer=pixelbuffer)
+            reference_tile = reference.tile(zoom, row, col)
+            assert _round_tuple(tile.bounds, 6) == _round_tuple(
+                reference_tile.bounds(pixelbuffer), 6
+            )
+            assert tile.shape == reference_tile.shape(pixelbuffer)
+            assert (tile.height, tile.width) == tile.shape
+            assert tile.affine.c == tile.left
+            assert tile.affine.f == tile.top
+
+    # extend over antimeridian but not over poles
+    tile = tp.tile(3, 0, 0, pixelbuffer=5)
+    assert tile.left < tp[3].left
+    assert tile.top == tp[3].top
+    assert tile.shape == (256 + 5, 256 + 10)
+
+    # non global pyramids are not clipped
+    tile = TilePyramid.from_wkss("EuropeanETRS89_LAEAQuad").tile(3, 0, 0, pixelbuffer=5)
+    assert tile.shape == (256 + 10, 256 + 10)
+    assert tile.top > tile.tm.top
+
+    # pixelbuffer is part of tile identity and propagated to related tiles
+    tile = tp.tile(3, 4, 4, pixelbuffer=2)
+    assert tile != tp.tile(3, 4, 4)
+    assert tile > tp.tile(3, 4, 4)
+    assert len({tile, tp.tile(3, 4, 4), tp.tile(3, 4, 4, pixelbuffer=2)}) == 2
+    assert tile.get_parent().pixelbuffer == 2
+    assert {t.pixelbuffer for t in tile.get_children()} == {2}
+    assert {t.pixelbuffer for t in tile.get_neighbors()} == {2}
+    assert {t.pixelbuffer for t in tile.get_descendants(5)} == {2}
+    descendants = tile.get_descendants(5)
+    descendant = next(iter(descendants))
+    assert descendant in descendants
+    assert tp.tile(*descendant.id) not in descendants
+    assert descendant.id in descendants
+    assert "pixelbuffer=2" in repr(tile)
+
+    with pytest.raises(ValueError):
+        tp.tile(3, 4, 4, pixelbuffer=-1)
+    # invalid arguments do not leave a partly initialized object
+    partial = Tile.__new__(Tile)
+    with pytest.raises(ValueError):
+        partial.__init__(tp[3], 4, 4, pixelbuffer=-1)
+    assert not hasattr(partial, "row")
+
+
+def test_pickle():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile = tp.tile(5, 3, 4, pixelbuffer=2)
+    tile.bounds
+    unpickled = pickle.loads(pickle.dumps(tile))
+    assert unpickled == tile
+    assert unpickled.tp is tp
+    assert unpickled.pixelbuffer == 2
+    assert unpickled.bounds == tile.bounds
+    # only the WKSS identifier and tile index are pickled
+    assert len(pickle.dumps(tile)) < 200
+
+    # custom Tile Matrix Sets are pickled by definition
+    definition = tp.to_dict()
+    definition.update(identifier="custom")
+    custom = TilePyramid.from_dict(definition)
+    assert pickle.loads(pickle.dumps(custom.tile(2, 1, 1))).tp is custom
+
+    # directly constructed Tile Matrix Sets are interned when pickled
+    direct = TilePyramid(
+        crs=tp.crs_str,
+        tile_matrix_params=[
+            dict(
+                identifier=tm.id,
+                scale_denominator=tm.scale_denominator,
+                top_left_corner=tm.top_left_corner,
+                tile_width=tm.tile_width,
+                tile_height=tm.tile_height,
+                matrix_width=tm.width,
+                matrix_height=tm.height,
+            )
+            for tm in tp
+        ],
+        is_global=True,
+        identifier="direct",
+    )
+    tile = direct.tile(3, 1, 2)
+    unpickled = pickle.loads(pickle.dumps(tile))
+    assert unpickled == tile
+    assert unpickled.tp is direct
+
+    # referenced Tile Matrix Sets are not evicted from the registry
+    tile = tp.tile(3, 1, 2)
+    for i in range(70):
+        definition.update(identifier="custom{}".format(i))
+        TilePyramid.from_dict(definition)
+    assert pickle.loads(pickle.dumps(tile)) == tile
+
+    # standalone Tile Matrix
+    tile_matrix = TileMatrix(
+        identifier=1,
+        crs="EPSG:3857",
+        scale_denominator=tp[1].scale_denominator,
+        top_left_corner=tp[1].top_left_corner,
+        tile_width=256,
+        tile_height=256,
+        matrix_width=2,
+        matrix_height=2,
+    )
+    tile = pickle.loads(pickle.dumps(tile_matrix.tile(1, 1)))
+    assert tile.tp is None
+    assert tile.bounds == tp.tile(1, 1, 1).bounds
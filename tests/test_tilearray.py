@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from meintile import Bounds, TileArray, TilePyramid
+from meintile.exceptions import InvalidTileIndex, InvalidTileMatrixIndex
+
+
+def _random_tile_array(tp, count, pixelbuffer=0):
+    rng = np.random.default_rng(0)
+    zooms = rng.integers(1, 6, count)
+    heights = np.array([tp[zoom].height for zoom in zooms.tolist()])
+    widths = np.array([tp[zoom].width for zoom in zooms.tolist()])
+    rows = (rng.random(count) * heights).astype(np.int64)
+    cols = (rng.random(count) * widths).astype(np.int64)
+    return TileArray(tp, zooms, rows, cols, pixelbuffer=pixelbuffer)
+
+
+def test_tilearray():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    rows = np.arange(8)
+    tile_array = TileArray(tp, 3, rows, rows[::-1])
+    assert len(tile_array) == 8
+    # input arrays are not copied
+    assert np.shares_memory(tile_array.rows, rows)
+    assert rows.flags.writeable
+    with pytest.raises(ValueError):
+        tile_array.rows[0] = 1
+    assert tile_array[0].id == (3, 0, 7)
+    assert tile_array[-1].id == (3, 7, 0)
+    assert [t.id for t in tile_array] == [(3, i, 7 - i) for i in range(8)]
+    assert tile_array[0] == tp.tile(3, 0, 7)
+
+    # slices are views, masks and positions select copies
+    part = tile_array[2:5]
+    assert np.shares_memory(part.rows, tile_array.rows)
+    assert [t.id for t in part] == [(3, i, 7 - i) for i in range(2, 5)]
+    assert [t.id for t in tile_array[tile_array.rows > 5]] == [(3, 6, 1), (3, 7, 0)]
+    assert [t.id for t in tile_array[[1, 0]]] == [(3, 1, 6), (3, 0, 7)]
+
+    assert [t.id for t in TileArray.from_tiles(tp, [tp.tile(3, 1, 2), (4, 3, 4)])] == [
+        (3, 1, 2),
+        (4, 3, 4),
+    ]
+    assert [t.id for t in TileArray.from_bounds(tp, tp[1].bounds, 1)] == [
+        (1, 0, 0),
+        (1, 0, 1),
+        (1, 1, 0),
+        (1, 1, 1),
+    ]
+    assert len(TileArray.from_tiles(tp, [])) == 0
+
+    with pytest.raises(InvalidTileIndex):
+        TileArray(tp, 3, [0], [8])
+    with pytest.raises(InvalidTileMatrixIndex):
+        TileArray(tp, 30, [0], [0])
+    with pytest.raises(ValueError):
+        TileArray.from_tiles(
+            tp, [TilePyramid.from_wkss("WorldCRS84Quad").tile(0, 0, 0)]
+        )
+
+
+def test_tilearray_hierarchy():
+    for wkss in ["WebMercatorQuad", "WorldCRS84Quad"]:
+        tp = TilePyramid.from_wkss(wkss)
+        for pixelbuffer in [0, 2]:
+            tile_array = _random_tile_array(tp, 500, pixelbuffer=pixelbuffer)
+            tiles = list(tile_array)
+            parents = tile_array.parents()
+            assert list(parents) == [t.get_parent() for t in tiles]
+            children = tile_array.children()
+            assert list(children) == [c for t in tiles for c in t.get_children()]
+            assert children.pixelbuffer == pixelbuffer
+    with pytest.raises(InvalidTileMatrixIndex):
+        TileArray(tp, 0, [0], [0]).parents()
+
+
+def test_tilearray_sort_unique():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile_array = _random_tile_array(tp, 1000)
+    ids = [t.id for t in tile_array]
+    assert [t.id for t in tile_array.sort()] == sorted(ids)
+    assert [t.id for t in tile_array.unique()] == sorted(set(ids))
+    for order in ["morton", "hilbert"]:
+        sorted_array = tile_array.sort(order=order)
+        assert sorted([t.id for t in sorted_array]) == sorted(ids)
+        assert (np.diff(sorted_array.zooms) >= 0).all()
+    # single zoom level orders match TileMatrix.tiles_from_bounds()
+    bounds = (-1e7, -5e6, 5e6, 1e7)
+    tile_array = TileArray.from_bounds(tp, bounds, 4)[::-1]
+    for order in ["row", "morton", "hilbert"]:
+        assert list(tile_array.sort(order=order)) == list(
+            tp[4].tiles_from_bounds(bounds, order=order)
+        )
+    with pytest.raises(ValueError):
+        tile_array.sort(order="random")
+
+
+def test_tilearray_bounds():
+    for wkss in ["WebMercatorQuad", "EuropeanETRS89_LAEAQuad"]:
+        tp = TilePyramid.from_wkss(wkss)
+        for pixelbuffer in [0, 5]:
+            tile_array = _random_tile_array(tp, 200, pixelbuffer=pixelbuffer)
+            bounds = tile_array.bounds()
+            assert isinstance(bounds, Bounds)
+            for i, tile in enumerate(tile_array):
+                assert tuple(values[i] for values in bounds) == tile.bounds
+
+
+def test_tilearray_concatenate():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile_array = _random_tile_array(tp, 100)
+    joined = TileArray.concatenate([tile_array[:30], tile_array[30:]])
+    assert list(joined) == list(tile_array)
+    assert TileArray.concatenate([tile_array, tile_array[:0]]) is tile_array
+    with pytest.raises(ValueError):
+        TileArray.concatenate([tile_array, _random_tile_array(tp, 10, pixelbuffer=1)])
+    with pytest.raises(ValueError):
+        TileArray.concatenate([])
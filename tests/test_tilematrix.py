@@ -1,4 +1,14 @@
+from affine import Affine
+import math
+import numpy as np
+import pytest
+import tilematrix
+import types
+
 from meintile import TilePyramid
+from meintile._global import PRECISION
+from meintile._tilematrix import _round_array
+from meintile.exceptions import InvalidTileIndex
 
 
 def test_web_mercator_pixel_sizes(web_mercator_pixel_sizes):
@@ -13,6 +23,14 @@ def test_web_mercator_matrix_bounds(web_mercator_bounds):
         assert tm.bounds == web_mercator_bounds
 
 
+def test_web_mercator_matrix_bounds_from_top_left_corner(web_mercator_bounds):
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    for tm in tp:
+        assert tuple(round(i, 6) for i in tm.matrix_bounds) == tuple(
+            round(i, 6) for i in web_mercator_bounds
+        )
+
+
 def test_crs84_pixel_sizes(crs84_pixel_sizes):
     tp = TilePyramid.from_wkss("WorldCRS84Quad")
     for i in range(len(tp)):
@@ -23,3 +41,306 @@ def test_crs84_matrix_bounds(crs84_bounds):
     tp = TilePyramid.from_wkss("WorldCRS84Quad")
     for tm in tp:
         assert tm.bounds == crs84_bounds
+
+
+def test_tile_geometries():
+    tm = TilePyramid.from_wkss("WebMercatorQuad")[5]
+    rows = np.array([0, 5, 31, 32, -1])
+    cols = np.array([0, 7, 31, 0, 0])
+    geometries = tm.tile_geometries(rows, cols)
+    assert geometries.valid.tolist() == [True, True, True, False, False]
+    for i, (row, col) in enumerate(zip(rows[:3], cols[:3])):
+        tile = tm.tile(int(row), int(col))
+        assert tile.bounds == (
+            geometries.left[i],
+            geometries.bottom[i],
+            geometries.right[i],
+            geometries.top[i],
+        )
+        affine = tile.affine
+        assert geometries.affine[i].tolist() == [
+            affine.a,
+            affine.b,
+            affine.c,
+            affine.d,
+            affine.e,
+            affine.f,
+        ]
+    assert np.isnan(geometries.left[3:]).all()
+    assert np.isnan(geometries.affine[3:]).all()
+
+    with pytest.raises(InvalidTileIndex):
+        tm.tile_geometries([0.5], [0])
+    # empty batches
+    geometries = tm.tile_geometries([], [])
+    assert geometries.valid.shape == geometries.left.shape == (0,)
+    with pytest.raises(ValueError):
+        tm.tile_geometries(rows, cols, pixelbuffer=-1)
+
+    # buffered geometries match Tile attributes, also at first and last rows
+    for wkss in ["WebMercatorQuad", "EuropeanETRS89_LAEAQuad"]:
+        tm = TilePyramid.from_wkss(wkss)[3]
+        rows, cols = np.indices((tm.height, tm.width))
+        geometries = tm.tile_geometries(rows, cols, pixelbuffer=3)
+        for row, col in zip(rows.ravel().tolist(), cols.ravel().tolist()):
+            tile = tm.tile(row, col, pixelbuffer=3)
+            assert tile.bounds == tuple(values[row, col] for values in geometries[1:5])
+            assert geometries.affine[row, col, 2] == tile.affine.c
+            assert geometries.affine[row, col, 5] == tile.affine.f
+
+
+def test_round_array():
+    rng = np.random.default_rng(0)
+    ties = (rng.integers(-(10 ** 15), 10 ** 15, 10000) + 0.5) / 10.0 ** PRECISION
+    values = np.concatenate(
+        [
+            rng.uniform(-1, 1, 100000),
+            rng.uniform(-1e-6, 1e-6, 10000),
+            rng.uniform(-1e6, 1e6, 10000),
+            # coordinates of WorldCRS84Quad tiles near the origin
+            (np.arange(-5000, 5000) * 180 / 2 ** 18),
+            ties,
+            np.nextafter(ties, 1),
+            np.nextafter(ties, -1),
+            [0.5, -0.0, 1e-300, np.inf, np.nan],
+        ]
+    )
+    expected = [round(value, PRECISION) for value in values.tolist()]
+    rounded = _round_array(values.copy())
+    assert np.array_equal(rounded, expected, equal_nan=True)
+    assert np.array_equal(np.signbit(rounded), np.signbit(expected))
+
+
+def _raster_window(tile, affine, shape):
+    left, bottom, right, top = tile.bounds
+    col_start = max(math.floor(round((left - affine.c) / affine.a, 9)), 0)
+    col_stop = min(math.ceil(round((right - affine.c) / affine.a, 9)), shape[1])
+    row_start = max(math.floor(round((top - affine.f) / affine.e, 9)), 0)
+    row_stop = min(math.ceil(round((bottom - affine.f) / affine.e, 9)), shape[0])
+    if col_stop <= col_start or row_stop <= row_start:
+        return None
+    return (col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+
+def test_raster_windows():
+    tm = TilePyramid.from_wkss("WebMercatorQuad")[10]
+    affine = Affine(37.2, 0, -2e6 + 13.3, 0, -41.7, 3e6 - 7.1)
+    shape = (9000, 11000)
+    for pixelbuffer in [0, 7]:
+        windows = tm.raster_windows(
+            affine, shape, bounds=(-3e6, -1e6, 0, 4e6), pixelbuffer=pixelbuffer
+        )
+        assert windows.valid.any() and not windows.valid.all()
+        assert windows.reads is None
+        for i, (row, col) in enumerate(zip(windows.rows, windows.cols)):
+            expected = _raster_window(
+                tm.tile(int(row), int(col), pixelbuffer), affine, shape
+            )
+            if windows.valid[i]:
+                assert expected == (
+                    windows.col_off[i],
+                    windows.row_off[i],
+                    windows.width[i],
+                    windows.height[i],
+                )
+            else:
+                assert expected is None
+                assert windows.width[i] == windows.height[i] == 0
+        assert np.allclose(windows.x_scale[windows.valid], tm.pixel_x_size / 37.2)
+        assert np.allclose(windows.y_scale[windows.valid], tm.pixel_x_size / 41.7)
+
+    # coalesced reads cover exactly the tile windows
+    rows, cols = np.indices((4, 4))
+    rows, cols = rows.ravel()[1:] + 436, cols.ravel()[1:] + 462
+    windows = tm.raster_windows(affine, shape, rows, cols, coalesce=2)
+    assert windows.valid.all()
+    assert len(windows.reads) == 5
+    tile_pixels = np.zeros(shape, dtype=bool)
+    read_pixels = np.zeros(shape, dtype=bool)
+    for i, read in enumerate(windows.read_index):
+        col_off, row_off, width, height = windows.reads[read]
+        assert col_off <= windows.col_off[i]
+        assert windows.col_off[i] + windows.width[i] <= col_off + width
+        assert row_off <= windows.row_off[i]
+        assert windows.row_off[i] + windows.height[i] <= row_off + height
+        tile_pixels[
+            windows.row_off[i] : windows.row_off[i] + windows.height[i],
+            windows.col_off[i] : windows.col_off[i] + windows.width[i],
+        ] = True
+    for col_off, row_off, width, height in windows.reads:
+        read_pixels[row_off : row_off + height, col_off : col_off + width] = True
+    assert (tile_pixels == read_pixels).all()
+
+    with pytest.raises(ValueError):
+        tm.raster_windows(affine, shape)
+    with pytest.raises(ValueError):
+        tm.raster_windows(affine, shape, [0], [0], coalesce=0)
+    with pytest.raises(ValueError):
+        tm.raster_windows(Affine(1, 0.5, 0, 0, -1, 0), shape, [0], [0])
+
+
+def test_tiles_from_bounds():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tp_ref = tilematrix.TilePyramid("mercator")
+    for bounds in [
+        (-1000000, -1000000, 1000000, 1000000),
+        # over antimeridian
+        (-22000000, 0, -19000000, 1000000),
+        (19000000, -5000000, 21000000, 100000),
+        # point
+        (10, 10, 10, 10),
+        # exceeding tile matrix
+        (-30000000, -30000000, 30000000, 30000000),
+    ]:
+        for zoom in range(9):
+            tiles = list(tp[zoom].tiles_from_bounds(bounds))
+            assert len(tiles) == len(set(t.id for t in tiles))
+            assert set(t.id for t in tiles) == set(
+                tuple(t.id) for t in tp_ref.tiles_from_bounds(bounds, zoom)
+            )
+
+    # tiles only touching bounds are omitted
+    tile = tp.tile(5, 10, 10)
+    assert [t.id for t in tp[5].tiles_from_bounds(tile.bounds)] == [tile.id]
+
+    # generator on deep zoom level
+    tiles = tp[24].tiles_from_bounds(tp.bounds)
+    assert isinstance(tiles, types.GeneratorType)
+    assert next(tiles).id == (24, 0, 0)
+
+    # don't wrap around antimeridian on non-global scale set
+    tp = TilePyramid.from_wkss("EuropeanETRS89_LAEAQuad")
+    tiles = list(tp[2].tiles_from_bounds((0, 4000000, 3500000, 6000000)))
+    assert set(t.id for t in tiles) == {(2, 0, 0), (2, 0, 1), (2, 1, 0), (2, 1, 1)}
+
+    with pytest.raises(ValueError):
+        list(tp[2].tiles_from_bounds((1, 0, 0, 1)))
+
+
+def test_tile_from_xy():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tp_ref = tilematrix.TilePyramid("mercator")
+    points = [(1234567.89, -7654321.0), (0, 0), (-20037508.3427892, 20037508.3427892)]
+    # points on tile borders
+    points.extend(
+        (t.left, t.top) for t in tp[6].tiles_from_bounds((-1000000, 0, 0, 1000000))
+    )
+    xs, ys = np.array(points).T
+    for zoom in [0, 3, 6, 12]:
+        tm = tp[zoom]
+        rows, cols = tm.indexes_from_xy(xs, ys)
+        for (x, y), row, col in zip(points, rows, cols):
+            tile = tm.tile_from_xy(x, y)
+            assert tile.id == (zoom, row, col)
+            assert tile.id == tuple(
+                tp_ref.tile_from_xy(x, y, zoom, on_edge_use="rb").id
+            )
+
+    # right and bottom matrix edge
+    tm = tp[3]
+    assert tm.tile_from_xy(0, -20037508.3427892).id == (3, 7, 4)
+    # wrap around antimeridian
+    assert tm.tile_from_xy(20037508.3427892, 0).id == (3, 4, 0)
+    assert tm.tile_from_xy(-20037508.3427892 - 1, 0).id == (3, 4, 7)
+    with pytest.raises(ValueError):
+        tm.tile_from_xy(0, 30000000)
+    rows, cols = tm.indexes_from_xy([0, 20037508.3427892], [30000000, 0])
+    assert rows.tolist() == [-1, 4]
+    assert cols.tolist() == [-1, 0]
+
+    # don't wrap around antimeridian on non-global scale set
+    tm = TilePyramid.from_wkss("EuropeanETRS89_LAEAQuad")[2]
+    assert tm.tile_from_xy(6500000, 1000000).id == (2, 3, 3)
+    with pytest.raises(ValueError):
+        tm.tile_from_xy(0, 3000000)
+    rows, cols = tm.indexes_from_xy([0, 3000000], [3000000, 3000000])
+    assert rows.tolist() == [-1, 2]
+    assert cols.tolist() == [-1, 0]
+
+
+def test_tile_cache():
+    tp = TilePyramid.from_wkss("WebMercatorQuad", tile_cache_size=4)
+    tm = tp[5]
+    assert tm.cache_info() == (0, 0, 4, 0)
+    tile = tm.tile(1, 2)
+    assert tm.tile(1, 2) is tile
+    assert tp.tile(5, 1, 2) is tile
+    assert tm.cache_info() == (2, 1, 4, 1)
+    # tiles with pixelbuffer are cached separately
+    assert tm.tile(1, 2, pixelbuffer=2) is not tile
+    assert tm.tile(1, 2, pixelbuffer=2) is tm.tile(1, 2, pixelbuffer=2)
+    assert tm.cache_info() == (4, 2, 4, 2)
+
+    # least recently used tile gets evicted
+    for col in range(3, 8):
+        tm.tile(1, col)
+    assert tm.cache_info().currsize == 4
+    assert tm.tile(1, 2) is not tile
+
+    # invalid indexes are not cached
+    with pytest.raises(InvalidTileIndex):
+        tm.tile(100, 0)
+    assert tm.cache_info().currsize == 4
+
+    tm.cache_clear()
+    assert tm.cache_info() == (0, 0, 4, 0)
+
+    # no cache
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    assert tp[5].tile(1, 2) is not tp[5].tile(1, 2)
+    assert tp[5].cache_info() == (0, 0, 0, 0)
+
+
+def test_tiles_from_bounds_order():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tm = tp[6]
+    # window of 16x16 tiles aligned to the curves
+    bounds = (
+        tm.tile(16, 16).left,
+        tm.tile(31, 31).bottom,
+        tm.tile(31, 31).right,
+        tm.tile(16, 16).top,
+    )
+    row_tiles = list(tm.tiles_from_bounds(bounds))
+    assert len(row_tiles) == 256
+
+    morton_tiles = list(tm.tiles_from_bounds(bounds, order="morton"))
+    assert set(morton_tiles) == set(row_tiles)
+    keys = [tp.morton_key(*t) for t in morton_tiles]
+    assert keys == sorted(keys)
+    assert keys == list(range(keys[0], keys[0] + 256))
+
+    hilbert_tiles = list(tm.tiles_from_bounds(bounds, order="hilbert"))
+    assert set(hilbert_tiles) == set(row_tiles)
+    # consecutive tiles are neighbors
+    for a, b in zip(hilbert_tiles, hilbert_tiles[1:]):
+        assert abs(a.row - b.row) + abs(a.col - b.col) == 1
+
+    # over antimeridian
+    bounds = (-22000000, 0, -19000000, 1000000)
+    assert set(tm.tiles_from_bounds(bounds, order="hilbert")) == set(
+        tm.tiles_from_bounds(bounds)
+    )
+
+    with pytest.raises(ValueError):
+        list(tm.tiles_from_bounds(bounds, order="invalid"))
+
+
+def test_neighbor_indexes():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tm = tp[10]
+    rows, cols = tm.neighbor_indexes(500, 1023, radius=20)
+    assert len(rows) == len(cols) == 41 * 41 - 1
+    assert set(zip(rows.tolist(), cols.tolist())) == {
+        (row, col % 1024)
+        for row in range(480, 521)
+        for col in range(1003, 1044)
+        if (row, col) != (500, 1023)
+    }
+    rows, cols = tp.neighbor_indexes(10, 0, 0, radius=3, connectedness=4)
+    assert len(rows) == 6 + 5 + 3 + 1
+    assert (np.abs(rows) + np.minimum(cols, 1024 - cols) <= 3).all()
+    with pytest.raises(InvalidTileIndex):
+        tm.neighbor_indexes(1024, 0)
+    with pytest.raises(ValueError):
+        tm.neighbor_indexes(0, 0, connectedness=6)
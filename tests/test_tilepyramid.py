@@ -1,4 +1,14 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import numpy as np
+import pickle
 import pytest
+from shapely.geometry import LineString, MultiPoint, Point
+import subprocess
+import sys
+import time
+import weakref
 
 from meintile import TilePyramid, TileMatrixSet, TileMatrix, Tile
 from meintile.exceptions import InvalidTileIndex, InvalidTileMatrixIndex
@@ -82,12 +92,516 @@ def test_attributes():
 
 
 def test_dump_load():
-    tp = TilePyramid.from_wkss("WebMercatorQuad")
-    tp._abstract = "dummy abstract"
-    tp._keywords = ["one", "two"]
+    definition = TilePyramid.from_wkss("WebMercatorQuad").to_dict()
+    definition.update(abstract="dummy abstract", keywords=["one", "two"])
+    tp = TilePyramid.from_wkss(definition)
     dumped = tp.to_dict()
     assert isinstance(dumped, dict)
     tp2 = TilePyramid.from_wkss(dumped)
     assert tp._identifier == tp2._identifier
     assert tp._abstract == tp2._abstract
     assert tp._keywords == tp2._keywords
+
+
+def test_registry():
+    TilePyramid.clear_registry()
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    assert TilePyramid.from_wkss("WebMercatorQuad") is tp
+    # identical definitions return identical objects
+    definition = tp.to_dict()
+    assert TilePyramid.from_dict(definition, is_global=True) is tp
+    assert TilePyramid.from_dict(definition) is not tp
+    assert TilePyramid.from_wkss(definition) is TilePyramid.from_dict(definition)
+    # tile cache size and class are part of the key
+    assert TilePyramid.from_wkss("WebMercatorQuad", tile_cache_size=10) is not tp
+    assert TileMatrixSet.from_wkss("WebMercatorQuad") is not tp
+    assert not isinstance(TileMatrixSet.from_wkss("WebMercatorQuad"), TilePyramid)
+    assert isinstance(TilePyramid.from_dict(definition), TilePyramid)
+
+    # mutating the definition afterwards does not affect the interned object
+    definition["tileMatrix"][0]["matrixWidth"] = 2
+    assert tp[0].width == 1
+    assert TilePyramid.from_dict(definition, is_global=True) is not tp
+
+    # clear and limit registry
+    TilePyramid.clear_registry()
+    assert TilePyramid.from_wkss("WebMercatorQuad") is not tp
+    try:
+        TilePyramid.set_registry_size(1)
+        tp = TilePyramid.from_wkss("WebMercatorQuad")
+        TilePyramid.from_wkss("WorldCRS84Quad")
+        # referenced objects stay interned, unreferenced ones are released
+        assert TilePyramid.from_wkss("WebMercatorQuad") is tp
+        released = weakref.ref(TilePyramid.from_wkss("WorldMercatorWGS84Quad"))
+        TilePyramid.from_wkss("WorldCRS84Quad")
+        gc.collect()
+        assert released() is None
+        TilePyramid.set_registry_size(0)
+        assert TilePyramid.from_wkss("WebMercatorQuad") is not TilePyramid.from_wkss(
+            "WebMercatorQuad"
+        )
+        with pytest.raises(ValueError):
+            TilePyramid.set_registry_size(-1)
+    finally:
+        TilePyramid.set_registry_size(64)
+
+
+def test_immutable():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    with pytest.raises(AttributeError):
+        tp.is_global = False
+    with pytest.raises(AttributeError):
+        tp._abstract = "dummy abstract"
+    with pytest.raises(TypeError):
+        tp.tile_matrices[0] = None
+    with pytest.raises(AttributeError):
+        tp[0].width = 2
+    with pytest.raises(ValueError):
+        tp._matrix_arrays["width"][0] = 2
+
+
+def test_tile_geometries():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    zooms = np.array([0, 3, 10, 24, 25, 3])
+    rows = np.array([0, 7, 100, 2 ** 24 - 1, 0, 8])
+    cols = np.array([0, 2, 1000, 12345, 0, 0])
+    geometries = tp.tile_geometries(zooms, rows, cols)
+    assert geometries.valid.tolist() == [True, True, True, True, False, False]
+    for i in range(4):
+        tile = tp.tile(int(zooms[i]), int(rows[i]), int(cols[i]))
+        assert tile.bounds == (
+            geometries.left[i],
+            geometries.bottom[i],
+            geometries.right[i],
+            geometries.top[i],
+        )
+        assert geometries.affine[i, 0] == tile.pixel_x_size
+        assert geometries.affine[i, 4] == tile.pixel_y_size
+    assert np.isnan(geometries.top[4:]).all()
+
+    # scalar zoom is broadcasted
+    geometries = tp.tile_geometries(2, [0, 1, 2, 3], [3, 2, 1, 0])
+    assert geometries.valid.all()
+    assert geometries.left.shape == (4,)
+
+    geometries = tp.tile_geometries(zooms[:4], rows[:4], cols[:4], pixelbuffer=2)
+    for i in range(4):
+        tile = tp.tile(int(zooms[i]), int(rows[i]), int(cols[i]), pixelbuffer=2)
+        assert tile.bounds == tuple(values[i] for values in geometries[1:5])
+
+
+def test_tiles_from_bounds():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    bounds = (-1000000, -1000000, 1000000, 1000000)
+    tiles = tp.tiles_from_bounds(bounds, 10)
+    assert [t.id for t in tiles] == [t.id for t in tp[10].tiles_from_bounds(bounds)]
+    with pytest.raises(InvalidTileMatrixIndex):
+        tp.tiles_from_bounds(bounds, 30)
+
+
+def _brute_force_tiles(tp, geometry, zoom):
+    if geometry.geom_type.endswith("Polygon"):
+        return {
+            t.id
+            for t in tp.tiles_from_bounds(geometry.bounds, zoom)
+            if geometry.intersection(t.bbox).area
+        }
+    return {
+        t.id
+        for t in tp.tiles_from_bounds(geometry.bounds, zoom)
+        if geometry.intersects(t.bbox)
+    }
+
+
+def test_tiles_from_geom():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    polygon = Point(1000000, 2000000).buffer(3000000)
+    for geometry in [
+        polygon,
+        polygon.difference(Point(1000000, 2000000).buffer(1000000)),
+        LineString([(-10000000, -10000000), (15000000, 3000000), (0, 1)]),
+        Point(1234567, -7654321),
+        MultiPoint([(1, 1), (10000000, 10000000)]),
+    ]:
+        for zoom in [0, 3, 8]:
+            tiles = [t.id for t in tp.tiles_from_geom(geometry, zoom)]
+            assert len(tiles) == len(set(tiles))
+            assert set(tiles) == _brute_force_tiles(tp, geometry, zoom)
+
+            # mixed zoom cover covers the same area
+            multi_zoom_tiles = list(tp.tiles_from_geom(geometry, zoom, multi_zoom=True))
+            assert all(t.zoom <= zoom for t in multi_zoom_tiles)
+            assert set(
+                t.id
+                for multi_zoom_tile in multi_zoom_tiles
+                for t in tp.tiles_from_bounds(multi_zoom_tile.bounds, zoom)
+            ) == set(tiles)
+
+    # coarser tiles are emitted if fully covered
+    tiles = list(tp.tiles_from_geom(polygon, 8, multi_zoom=True))
+    assert min(t.zoom for t in tiles) < 8
+    assert len(tiles) < len(list(tp.tiles_from_geom(polygon, 8)))
+
+    # tiles only touching a polygon are omitted
+    tile = tp.tile(5, 10, 10)
+    assert [t.id for t in tp.tiles_from_geom(tile.bbox, 5)] == [tile.id]
+
+    # empty geometry
+    assert list(tp.tiles_from_geom(Point(), 5)) == []
+
+    with pytest.raises(InvalidTileMatrixIndex):
+        tp.tiles_from_geom(polygon, 30)
+
+
+def test_tile_from_xy():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    assert tp.tile_from_xy(1, 1, 5).id == (5, 15, 16)
+    rows, cols = tp.indexes_from_xy([1, -1], [1, -1], 5)
+    assert rows.tolist() == [15, 16]
+    assert cols.tolist() == [16, 15]
+    with pytest.raises(InvalidTileMatrixIndex):
+        tp.tile_from_xy(1, 1, 30)
+
+
+def test_matrix_from_resolution():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    for tm in tp:
+        for strategy in ["nearest", "finer", "coarser"]:
+            assert tp.matrix_from_resolution(tm.pixel_x_size, strategy) is tm
+    res = tp[5].pixel_x_size * 0.9
+    assert tp.matrix_from_resolution(res).id == 5
+    assert tp.matrix_from_resolution(res, "finer").id == 6
+    assert tp.matrix_from_resolution(res, "coarser").id == 5
+    res = tp[5].pixel_x_size * 0.6
+    assert tp.matrix_from_resolution(res).id == 6
+    # outside of the Tile Matrix Set range
+    assert tp.matrix_from_resolution(1e-6, "coarser").id == max(tp.keys())
+    assert tp.matrix_from_resolution(1e9, "finer").id == 0
+
+    resolutions = [tm.pixel_x_size * 0.7 for tm in tp] + [1e-6, 1e9]
+    for strategy in ["nearest", "finer", "coarser"]:
+        zooms = tp.zooms_from_resolutions(resolutions, strategy)
+        assert zooms.tolist() == [
+            tp.matrix_from_resolution(res, strategy).id for res in resolutions
+        ]
+
+    for res in [0, -1, float("nan"), float("inf")]:
+        with pytest.raises(ValueError):
+            tp.matrix_from_resolution(res)
+        with pytest.raises(ValueError):
+            tp.zooms_from_resolutions([1, res])
+    with pytest.raises(ValueError):
+        tp.matrix_from_resolution(1, "closest")
+
+
+def test_tile_cache():
+    tp = TilePyramid.from_wkss("WebMercatorQuad", tile_cache_size=100)
+    tile = tp.tile(5, 5, 5)
+    for child in tile.get_children():
+        assert child.get_parent() is tile
+    assert tp.cache_info() == (4, 5, len(tp) * 100, 5)
+    tp.cache_clear()
+    assert tp.cache_info() == (0, 0, len(tp) * 100, 0)
+
+
+def test_tiles_from_tile():
+    geodetic = TilePyramid.from_wkss("WorldCRS84Quad")
+    mercator = TilePyramid.from_wkss("WebMercatorQuad")
+    # same CRS
+    tile = geodetic.tile(3, 2, 5)
+    assert [t.id for t in geodetic.tiles_from_tile(tile, 4)] == sorted(
+        t.id for t in tile.get_children()
+    )
+    # poles cannot be transformed to Web Mercator
+    assert [t.id for t in mercator.tiles_from_tile(geodetic.tile(3, 0, 0), 3)] == [
+        (3, 0, 0),
+        (3, 1, 0),
+    ]
+    tiles = list(geodetic.tiles_from_tile(mercator.tile(3, 3, 3), 4))
+    assert {t.row for t in tiles} == set(range(4, 8))
+    assert {t.col for t in tiles} == set(range(12, 16))
+
+    # pixelbuffer is passed on and buffered tiles crossing the Antimeridian include
+    # wrapped tiles
+    tile = geodetic.tile(3, 2, 0, pixelbuffer=64)
+    tiles = list(geodetic.tiles_from_tile(tile, 3))
+    assert {t.id for t in tiles} == {
+        (3, row, col) for row in [1, 2, 3] for col in [15, 0, 1]
+    }
+    assert {t.pixelbuffer for t in tiles} == {64}
+    tiles = {t.id for t in mercator.tiles_from_tile(mercator.tile(3, 3, 7, 64), 3)}
+    assert tiles == {(3, row, col) for row in [2, 3, 4] for col in [6, 7, 0]}
+    # reprojected bounds crossing the Antimeridian cover full rows
+    tiles = {t.id for t in mercator.tiles_from_tile(tile, 3)}
+    assert tiles == {(3, row, col) for row in [2, 3] for col in range(8)}
+
+    # windows equal single tile results
+    laea = TilePyramid.from_wkss("EuropeanETRS89_LAEAQuad")
+    rows, cols = np.indices((laea[3].height, laea[3].width))
+    rows, cols = rows.ravel().tolist(), cols.ravel().tolist()
+    windows = mercator.windows_from_tiles(laea[3], rows, cols, 5)
+    for row, col, row_start, row_stop, col_start, col_stop in zip(rows, cols, *windows):
+        tiles = list(mercator.tiles_from_tile(laea.tile(3, row, col), 5))
+        assert [t.id for t in tiles] == [
+            (5, r, c)
+            for r in range(row_start, row_stop)
+            for c in range(col_start, col_stop)
+        ]
+    assert (windows[1] > windows[0]).any()
+    with pytest.raises(InvalidTileIndex):
+        mercator.windows_from_tiles(laea[3], [0, 8], [0, 0], 5)
+
+
+def test_morton_keys():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    assert tp.morton_key(3, 5, 3) == int("213", 4)
+    assert tp.tile_from_morton_key(3, int("213", 4)).id == (3, 5, 3)
+
+    for zoom in [0, 1, 5, 17]:
+        tm = tp[zoom]
+        rows = np.random.randint(0, tm.height, 100)
+        cols = np.random.randint(0, tm.width, 100)
+        keys = tp.morton_keys(zoom, rows, cols)
+        assert keys.dtype == np.uint64
+        assert len(set(keys.tolist())) == len(set(zip(rows.tolist(), cols.tolist())))
+        for row, col, key in zip(rows.tolist(), cols.tolist(), keys.tolist()):
+            assert tp.morton_key(zoom, row, col) == key
+        decoded_rows, decoded_cols = tp.indexes_from_morton_keys(zoom, keys)
+        assert (decoded_rows == rows).all()
+        assert (decoded_cols == cols).all()
+
+    # descendants are within key range
+    tile = tp.tile(5, 10, 20)
+    start, stop = tp.morton_key_range(5, 10, 20, 7)
+    assert sorted(
+        tp.morton_key(*grandchild)
+        for child in tile.get_children()
+        for grandchild in child.get_children()
+    ) == list(range(start, stop))
+    key = tp.morton_key(5, 10, 20)
+    assert tp.morton_key_range(5, 10, 20, 5) == (key, key + 1)
+    with pytest.raises(ValueError):
+        tp.morton_key_range(5, 10, 20, 4)
+
+    with pytest.raises(InvalidTileIndex):
+        tp.morton_key(1, 2, 0)
+    with pytest.raises(InvalidTileIndex):
+        tp.morton_keys(1, [0, 2], [0, 0])
+    with pytest.raises(InvalidTileIndex):
+        tp.tile_from_morton_key(1, 4)
+
+
+def test_quadkeys():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    # example from https://docs.microsoft.com/en-us/bingmaps/articles/bing-maps-tile-system
+    assert tp.quadkey(3, 5, 3) == "213"
+    assert tp.tile_from_quadkey("213").id == (3, 5, 3)
+    assert tp.quadkey(0, 0, 0) == ""
+    assert tp.tile_from_quadkey("").id == (0, 0, 0)
+
+    for zoom in [0, 1, 5, 17]:
+        tm = tp[zoom]
+        rows = np.random.randint(0, tm.height, 100)
+        cols = np.random.randint(0, tm.width, 100)
+        quadkeys = tp.quadkeys(zoom, rows, cols)
+        for row, col, quadkey in zip(rows.tolist(), cols.tolist(), quadkeys.tolist()):
+            assert tp.quadkey(zoom, row, col) == quadkey
+        zooms, decoded_rows, decoded_cols = tp.indexes_from_quadkeys(quadkeys)
+        assert (zooms == zoom).all()
+        assert (decoded_rows == rows).all()
+        assert (decoded_cols == cols).all()
+
+    # mixed zoom levels
+    zooms, rows, cols = tp.indexes_from_quadkeys(["", "0", "213", "3333"])
+    assert zooms.tolist() == [0, 1, 3, 4]
+    assert rows.tolist() == [0, 0, 5, 15]
+    assert cols.tolist() == [0, 0, 3, 15]
+
+    with pytest.raises(ValueError):
+        tp.tile_from_quadkey("214")
+    with pytest.raises(ValueError):
+        tp.indexes_from_quadkeys(["214"])
+    with pytest.raises(InvalidTileMatrixIndex):
+        tp.tile_from_quadkey("0" * 30)
+
+    # pyramid with two root tiles
+    tp = TilePyramid.from_wkss("WorldCRS84Quad")
+    assert tp.quadkey(0, 0, 0) == "0"
+    assert tp.quadkey(0, 0, 1) == "1"
+    assert tp.quadkey(1, 1, 3) == "13"
+    assert tp.tile_from_quadkey("13").id == (1, 1, 3)
+    # would be a row outside of the TileMatrix
+    with pytest.raises(InvalidTileIndex):
+        tp.tile_from_quadkey("2")
+    with pytest.raises(InvalidTileIndex):
+        tp.indexes_from_quadkeys(["2"])
+
+
+def test_ancestor_descendant_indexes():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    rows = np.array([10, 11, 0, 31])
+    cols = np.array([20, 31, 0, 31])
+    ancestor_rows, ancestor_cols = tp.ancestor_indexes(5, rows, cols, 2)
+    for row, col, ancestor_row, ancestor_col in zip(
+        rows.tolist(), cols.tolist(), ancestor_rows.tolist(), ancestor_cols.tolist()
+    ):
+        assert tp.tile(5, row, col).get_ancestor(2).id == (
+            2,
+            ancestor_row,
+            ancestor_col,
+        )
+
+    windows = tp.descendant_windows(5, rows, cols, 7)
+    for row, col, row_start, row_stop, col_start, col_stop in zip(
+        rows.tolist(), cols.tolist(), *[w.tolist() for w in windows]
+    ):
+        descendants = tp.tile(5, row, col).get_descendants(7)
+        assert descendants.rows == range(row_start, row_stop)
+        assert descendants.cols == range(col_start, col_stop)
+
+    with pytest.raises(ValueError):
+        tp.ancestor_indexes(5, rows, cols, 6)
+    with pytest.raises(ValueError):
+        tp.descendant_windows(5, rows, cols, 4)
+    with pytest.raises(InvalidTileIndex):
+        tp.ancestor_indexes(5, [32], [0], 4)
+
+
+def test_pickle():
+    tp = TilePyramid.from_wkss("WebMercatorQuad", tile_cache_size=10)
+    assert pickle.loads(pickle.dumps(tp)) is tp
+    assert pickle.loads(pickle.dumps(tp[3])) is tp[3]
+    tiles = list(tp[3].tiles_from_bounds(tp[3].bounds))
+    assert pickle.loads(pickle.dumps(tiles)) == tiles
+    tms = TileMatrixSet.from_wkss("WorldCRS84Quad")
+    assert pickle.loads(pickle.dumps(tms)) is tms
+
+    # Tile Matrix Sets are rehydrated from the WKSS in other processes
+    assert subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import pickle, sys; "
+            "tile = pickle.loads(sys.stdin.buffer.read()); "
+            "print(tile.tp.is_global, tile.tp.cache_info().maxsize, tile.bounds)",
+        ],
+        input=pickle.dumps(tp.tile(3, 1, 2)),
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout.decode().strip() == "True {} {}".format(
+        len(tp) * 10, tp.tile(3, 1, 2).bounds
+    )
+
+
+def _tile_id(tile):
+    return tile.id
+
+
+def test_map_tiles():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    bounds = (-1000000, -2000000, 3000000, 1000000)
+    control = set(tp.tiles_from_bounds(bounds, 8))
+
+    # bounds
+    results = list(tp.map_tiles(_tile_id, bounds, 8, chunk_size=16))
+    assert {tile for tile, _ in results} == control
+    assert len(results) == len(control)
+    assert all(tile.id == result for tile, result in results)
+    # tiles of a chunk are within one Morton block of 4x4 tiles
+    for i in range(0, len(results), 16):
+        chunk = results[i : i + 16]
+        assert len({(t.row // 4, t.col // 4) for t, _ in chunk}) <= 4
+
+    # tiles from multiple zoom levels using processes
+    tiles = list(control) + [tp.tile(5, 1, 1, pixelbuffer=3)]
+    results = list(tp.map_tiles(_tile_id, tiles, executor="process", workers=2))
+    assert sorted(tile for tile, _ in results) == sorted(tiles)
+    assert tp.tile(5, 1, 1, pixelbuffer=3) in {tile for tile, _ in results}
+
+    # existing executor
+    with ThreadPoolExecutor(2) as executor:
+        results = list(tp.map_tiles(_tile_id, bounds, 8, executor=executor))
+        assert len(results) == len(control)
+
+    with pytest.raises(ValueError):
+        tp.map_tiles(_tile_id, bounds, 8, executor="invalid")
+    with pytest.raises(ValueError):
+        tp.map_tiles(_tile_id, bounds, 8, chunk_size=0)
+    with pytest.raises(InvalidTileMatrixIndex):
+        tp.map_tiles(_tile_id, bounds, 100)
+    with pytest.raises(ValueError):
+        list(
+            tp.map_tiles(
+                _tile_id, [TilePyramid.from_wkss("WorldCRS84Quad").tile(0, 0, 0)]
+            )
+        )
+    with pytest.raises(ZeroDivisionError):
+        list(tp.map_tiles(lambda tile: 1 / 0, bounds, 8))
+
+
+def test_map_tiles_backpressure():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    processed = []
+    results = tp.map_tiles(
+        processed.append,
+        tp[10].bounds,
+        10,
+        workers=2,
+        chunk_size=4,
+        max_pending=3,
+    )
+    next(results)
+    time.sleep(0.1)
+    # only a few chunks got submitted while the consumer is waiting
+    assert len(processed) <= 4 * 4
+    results.close()
+
+
+def test_atiles_from_bounds():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    bounds = (-1000000, -2000000, 3000000, 1000000)
+    control = list(tp.tiles_from_bounds(bounds, 9, order="hilbert"))
+
+    async def _collect(**kwargs):
+        return [
+            batch
+            async for batch in tp.atiles_from_bounds(
+                bounds, 9, order="hilbert", batch_size=100, **kwargs
+            )
+        ]
+
+    for executor in [False, True, ThreadPoolExecutor(1)]:
+        batches = asyncio.run(_collect(executor=executor))
+        assert [len(batch) for batch in batches[:-1]] == [100] * (len(batches) - 1)
+        assert [tile for batch in batches for tile in batch] == control
+
+    with pytest.raises(ValueError):
+        tp.atiles_from_bounds(bounds, 9, batch_size=0)
+    with pytest.raises(ValueError):
+        tp.atiles_from_bounds(bounds, 9, order="invalid")
+    with pytest.raises(InvalidTileMatrixIndex):
+        tp.atiles_from_bounds(bounds, 100)
+
+
+def test_atiles_from_geom():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    geometry = Point(0, 0).buffer(3000000)
+    control = list(tp.tiles_from_geom(geometry, 9))
+    ticks = []
+
+    async def _ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def _collect():
+        ticker = asyncio.create_task(_ticker())
+        tiles = []
+        async for batch in tp.atiles_from_geom(geometry, 9, batch_size=10):
+            tiles.extend(batch)
+        ticker.cancel()
+        return tiles
+
+    assert asyncio.run(_collect()) == control
+    # event loop was not blocked while generating tiles
+    assert len(ticks) >= len(control) // 10
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from meintile import TilePyramid, TileSet
+from meintile.exceptions import InvalidTileIndex
+
+
+def _random_tiles(tp, zooms, count, seed):
+    """Return set of tile indexes forming small random blocks."""
+    rng = np.random.default_rng(seed)
+    tiles = set()
+    for zoom in zooms:
+        tm = tp[zoom]
+        for row, col in zip(
+            rng.integers(0, tm.height, count).tolist(),
+            rng.integers(0, tm.width, count).tolist(),
+        ):
+            for r in range(row, min(row + 3, tm.height)):
+                for c in range(col, min(col + 2, tm.width)):
+                    tiles.add((zoom, r, c))
+    return tiles
+
+
+def test_tileset():
+    for wkss in ["WebMercatorQuad", "WorldCRS84Quad"]:
+        tp = TilePyramid.from_wkss(wkss)
+        tiles = _random_tiles(tp, [3, 5], 20, 0)
+        tile_set = TileSet(tp, tiles)
+        assert tile_set.zooms == [3, 5]
+        assert len(tile_set) == len(tiles)
+        assert tile_set.count(3) == len([i for i in tiles if i[0] == 3])
+        assert tile_set.count(4) == 0
+        assert {t.id for t in tile_set} == tiles
+        assert TileSet(tp, [tp.tile(*i) for i in tiles]) == tile_set
+        assert not TileSet.from_indexes(tp, 5, [], [])
+        rows, cols = tile_set.indexes(5)
+        assert TileSet.from_indexes(tp, 5, rows, cols) == TileSet(
+            tp, [i for i in tiles if i[0] == 5]
+        )
+        # ranges of adjacent keys are merged
+        starts, stops = tile_set.ranges(5)
+        assert (starts[1:] > stops[:-1]).all()
+
+        # membership
+        tm = tp[5]
+        rows, cols = np.indices((tm.height, tm.width))
+        found = tile_set.contains(5, rows, cols)
+        assert {
+            (5, row, col)
+            for row, col in zip(rows[found].tolist(), cols[found].tolist())
+        } == {i for i in tiles if i[0] == 5}
+        for index in list(tiles)[:10]:
+            assert index in tile_set
+            assert tp.tile(*index) in tile_set
+        assert (5, -1, 0) not in tile_set
+        assert (4, 0, 0) not in tile_set
+        assert (30, 0, 0) not in tile_set
+
+    with pytest.raises(InvalidTileIndex):
+        TileSet(tp, [(3, 0, 100)])
+    with pytest.raises(ValueError):
+        TileSet(tp, [TilePyramid.from_wkss("WebMercatorQuad").tile(3, 0, 0)])
+
+
+def test_tileset_operations():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    a = _random_tiles(tp, [4, 6], 30, 1)
+    b = _random_tiles(tp, [4, 5], 30, 2)
+    set_a, set_b = TileSet(tp, a), TileSet(tp, b)
+    for result, expected in [
+        (set_a | set_b, a | b),
+        (set_a & set_b, a & b),
+        (set_a - set_b, a - b),
+        (set_a ^ set_b, a ^ b),
+        (set_a.union(set_b), a.union(b)),
+        (set_b.difference(set_a), b.difference(a)),
+    ]:
+        assert {t.id for t in result} == expected
+        assert result == TileSet(tp, expected)
+    assert not set_a - set_a
+    assert set_a & TileSet(tp) == TileSet(tp)
+    with pytest.raises(ValueError):
+        set_a | TileSet(TilePyramid.from_wkss("WorldCRS84Quad"))
+
+
+def test_tileset_rollup():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tiles = _random_tiles(tp, [6], 50, 3)
+    tile_set = TileSet(tp, tiles)
+    parents = {(5, row // 2, col // 2) for _, row, col in tiles}
+    assert {t.id for t in tile_set.rollup(6)} == parents
+    assert {t.id for t in tile_set.rollup(6, mode="all")} == {
+        (zoom, row, col)
+        for zoom, row, col in parents
+        if all((6, 2 * row + i, 2 * col + j) in tiles for i in (0, 1) for j in (0, 1))
+    }
+    assert not tile_set.rollup(5)
+    with pytest.raises(ValueError):
+        tile_set.rollup(6, mode="most")
+
+
+def test_tileset_serialization():
+    tp = TilePyramid.from_wkss("WebMercatorQuad")
+    tile_set = TileSet(tp, _random_tiles(tp, [2, 7], 40, 4))
+    data = tile_set.to_bytes()
+    assert isinstance(data, bytes)
+    assert TileSet.from_bytes(tp, data) == tile_set
+    assert TileSet.from_bytes(tp, TileSet(tp).to_bytes()) == TileSet(tp)
+
+    # a large contiguous area only needs a few ranges
+    rows, cols = np.indices((1000, 1000))
+    large = TileSet.from_indexes(tp, 14, rows + 5000, cols + 7000)
+    assert len(large) == 1000000
+    assert len(large.ranges(14)[0]) < 5000
+    assert len(large.to_bytes()) < 20000
+    assert len(large.rollup(14)) == 500 * 500
+
+    with pytest.raises(ValueError):
+        TileSet.from_bytes(tp, b"invalid")
+    with pytest.raises(ValueError):
+        TileSet.from_bytes(tp, data[:-4])